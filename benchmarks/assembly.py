@@ -0,0 +1,224 @@
+"""
+Response assembly benchmark for the orchestrator.
+
+Runs the strategy, portfolio and metrics code in-process on long synthetic
+series, then assembles each backtest response twice:
+
+- model path: the Pydantic response models (engine.assembly), dumped with
+  model_dump(mode="json") and encoded by Starlette's JSONResponse.
+- fast path: plain-dict payloads (engine.payload) encoded by
+  routes.encoding.dumps (orjson when installed).
+
+Both bodies must be byte-for-byte identical, in the rows and columnar
+layouts; the script exits with status 1 if any differ. Timings are the
+median of --repeat runs.
+
+    python benchmarks/assembly.py
+    python benchmarks/assembly.py --years 40 --repeat 10
+
+Run from the repository root with the orchestrator's requirements installed.
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Compute services run in-process and nothing is memoized between repeats
+os.environ.setdefault("SERVICE_MODE", "local")
+os.environ["STAGE_CACHE_ENABLED"] = "false"
+os.environ["BASELINE_CACHE_MAX_ENTRIES"] = "0"
+sys.path.insert(0, os.path.join(ROOT, "services", "orchestrator"))
+
+from app.schemas.requests import (  # noqa: E402
+    MarketParams, StrategyParams, PortfolioParams, BaselineParams, OutputOptions
+)
+from app.engine import pipeline  # noqa: E402
+from app.engine.assembly import build_backtest_data  # noqa: E402
+from app.engine.output import shape_output  # noqa: E402
+from app.engine.payload import backtest_payload  # noqa: E402
+from app.routes.encoding import FastJSONResponse, orjson_available  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+
+# --- Inputs ------------------------------------------------------------------
+
+def synthetic_market(years: int, frequency: str, seed: int) -> Tuple[Dict[str, Any], Dict[str, Any], str, str]:
+    """A seeded random walk in the market-data response shape, with quarterly dividends."""
+    rng = random.Random(seed)
+    start = date(2000, 1, 3)
+    end = date(start.year + years, 1, 1)
+    close = 100.0
+    prices, seen = [], set()
+    day = start
+    while day < end:
+        if day.weekday() < 5:
+            open_ = close
+            close = max(0.01, close * math.exp(0.0003 + 0.02 * rng.gauss(0, 1)))
+            period = day.isocalendar()[:2] if frequency == "weekly" else day
+            if period not in seen:
+                seen.add(period)
+                prices.append({
+                    "date": day.isoformat(),
+                    "open": round(open_, 4),
+                    "high": round(max(open_, close) * 1.01, 4),
+                    "low": round(min(open_, close) * 0.99, 4),
+                    "close": round(close, 4),
+                    "adjusted_close": round(close, 4),
+                    "volume": int(rng.uniform(1e6, 5e7))
+                })
+        day += timedelta(days=1)
+    dividends = [
+        {"ex_date": f"{year}-{month:02d}-15", "payment_date": None, "amount_per_share": 0.24}
+        for year in range(start.year, end.year) for month in (2, 5, 8, 11)
+    ]
+    return {"prices": prices}, {"dividends": dividends}, start.isoformat(), (end - timedelta(days=1)).isoformat()
+
+
+def roughen(parts: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Inputs a looser downstream could send: ints in float fields, integral
+    floats in int fields, missing optionals and numbers Python prints in
+    exponent form. Both paths must still agree.
+    """
+    prices = [dict(p) for p in parts["prices_data"]["prices"]]
+    for p in prices[::7]:
+        p["close"] = int(p["close"])
+        p["volume"] = float(p["volume"])
+        p["open"] = None
+    portfolio = dict(parts["active_portfolio_data"])
+    trades = [dict(t) for t in portfolio.get("trades", [])]
+    for t in trades[::3]:
+        t["shares"] = 3e-07
+        t["transaction_cost"] = None
+    time_series = dict(portfolio["time_series"])
+    time_series["cash_balance"] = [0.00004 if i % 50 == 0 else v for i, v in enumerate(time_series["cash_balance"])]
+    time_series["holdings_value"] = [int(v) for v in time_series["holdings_value"]]
+    portfolio.update(trades=trades, time_series=time_series)
+    metrics = {**parts["metrics_data"], "active": {**parts["metrics_data"]["active"], "sortino_ratio": None, "max_drawdown_duration_days": 12.0}}
+    return {
+        **parts,
+        "prices_data": {"prices": prices},
+        "active_portfolio_data": portfolio,
+        "metrics_data": metrics
+    }
+
+
+async def backtest_parts(
+    years: int, frequency: str, strategy: Dict[str, Any], cost_pct: float, seed: int
+) -> Dict[str, Any]:
+    """Raw downstream results of one backtest, as the pipeline hands them to assembly."""
+    prices_data, dividends_data, start, end = synthetic_market(years, frequency, seed)
+    market = MarketParams(ticker="SYN", market_type="Stock", start_date=start, end_date=end, frequency=frequency)
+    strategy_params = StrategyParams(**strategy)
+    price_data, dividend_data = pipeline.prepare_series(market, prices_data, dividends_data)
+
+    signals = await pipeline.generate_active_signals(strategy_params, price_data)
+    active, baseline = await asyncio.gather(
+        pipeline.simulate_active(
+            PortfolioParams(initial_capital=100000, investment_per_trade=1000, transaction_cost_pct=cost_pct),
+            signals, price_data, dividend_data
+        ),
+        pipeline.run_baseline(BaselineParams(initial_capital=100000), price_data, dividend_data, None)
+    )
+    metrics = await pipeline.calculate_metrics(market, active, baseline)
+    return dict(
+        market_params=market,
+        strategy_type=strategy_params.strategy_type,
+        prices_data=prices_data,
+        dividends_data=dividends_data,
+        active_signals=signals,
+        active_portfolio_data=active,
+        baseline_portfolio_data=baseline,
+        metrics_data=metrics,
+        execution_time_ms=1234
+    )
+
+
+def scenarios(years: int) -> Dict[str, Callable[[], Any]]:
+    dip = {"strategy_type": "buy_the_dip", "config": {"price_change_threshold": 1.5}}
+    hold = {"strategy_type": "buy_and_hold"}
+    return {
+        f"daily {years}y buy_the_dip": lambda: backtest_parts(years, "daily", dip, 0.0, 1),
+        f"daily {years}y buy_and_hold": lambda: backtest_parts(years, "daily", hold, 0.0, 2),
+        f"weekly {years}y buy_the_dip, costs": lambda: backtest_parts(years, "weekly", dip, 0.1, 3),
+    }
+
+
+# --- Measurement -------------------------------------------------------------
+
+def median_ms(fn: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def measure(parts: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    model_ms, model = median_ms(lambda: build_backtest_data(**parts).model_dump(mode="json"), repeat)
+    fast_ms, fast = median_ms(lambda: backtest_payload(**parts), repeat)
+    stdlib_ms, model_body = median_ms(lambda: JSONResponse({"success": True, "data": model}).body, repeat)
+    encode_ms, fast_body = median_ms(lambda: FastJSONResponse({"success": True, "data": fast}).body, repeat)
+
+    columnar = OutputOptions(format="columnar")
+    identical = model_body == fast_body and (
+        JSONResponse({"success": True, "data": shape_output(model, columnar)}).body
+        == FastJSONResponse({"success": True, "data": shape_output(fast, columnar)}).body
+    )
+    return {
+        "bars": len(parts["prices_data"]["prices"]),
+        "signals": len(parts["active_signals"]),
+        "bytes": len(model_body),
+        "model_ms": model_ms,
+        "fast_ms": fast_ms,
+        "stdlib_ms": stdlib_ms,
+        "encode_ms": encode_ms,
+        "identical": identical
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=25, help="Length of each synthetic series")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement")
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if orjson_available() else 'stdlib json (orjson not installed)'}")
+    header = (
+        f"{'scenario':34} {'bars':>6} {'MB':>6} {'models':>8} {'dicts':>8} "
+        f"{'json':>8} {'fast':>8} {'total':>15} identical"
+    )
+    print(header)
+    print("-" * len(header))
+
+    all_identical = True
+    for name, build in scenarios(args.years).items():
+        parts = asyncio.run(build())
+        for label, variant in ((name, parts), (f"{name}, rough input", roughen(parts))):
+            r = measure(variant, args.repeat)
+            all_identical &= r["identical"]
+            before, after = r["model_ms"] + r["stdlib_ms"], r["fast_ms"] + r["encode_ms"]
+            print(
+                f"{label:34} {r['bars']:>6} {r['bytes'] / 1e6:>6.2f} {r['model_ms']:>6.1f}ms {r['fast_ms']:>6.1f}ms "
+                f"{r['stdlib_ms']:>6.1f}ms {r['encode_ms']:>6.1f}ms {before:>6.1f}->{after:>5.1f}ms "
+                f"{'yes' if r['identical'] else 'NO'}"
+            )
+
+    print("\nmodels/json: Pydantic models + JSONResponse; dicts/fast: engine.payload + routes.encoding")
+    if not all_identical:
+        print("FAIL: fast path output differs from the model path")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
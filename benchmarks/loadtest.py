@@ -0,0 +1,474 @@
+"""
+End-to-end load test for the backtesting services.
+
+Boots the Python services locally (market-data on its synthetic provider,
+or the test-data-fetcher in its place), drives a weighted mix of
+orchestrator requests at a fixed concurrency and reports throughput,
+latency percentiles, a per-stage breakdown (from each response's
+Server-Timing header) and the peak RSS of every service. Results are
+written as JSON so two commits can be compared:
+
+    python benchmarks/loadtest.py --duration 30 --concurrency 16 --output before.json
+    python benchmarks/loadtest.py --duration 30 --concurrency 16 --output after.json
+    python benchmarks/loadtest.py --compare before.json after.json
+
+Run from the repository root with the services' requirements installed.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Offsets from --base-port, mirroring the 8011-8016 layout
+SERVICES = {
+    "orchestrator": 0,
+    "market-data": 1,
+    "strategy": 2,
+    "portfolio": 3,
+    "metrics": 4,
+    "test-data-fetcher": 5,
+}
+
+# Scenario -> weight of the default mix
+DEFAULT_MIX = "single=6,long=2,sweep=1,walk_forward=1"
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+# --- Request scenarios -------------------------------------------------------
+
+def _backtest_body(ticker: str, start: str, end: str, threshold: float) -> Dict[str, Any]:
+    return {
+        "market_params": {
+            "ticker": ticker, "market_type": "Stock", "start_date": start, "end_date": end, "frequency": "daily"
+        },
+        "strategy_params": {
+            "strategy_type": "buy_the_dip",
+            "config": {"price_change_threshold": threshold, "lookback_period": "daily"}
+        },
+        "portfolio_params": {
+            "initial_capital": 10000, "investment_per_trade": 100, "reinvest_dividends": True,
+            "transaction_cost_pct": 0.1, "cash_interest_rate_pct": 2.0
+        },
+        "baseline_params": {"initial_capital": 10000, "reinvest_dividends": True}
+    }
+
+
+def build_scenarios(provider: str, tickers: int) -> Dict[str, Any]:
+    """
+    Scenario name -> fn(rng) returning (path, body). The test-data-fetcher
+    only serves AAPL for January 2024, so with it every scenario uses that
+    range and "long" is no longer than "single".
+    """
+    if provider == "synthetic":
+        symbols = [f"SYN{i}" for i in range(tickers)]
+        ranges = {
+            "single": ("2023-01-01", "2024-01-01"),
+            "long": ("2004-01-01", "2024-01-01"),
+            "sweep": ("2022-01-01", "2024-01-01"),
+            "walk_forward": ("2019-01-01", "2024-01-01"),
+        }
+        window = {"mode": "rolling", "window_bars": 252, "step_bars": 63}
+    else:
+        symbols = ["AAPL"]
+        ranges = {name: ("2024-01-01", "2024-01-31") for name in ("single", "long", "sweep", "walk_forward")}
+        window = {"mode": "rolling", "window_bars": 5, "step_bars": 2}
+
+    thresholds = [-0.01, -0.02, -0.03, -0.05]
+
+    def backtest(name: str):
+        def make(rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+            start, end = ranges[name]
+            return "/api/backtest", _backtest_body(rng.choice(symbols), start, end, rng.choice(thresholds))
+        return make
+
+    def sweep(rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+        body = _backtest_body(rng.choice(symbols), *ranges["sweep"], thresholds[0])
+        body["grid"] = {
+            "strategy_params.config.price_change_threshold": thresholds[:3],
+            "portfolio_params.investment_per_trade": [100, 500]
+        }
+        return "/api/backtest/sweep", body
+
+    def walk_forward(rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+        body = _backtest_body(rng.choice(symbols), *ranges["walk_forward"], rng.choice(thresholds))
+        body["windows"] = window
+        return "/api/backtest/walk-forward", body
+
+    return {"single": backtest("single"), "long": backtest("long"), "sweep": sweep, "walk_forward": walk_forward}
+
+
+def parse_mix(spec: str, scenarios: Dict[str, Any]) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in scenarios:
+            raise SystemExit(f"Unknown scenario '{name}' (choose from {', '.join(scenarios)})")
+        mix[name] = float(weight or 1)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+# --- Service processes -------------------------------------------------------
+
+class ServiceCluster:
+    """The services as local uvicorn processes on consecutive ports."""
+
+    def __init__(self, base_port: int, provider: str, warm_caches: bool, log_dir: str):
+        self.base_port = base_port
+        self.provider = provider
+        self.warm_caches = warm_caches
+        self.log_dir = log_dir
+        self.processes: Dict[str, subprocess.Popen] = {}
+
+    def url(self, service: str) -> str:
+        return f"http://127.0.0.1:{self.base_port + SERVICES[service]}"
+
+    def _env(self, service: str) -> Dict[str, str]:
+        env = dict(os.environ)
+        if service == "market-data":
+            env["MARKET_DATA_PROVIDER"] = "synthetic"
+            env["PRICE_STORE_PATH"] = os.path.join(self.log_dir, "prices.db")
+            if not self.warm_caches:
+                env["PRICE_STORE_ENABLED"] = "false"
+        if service == "orchestrator":
+            env.update({
+                "MARKET_DATA_URL": self.url("market-data" if self.provider == "synthetic" else "test-data-fetcher"),
+                "STRATEGY_URL": self.url("strategy"),
+                "PORTFOLIO_URL": self.url("portfolio"),
+                "METRICS_URL": self.url("metrics"),
+                "JOBS_SQLITE_PATH": os.path.join(self.log_dir, "jobs.db"),
+            })
+            if not self.warm_caches:
+                # Measure the pipeline, not the result cache or stage memos
+                env.update({
+                    "BACKTEST_CACHE_ENABLED": "false",
+                    "STAGE_CACHE_ENABLED": "false",
+                    "BASELINE_CACHE_MAX_ENTRIES": "0",
+                })
+        return env
+
+    def start(self) -> None:
+        services = [s for s in SERVICES if s != ("test-data-fetcher" if self.provider == "synthetic" else "market-data")]
+        for service in services:
+            log = open(os.path.join(self.log_dir, f"{service}.log"), "w")
+            self.processes[service] = subprocess.Popen(
+                [
+                    sys.executable, "-m", "uvicorn", "app.main:app",
+                    "--host", "127.0.0.1", "--port", str(self.base_port + SERVICES[service]),
+                    "--log-level", "warning"
+                ],
+                cwd=os.path.join(ROOT, "services", service),
+                env=self._env(service),
+                stdout=log,
+                stderr=subprocess.STDOUT
+            )
+
+        deadline = time.monotonic() + 60
+        for service, process in self.processes.items():
+            while True:
+                if process.poll() is not None:
+                    raise SystemExit(f"{service} exited during startup, see {self.log_dir}/{service}.log")
+                try:
+                    if httpx.get(self.url(service) + "/health", timeout=1).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise SystemExit(f"{service} did not become healthy, see {self.log_dir}/{service}.log")
+                time.sleep(0.2)
+
+    def memory(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Peak (VmHWM) and current (VmRSS) resident memory per service, in MB."""
+        return {service: read_memory(process.pid) for service, process in self.processes.items()}
+
+    def stop(self) -> None:
+        for process in self.processes.values():
+            process.terminate()
+        for process in self.processes.values():
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def read_memory(pid: int) -> Dict[str, Optional[float]]:
+    values: Dict[str, Optional[float]] = {"peak_rss_mb": None, "rss_mb": None}
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith(("VmHWM:", "VmRSS:")):
+                    key = "peak_rss_mb" if line.startswith("VmHWM:") else "rss_mb"
+                    values[key] = round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        # Not Linux, or the process is gone
+        pass
+    return values
+
+
+# --- Load generation ---------------------------------------------------------
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    entries = {}
+    for entry in (header or "").split(","):
+        parts = [part.strip() for part in entry.split(";")]
+        for param in parts[1:]:
+            if param.startswith("dur="):
+                try:
+                    entries[parts[0]] = float(param[4:])
+                except ValueError:
+                    pass
+    return entries
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: Dict[str, List[Dict[str, Any]]] = {}
+
+    def add(self, scenario: str, latency_ms: float, status: int, ok: bool, timing: Dict[str, float]) -> None:
+        self.samples.setdefault(scenario, []).append(
+            {"latency_ms": latency_ms, "status": status, "ok": ok, "timing": timing}
+        )
+
+
+async def run_load(
+    base_url: str,
+    scenarios: Dict[str, Any],
+    mix: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    max_requests: Optional[int],
+    seed: int,
+    recorder: Optional[Recorder]
+) -> float:
+    """Closed-loop load: `concurrency` workers send back-to-back requests. Returns elapsed seconds."""
+    names, weights = list(mix), list(mix.values())
+    rng = random.Random(seed)
+    sent = 0
+    stop_at = time.monotonic() + duration
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        async def worker(index: int) -> None:
+            nonlocal sent
+            # Separate clients to the orchestrator's per-client admission limits
+            headers = {"X-Client-Id": f"loadtest-{index}"}
+            while time.monotonic() < stop_at and (max_requests is None or sent < max_requests):
+                sent += 1
+                scenario = rng.choices(names, weights)[0]
+                path, body = scenarios[scenario](rng)
+                start = time.perf_counter()
+                try:
+                    response = await client.post(path, json=body, headers=headers)
+                    await response.aread()
+                    status = response.status_code
+                    ok = status == 200
+                    timing = parse_server_timing(response.headers.get("server-timing"))
+                except httpx.HTTPError:
+                    status, ok, timing = 0, False, {}
+                if recorder is not None:
+                    recorder.add(scenario, (time.perf_counter() - start) * 1000, status, ok, timing)
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker(index) for index in range(concurrency)))
+        return time.monotonic() - started
+
+
+# --- Reporting ---------------------------------------------------------------
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return float("nan")
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    latencies = sorted(s["latency_ms"] for s in samples)
+    errors = sum(1 for s in samples if not s["ok"])
+    statuses: Dict[str, int] = {}
+    for s in samples:
+        statuses[str(s["status"])] = statuses.get(str(s["status"]), 0) + 1
+
+    stages: Dict[str, List[float]] = {}
+    for s in samples:
+        for entry, ms in s["timing"].items():
+            stages.setdefault(entry, []).append(ms)
+
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "statuses": statuses,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed > 0 else None,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else None,
+            **{f"p{p}": round(percentile(latencies, p), 2) for p in PERCENTILES},
+            "max": round(latencies[-1], 2) if latencies else None,
+        },
+        # Mean Server-Timing entry per request that reported it
+        "stages_ms": {
+            entry: round(sum(values) / len(values), 2) for entry, values in sorted(stages.items())
+        },
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    meta = results["meta"]
+    print(f"\ncommit {meta['commit']}  provider={meta['provider']}  concurrency={meta['concurrency']}  "
+          f"elapsed={meta['elapsed_s']}s")
+    header = f"{'scenario':<14}{'reqs':>7}{'err':>6}{'rps':>9}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES)
+    print(header)
+    for name, stats in [*results["scenarios"].items(), ("overall", results["overall"])]:
+        latency = stats["latency_ms"]
+        print(f"{name:<14}{stats['requests']:>7}{stats['errors']:>6}{stats['throughput_rps']:>9}"
+              + "".join(f"{latency['p' + str(p)]:>10}" for p in PERCENTILES))
+
+    print("\nstage breakdown (mean ms per request)")
+    for name, stats in results["scenarios"].items():
+        stages = ", ".join(f"{entry}={ms}" for entry, ms in stats["stages_ms"].items())
+        print(f"  {name}: {stages}")
+
+    if results["services"]:
+        print("\nmemory (MB)")
+        for service, memory in results["services"].items():
+            print(f"  {service:<18} peak={memory['peak_rss_mb']}  current={memory['rss_mb']}")
+
+
+def compare(base_path: str, head_path: str, threshold: float) -> int:
+    """Print per-metric changes; exit status 1 if any regresses by more than `threshold` percent."""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(head_path) as f:
+        head = json.load(f)
+
+    rows: List[Tuple[str, str, Any, Any, bool]] = []
+
+    def add(label: str, metric: str, old: Any, new: Any, higher_is_better: bool) -> None:
+        rows.append((label, metric, old, new, higher_is_better))
+
+    for name in sorted(set(base["scenarios"]) & set(head["scenarios"])) + ["overall"]:
+        old = base["overall"] if name == "overall" else base["scenarios"][name]
+        new = head["overall"] if name == "overall" else head["scenarios"][name]
+        add(name, "throughput_rps", old["throughput_rps"], new["throughput_rps"], True)
+        for key in ("p50", "p95", "p99"):
+            add(name, f"latency_{key}_ms", old["latency_ms"][key], new["latency_ms"][key], False)
+    for service in sorted(set(base["services"]) & set(head["services"])):
+        add(service, "peak_rss_mb", base["services"][service]["peak_rss_mb"],
+            head["services"][service]["peak_rss_mb"], False)
+
+    print(f"base {base['meta']['commit']}  ->  head {head['meta']['commit']}  (threshold {threshold}%)")
+    regressions = 0
+    for label, metric, old, new, higher_is_better in rows:
+        if not old or new is None or (isinstance(old, float) and math.isnan(old)):
+            continue
+        change = (new - old) / old * 100
+        worse = -change if higher_is_better else change
+        flag = "REGRESSION" if worse > threshold else ""
+        regressions += bool(flag)
+        print(f"  {label:<18}{metric:<18}{old:>11}{new:>11}{change:>+9.1f}%  {flag}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", choices=("synthetic", "test-data"), default="synthetic",
+                        help="synthetic: market-data with MARKET_DATA_PROVIDER=synthetic; "
+                             "test-data: the static test-data-fetcher")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scenario weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of measured load")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests")
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds of unmeasured load first")
+    parser.add_argument("--tickers", type=int, default=20, help="Distinct synthetic tickers")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the request mix")
+    parser.add_argument("--warm-caches", action="store_true",
+                        help="Keep the result cache and stage memos enabled")
+    parser.add_argument("--no-boot", action="store_true", help="Load an already running orchestrator")
+    parser.add_argument("--url", default=None, help="Orchestrator URL with --no-boot")
+    parser.add_argument("--base-port", type=int, default=18011, help="Port of the booted orchestrator")
+    parser.add_argument("--output", default=None, help="Write machine-readable results here")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="Compare two result files")
+    parser.add_argument("--threshold", type=float, default=10, help="Regression threshold in percent")
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(*args.compare, args.threshold)
+
+    scenarios = build_scenarios(args.provider, args.tickers)
+    mix = parse_mix(args.mix, scenarios)
+
+    cluster = None
+    log_dir = tempfile.mkdtemp(prefix="backtest-bench-")
+    if args.no_boot:
+        base_url = args.url or "http://127.0.0.1:8011"
+    else:
+        cluster = ServiceCluster(args.base_port, args.provider, args.warm_caches, log_dir)
+        print(f"booting services on ports {args.base_port}-{args.base_port + 5} (logs in {log_dir})")
+        base_url = cluster.url("orchestrator")
+
+    try:
+        if cluster is not None:
+            cluster.start()
+        if args.warmup > 0:
+            asyncio.run(run_load(base_url, scenarios, mix, args.concurrency, args.warmup, None, args.seed + 1, None))
+        recorder = Recorder()
+        elapsed = asyncio.run(run_load(
+            base_url, scenarios, mix, args.concurrency, args.duration, args.requests, args.seed, recorder
+        ))
+        services = cluster.memory() if cluster is not None else {}
+    finally:
+        if cluster is not None:
+            cluster.stop()
+
+    all_samples = [s for samples in recorder.samples.values() for s in samples]
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "provider": args.provider,
+            "mix": mix,
+            "concurrency": args.concurrency,
+            "warm_caches": args.warm_caches,
+            "elapsed_s": round(elapsed, 2),
+        },
+        "overall": summarize(all_samples, elapsed),
+        "scenarios": {name: summarize(samples, elapsed) for name, samples in sorted(recorder.samples.items())},
+        "services": services,
+    }
+
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nresults written to {args.output}")
+    return 1 if results["overall"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
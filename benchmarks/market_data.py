@@ -0,0 +1,169 @@
+"""
+DataFrame conversion benchmark for the market-data Yahoo provider.
+
+Builds a synthetic yfinance-style history frame (tz-aware exchange-local
+index, OHLCV plus Dividends and Stock Splits columns) and converts it
+twice:
+
+- row path: the former df.iterrows() loop with per-row strftime, building
+  a PriceItem model per bar, kept here as the reference. Its response is
+  the PriceResponse model serialized by pydantic.
+- columnar path: iso_dates, price_bars and dividend_items from
+  providers.yahoo, as used by get_prices, get_bars and
+  get_dividend_history. Bars are plain PriceBar tuples; the /prices
+  response is built with price_rows and encoded by encoding.dumps, with
+  no model per bar.
+
+Both must produce identical items and response bodies (compared as parsed
+JSON); the script exits with status 1 if they differ. Timings are the
+median of --repeat runs.
+
+    python benchmarks/market_data.py
+    python benchmarks/market_data.py --rows 200000 --repeat 3
+
+Run from the repository root with the market-data requirements installed.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, List, Tuple
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "services", "market-data"))
+
+from app.encoding import dumps  # noqa: E402
+from app.schemas.models import PriceItem, PriceData, PriceResponse, DividendItem  # noqa: E402
+from app.providers.base import price_rows  # noqa: E402
+from app.providers.yahoo import iso_dates, price_bars, dividend_items  # noqa: E402
+
+
+# --- Inputs ------------------------------------------------------------------
+
+def synthetic_frame(rows: int, seed: int) -> pd.DataFrame:
+    """A seeded random walk shaped like ticker.history(): one row per calendar day, New York time."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("1900-01-01", periods=rows, freq="D", tz="America/New_York", name="Date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.015, rows)))
+    dividends = np.zeros(rows)
+    dividends[45::91] = np.round(rng.uniform(0.1, 0.9, len(dividends[45::91])), 4)
+    splits = np.zeros(rows)
+    splits[rows // 3] = 2.0
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.003, rows)),
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 50_000_000, rows),
+        "Dividends": dividends,
+        "Stock Splits": splits
+    }, index=index)
+
+
+# --- Reference (row-by-row) path ---------------------------------------------
+
+def rows_prices(df: pd.DataFrame) -> List[PriceItem]:
+    price_list = []
+    for index, row in df.iterrows():
+        price_list.append(PriceItem(
+            date=index.strftime('%Y-%m-%d'),
+            open=float(row['Open']),
+            high=float(row['High']),
+            low=float(row['Low']),
+            close=float(row['Close']),
+            adjusted_close=float(row['Close']),
+            volume=int(row['Volume'])
+        ))
+    return price_list
+
+
+def rows_price_response(df: pd.DataFrame) -> bytes:
+    """The former /prices route: a model per bar, then the response model serialized."""
+    data = PriceData(ticker="SYN", frequency="daily", prices=rows_prices(df))
+    return PriceResponse(success=True, data=data).model_dump_json().encode("utf-8")
+
+
+def columnar_price_response(df: pd.DataFrame) -> bytes:
+    """The /prices route now: PriceBar tuples to PriceItem-shaped dicts, encoded directly."""
+    prices = price_rows(price_bars(df, iso_dates(df.index)))
+    return dumps({"success": True, "data": {"ticker": "SYN", "frequency": "daily", "prices": prices}})
+
+
+def rows_dividends(divs: pd.Series) -> List[DividendItem]:
+    return [
+        DividendItem(ex_date=date.strftime('%Y-%m-%d'), payment_date=None, amount_per_share=float(amount))
+        for date, amount in divs.items()
+    ]
+
+
+# --- Measurement -------------------------------------------------------------
+
+def comparable(value: Any) -> Any:
+    """Models, bars and JSON bodies as plain data, so both paths compare equal."""
+    if isinstance(value, bytes):
+        return json.loads(value)
+    if isinstance(value, list):
+        return [comparable(item) for item in value]
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, tuple) and hasattr(value, "_asdict"):
+        return value._asdict()
+    return value
+
+
+def median_ms(fn: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000, help="Rows in the synthetic frame")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows, args.seed)
+    # ticker.dividends is the non-zero part of the Dividends column
+    divs = df["Dividends"][df["Dividends"] != 0]
+
+    cases = [
+        ("prices", len(df), lambda: rows_prices(df), lambda: price_bars(df, iso_dates(df.index))),
+        ("/prices response", len(df), lambda: rows_price_response(df), lambda: columnar_price_response(df)),
+        ("dividend history", len(divs), lambda: rows_dividends(divs), lambda: dividend_items(divs)),
+        ("dates only", len(df), lambda: df.index.strftime('%Y-%m-%d').tolist(), lambda: iso_dates(df.index).tolist()),
+    ]
+
+    header = f"{'conversion':18} {'rows':>8} {'row path':>10} {'columnar':>11} {'speedup':>8} identical"
+    print(header)
+    print("-" * len(header))
+
+    all_identical = True
+    for name, rows, before, after in cases:
+        before_ms, expected = median_ms(before, args.repeat)
+        after_ms, actual = median_ms(after, args.repeat)
+        identical = comparable(actual) == comparable(expected)
+        all_identical &= identical
+        print(
+            f"{name:18} {rows:>8} {before_ms:>8.1f}ms {after_ms:>9.1f}ms {before_ms / max(after_ms, 1e-6):>7.1f}x "
+            f"{'yes' if identical else 'NO'}"
+        )
+
+    if not all_identical:
+        print("FAIL: columnar conversion differs from the row path")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
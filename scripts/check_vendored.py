@@ -0,0 +1,66 @@
+"""
+Check that modules vendored into several services are still identical.
+
+Each service is built from its own directory (see docker-compose.yml), so
+code shared between services is copied into each of them rather than
+imported from a common package. Every group below must stay
+byte-identical: edit one copy, then copy it over the others.
+
+    python scripts/check_vendored.py
+
+Exits with status 1 and names the differing files if a group has drifted.
+"""
+import hashlib
+import os
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMPUTE_SERVICES = ("strategy", "portfolio", "metrics")
+
+# Group name -> paths (relative to the repository root) that must match
+VENDORED: Dict[str, List[str]] = {
+    "MessagePack codec": ["services/orchestrator/app/clients/codec.py"] + [
+        f"services/{service}/app/codec.py" for service in ("market-data",) + COMPUTE_SERVICES
+    ],
+    "MessagePack routes": [
+        f"services/{service}/app/serialization.py" for service in ("market-data",) + COMPUTE_SERVICES
+    ],
+    "Fast JSON encoding": [
+        "services/orchestrator/app/routes/encoding.py", "services/market-data/app/encoding.py"
+    ],
+    "Deadline middleware": [
+        f"services/{service}/app/deadline.py" for service in ("market-data",) + COMPUTE_SERVICES
+    ],
+    "Request cancellation": [
+        f"services/{service}/app/cancellation.py" for service in COMPUTE_SERVICES
+    ],
+}
+
+
+def digest(path: str) -> str:
+    with open(os.path.join(ROOT, path), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def main() -> int:
+    ok = True
+    for group, paths in VENDORED.items():
+        missing = [p for p in paths if not os.path.isfile(os.path.join(ROOT, p))]
+        if missing:
+            ok = False
+            print(f"{group}: missing {', '.join(missing)}")
+            continue
+        reference = digest(paths[0])
+        drifted = [p for p in paths[1:] if digest(p) != reference]
+        if drifted:
+            ok = False
+            print(f"{group}: differs from {paths[0]}: {', '.join(drifted)}")
+        else:
+            print(f"{group}: {len(paths)} copies identical")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+JSON response encoding with orjson, byte-identical to the stdlib encoder.
+Vendored into the services that serve large JSON payloads:
+
+    services/orchestrator/app/routes/encoding.py
+    services/market-data/app/encoding.py
+
+Keep the copies byte-identical; scripts/check_vendored.py fails otherwise.
+"""
+import json
+import os
+import re
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional: without it responses use the stdlib encoder
+    orjson = None
+
+
+# Encode large responses with orjson when it is installed
+FAST_JSON_ENABLED = os.environ.get("FAST_JSON_ENABLED", "true").lower() == "true"
+
+# Numbers orjson spells differently from float.__repr__: it writes 0.00001
+# where Python writes 1e-05, and its exponents read 2e-7 and 1e16, not 2e-07
+# and 1e+16. Any sign of either (possibly a false positive inside a string)
+# falls back to stdlib. Both checks are literal-prefix scans, a few ms per MB.
+_EXPONENT = re.compile(rb"e[-\d]")
+_SMALL_DECIMAL = b"0.0000"
+
+
+def _has_small_decimal(body: bytes) -> bool:
+    """
+    Whether a number in `body` starts with 0.0000. Digits like those in
+    100.00001 are not one; long price tables contain a few of them, and
+    they would otherwise send the whole body to the stdlib encoder.
+    """
+    at = body.find(_SMALL_DECIMAL)
+    while at != -1:
+        if at == 0 or not body[at - 1:at].isdigit():
+            return True
+        at = body.find(_SMALL_DECIMAL, at + 1)
+    return False
+
+
+def orjson_available() -> bool:
+    return orjson is not None
+
+
+def dumps_stdlib(content: Any) -> bytes:
+    """The encoding Starlette's JSONResponse applies."""
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode `content` to the same bytes as dumps_stdlib, several times faster
+    when orjson is available. NaN and infinity, which the stdlib encoder
+    rejects, come out as null.
+    """
+    if not (FAST_JSON_ENABLED and orjson is not None):
+        return dumps_stdlib(content)
+    try:
+        body = orjson.dumps(content)
+    except TypeError:  # orjson.JSONEncodeError: e.g. non-str keys or ints beyond 64 bits
+        return dumps_stdlib(content)
+    if _has_small_decimal(body) or _EXPONENT.search(body):
+        return dumps_stdlib(content)
+    return body
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with `dumps`; the body is identical, only faster to build."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
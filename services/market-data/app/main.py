@@ -1,6 +1,11 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import prices, dividends, search
+from app.routes import prices, dividends, bars, search
+from app.deadline import DeadlineMiddleware
+from app.providers.registry import store_stats, dividend_cache_stats, upstream_stats
+from app.providers.executor import provider_executor
 
 app = FastAPI(
     title="Market Data Service",
@@ -16,12 +21,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Handler time (including upstream provider fetches) for the caller's telemetry
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    response.headers["Server-Timing"] = f"app;dur={(time.perf_counter() - start) * 1000:.1f}"
+    return response
+
+app.add_middleware(DeadlineMiddleware)
+
 # Registering the routers for price and dividend endpoints
 app.include_router(prices.router, tags=["Prices"])
 app.include_router(dividends.router, tags=["Dividends"])
+app.include_router(bars.router, tags=["Bars"])
 app.include_router(search.router, tags=["Search"])
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint for Docker."""
     return {"status": "healthy", "service": "market-data"}
+
+@app.get("/stats")
+async def get_stats():
+    """Request coalescing, provider pool, upstream limiter, price store and dividend cache statistics."""
+    return {
+        "coalescing": {
+            "prices": prices.price_flight.stats(),
+            "dividends": dividends.dividend_flight.stats(),
+            "bars": bars.bars_flight.stats()
+        },
+        "executor": provider_executor.stats(),
+        "upstream": upstream_stats(),
+        "store": store_stats(),
+        "dividend_cache": dividend_cache_stats()
+    }
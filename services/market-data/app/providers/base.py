@@ -1,6 +1,30 @@
 from abc import ABC, abstractmethod
-from typing import List
-from app.schemas.models import PriceItem, DividendItem, SearchResult
+from typing import Any, Dict, List, NamedTuple
+from app.schemas.models import DividendItem, SplitItem, SearchResult
+
+class PriceBar(NamedTuple):
+    """
+    One OHLCV bar, shaped like PriceItem. A plain tuple: long histories
+    are built and served without a model per bar (see price_rows).
+    """
+    date: str
+    open: float
+    high: float
+    low: float
+    close: float
+    adjusted_close: float  # Critical for backtesting accuracy
+    volume: int
+
+def price_rows(prices: List[PriceBar]) -> List[Dict[str, Any]]:
+    """Bars as PriceItem-shaped dicts, ready to serialize"""
+    fields = PriceBar._fields
+    return [dict(zip(fields, bar)) for bar in prices]
+
+class Bars(NamedTuple):
+    """Prices in [start, end) with the dividends and splits in [start, end]"""
+    prices: List[PriceBar]
+    dividends: List[DividendItem]
+    splits: List[SplitItem]
 
 class BaseDataProvider(ABC):
     """
@@ -9,7 +33,7 @@ class BaseDataProvider(ABC):
     """
 
     @abstractmethod
-    def get_prices(self, ticker: str, start: str, end: str, frequency: str) -> List[PriceItem]:
+    def get_prices(self, ticker: str, start: str, end: str, frequency: str) -> List[PriceBar]:
         """Fetch historical price data (OHLCV)"""
         pass
 
@@ -21,4 +45,23 @@ class BaseDataProvider(ABC):
     @abstractmethod
     def search_ticker(self, query: str) -> List[SearchResult]:
         """Search for ticker information"""
-        pass
\ No newline at end of file
+        pass
+
+    def get_dividend_history(self, ticker_symbol: str) -> List[DividendItem]:
+        """
+        Fetch every dividend on record for a ticker, oldest first. Only
+        needed for the dividend cache (see CachedDividendsProvider).
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot fetch whole dividend histories")
+
+    def get_bars(self, ticker_symbol: str, start: str, end: str, frequency: str) -> Bars:
+        """
+        Fetch prices, dividends and splits together. Providers that can get
+        them from one upstream call override this; by default it is the
+        two separate fetches, without splits.
+        """
+        return Bars(
+            prices=self.get_prices(ticker_symbol=ticker_symbol, start=start, end=end, frequency=frequency),
+            dividends=self.get_dividends(ticker_symbol=ticker_symbol, start=start, end=end),
+            splits=[]
+        )
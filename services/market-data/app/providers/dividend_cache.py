@@ -0,0 +1,153 @@
+import bisect
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from app.schemas.models import DividendItem, SearchResult
+from app.providers.base import BaseDataProvider, Bars, PriceBar
+
+# Answer dividend queries from each ticker's cached full history
+DIVIDEND_CACHE_ENABLED = os.environ.get("DIVIDEND_CACHE_ENABLED", "true").lower() == "true"
+# Seconds before a history is refreshed (in the background; the cached one is served meanwhile)
+DIVIDEND_CACHE_TTL = float(os.environ.get("DIVIDEND_CACHE_TTL", "86400"))
+# Tickers kept; the least recently queried are dropped beyond this
+DIVIDEND_CACHE_MAX_TICKERS = int(os.environ.get("DIVIDEND_CACHE_MAX_TICKERS", "2000"))
+
+
+class _History:
+    """A ticker's dividends, sorted by ex-date, with the ex-dates alone for bisecting."""
+
+    def __init__(self, dividends: List[DividendItem], fetched_at: float):
+        self.dividends = sorted(dividends, key=lambda d: d.ex_date)
+        self.dates = [d.ex_date for d in self.dividends]
+        self.fetched_at = fetched_at
+
+    def between(self, start: str, end: str) -> List[DividendItem]:
+        """Dividends with start <= ex_date <= end."""
+        return self.dividends[bisect.bisect_left(self.dates, start):bisect.bisect_right(self.dates, end)]
+
+
+class CachedDividendsProvider(BaseDataProvider):
+    """
+    Serves get_dividends from each ticker's full dividend history, kept in
+    memory, instead of downloading that history for every query.
+
+    The first query for a ticker fetches its history (concurrent first
+    queries share the fetch); later ones are a binary search over the
+    cached ex-dates. Once a history is older than `ttl_seconds` it is
+    still served, and refreshed in the background, so repeat queries never
+    wait on the network. Everything else goes to the wrapped provider,
+    which must implement get_dividend_history.
+    """
+
+    def __init__(self, provider: BaseDataProvider, ttl_seconds: float = 86400, max_tickers: int = 2000):
+        self.provider = provider
+        self.ttl_seconds = ttl_seconds
+        self.max_tickers = max_tickers
+        self._histories: "OrderedDict[str, _History]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._refreshing = set()
+        self._refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dividend-refresh")
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "evictions": 0
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _cached(self, key: str) -> Optional[_History]:
+        with self._lock:
+            history = self._histories.get(key)
+            if history is not None:
+                self._histories.move_to_end(key)
+            return history
+
+    def _load(self, key: str, ticker_symbol: str) -> _History:
+        fetched_at = time.time()
+        history = _History(self.provider.get_dividend_history(ticker_symbol), fetched_at)
+        with self._lock:
+            self._histories[key] = history
+            self._histories.move_to_end(key)
+            while len(self._histories) > self.max_tickers:
+                self._histories.popitem(last=False)
+                self._counters["evictions"] += 1
+        return history
+
+    def _refresh(self, key: str, ticker_symbol: str) -> None:
+        try:
+            self._load(key, ticker_symbol)
+            self._count("refreshes")
+        except Exception:
+            # Keep serving the cached history; the next query past the TTL retries
+            self._count("refresh_errors")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_dividends(self, ticker_symbol: str, start: str, end: str) -> List[DividendItem]:
+        key = ticker_symbol.upper()
+        history = self._cached(key)
+        if history is None:
+            with self._lock:
+                fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+            with fetch_lock:
+                # Another query may have loaded it while this one waited
+                history = self._cached(key)
+                if history is None:
+                    self._count("misses")
+                    history = self._load(key, ticker_symbol)
+                else:
+                    self._count("hits")
+            with self._lock:
+                self._fetch_locks.pop(key, None)
+        elif time.time() - history.fetched_at > self.ttl_seconds:
+            self._count("stale_hits")
+            with self._lock:
+                schedule = key not in self._refreshing
+                self._refreshing.add(key)
+            if schedule:
+                self._refresher.submit(self._refresh, key, ticker_symbol)
+        else:
+            self._count("hits")
+        return history.between(start, end)
+
+    def get_dividend_history(self, ticker_symbol: str) -> List[DividendItem]:
+        return self.get_dividends(ticker_symbol, "", "9999-12-31")
+
+    def get_prices(self, ticker_symbol: str, start: str, end: str, frequency: str) -> List[PriceBar]:
+        return self.provider.get_prices(ticker_symbol=ticker_symbol, start=start, end=end, frequency=frequency)
+
+    def get_bars(self, ticker_symbol: str, start: str, end: str, frequency: str) -> Bars:
+        return self.provider.get_bars(ticker_symbol=ticker_symbol, start=start, end=end, frequency=frequency)
+
+    def search_ticker(self, query: str) -> List[SearchResult]:
+        return self.provider.search_ticker(query)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ttl_seconds": self.ttl_seconds,
+                "max_tickers": self.max_tickers,
+                **self._counters,
+                "refreshing": len(self._refreshing),
+                "tickers": len(self._histories),
+                "dividends": sum(len(h.dividends) for h in self._histories.values())
+            }
+
+
+def cached_dividends(provider: BaseDataProvider) -> BaseDataProvider:
+    """`provider` with its dividend histories cached, when DIVIDEND_CACHE_ENABLED."""
+    if not DIVIDEND_CACHE_ENABLED:
+        return provider
+    return CachedDividendsProvider(
+        provider, ttl_seconds=DIVIDEND_CACHE_TTL, max_tickers=DIVIDEND_CACHE_MAX_TICKERS
+    )
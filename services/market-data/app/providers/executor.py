@@ -0,0 +1,82 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+# Worker threads for provider calls (store lookups and upstream fetches)
+PROVIDER_WORKERS = int(os.environ.get("PROVIDER_WORKERS", "16"))
+
+
+class ProviderExecutor:
+    """
+    Runs blocking provider calls on a dedicated, bounded thread pool.
+
+    Handlers await `run` instead of calling the provider directly, so the
+    event loop keeps serving other requests while a fetch is in flight.
+    Calls beyond `workers` wait in the pool's queue; `stats` reports how
+    many are waiting and how long they waited to start.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="provider")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.started = 0
+        self.abandoned = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        submitted = time.perf_counter()
+
+        def call() -> T:
+            waited = time.perf_counter() - submitted
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self.started += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+        with self._lock:
+            self.queued += 1
+        future = self._pool.submit(call)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # The caller gave up (deadline, coalesced fetch abandoned). A call
+            # still queued is dropped; one already running finishes in its thread
+            if future.cancel():
+                with self._lock:
+                    self.queued -= 1
+                    self.abandoned += 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self.queued,
+                "running": self.running,
+                "started": self.started,
+                "abandoned": self.abandoned,
+                "wait_ms": {
+                    "avg": round(self.wait_total / self.started * 1000, 2) if self.started else 0.0,
+                    "max": round(self.wait_max * 1000, 2)
+                }
+            }
+
+
+# Shared by all routes
+provider_executor = ProviderExecutor(PROVIDER_WORKERS)
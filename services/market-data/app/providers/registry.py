@@ -0,0 +1,56 @@
+import os
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from app.providers.base import BaseDataProvider
+from app.providers.synthetic import SyntheticProvider
+from app.providers.store import StoredProvider, stored
+from app.providers.throttle import ThrottledProvider, throttled
+from app.providers.dividend_cache import CachedDividendsProvider, cached_dividends
+
+# yahoo (default) or synthetic (deterministic offline data for benchmarks)
+MARKET_DATA_PROVIDER = os.environ.get("MARKET_DATA_PROVIDER", "yahoo").lower()
+
+
+@lru_cache(maxsize=1)
+def get_provider() -> BaseDataProvider:
+    """
+    The data provider selected by MARKET_DATA_PROVIDER, behind the price
+    store; shared by all routes. Yahoo dividend histories are cached, and
+    its calls are kept within the UPSTREAM_* limits (the synthetic provider
+    has no network to spare).
+    """
+    if MARKET_DATA_PROVIDER == "synthetic":
+        return stored(SyntheticProvider())
+    if MARKET_DATA_PROVIDER != "yahoo":
+        raise ValueError(f"Unknown MARKET_DATA_PROVIDER '{MARKET_DATA_PROVIDER}' (expected yahoo or synthetic)")
+    # Imported lazily so the synthetic provider runs without yfinance installed
+    from app.providers.yahoo import YahooFinanceProvider
+    return stored(cached_dividends(throttled(YahooFinanceProvider())))
+
+
+def _layer(kind: type) -> Optional[BaseDataProvider]:
+    """The `kind` wrapper in the provider chain, if configured."""
+    provider = get_provider()
+    while not isinstance(provider, kind):
+        provider = getattr(provider, "provider", None)
+        if provider is None:
+            return None
+    return provider
+
+
+def store_stats() -> Optional[Dict[str, Any]]:
+    """Price store counters, or None when the store is disabled."""
+    store = _layer(StoredProvider)
+    return store.stats() if store is not None else None
+
+
+def dividend_cache_stats() -> Optional[Dict[str, Any]]:
+    """Dividend cache counters, or None when dividends are not cached."""
+    cache = _layer(CachedDividendsProvider)
+    return cache.stats() if cache is not None else None
+
+
+def upstream_stats() -> Optional[Dict[str, Any]]:
+    """Upstream concurrency and rate limiter counters, or None when the provider is not limited."""
+    limiter = _layer(ThrottledProvider)
+    return limiter.stats() if limiter is not None else None
@@ -0,0 +1,453 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+from app.schemas.models import DividendItem, SplitItem, SearchResult
+from app.providers.base import BaseDataProvider, Bars, PriceBar
+
+# Keep fetched daily bars in a local SQLite file and fetch only what is missing
+PRICE_STORE_ENABLED = os.environ.get("PRICE_STORE_ENABLED", "true").lower() == "true"
+PRICE_STORE_PATH = os.environ.get("PRICE_STORE_PATH", "prices.db")
+# Disk budget; least recently used tickers are evicted beyond it
+PRICE_STORE_MAX_MB = float(os.environ.get("PRICE_STORE_MAX_MB", "512"))
+# Bars this close to today can still change (today's bar is live) ...
+PRICE_STORE_RECENT_DAYS = int(os.environ.get("PRICE_STORE_RECENT_DAYS", "5"))
+# ... so they are refetched once they were stored longer ago than this (seconds)
+PRICE_STORE_RECENT_TTL = float(os.environ.get("PRICE_STORE_RECENT_TTL", "900"))
+
+# Calendar days a gap fetch reaches back into stored bars, to check they still match
+OVERLAP_DAYS = 7
+# Relative close difference past which stored bars are considered re-adjusted
+ADJUSTMENT_TOLERANCE = 1e-6
+# Bumped when the tables change; an older file is emptied and refilled
+SCHEMA_VERSION = 2
+
+Interval = Tuple[str, str]
+
+
+def _shift(iso_date: str, days: int) -> str:
+    return (date.fromisoformat(iso_date) + timedelta(days=days)).isoformat()
+
+
+def subtract(wanted: Interval, covered: List[Interval]) -> List[Interval]:
+    """Parts of the [start, end) range `wanted` not inside any of the sorted, disjoint `covered` ranges."""
+    start, end = wanted
+    gaps = []
+    for lo, hi in covered:
+        if hi <= start or lo >= end:
+            continue
+        if lo > start:
+            gaps.append((start, lo))
+        start = max(start, hi)
+        if start >= end:
+            break
+    if start < end:
+        gaps.append((start, end))
+    return gaps
+
+
+def merge(intervals: List[Tuple[str, str, float]]) -> List[Tuple[str, str, float]]:
+    """
+    Union of disjoint (start, end, fetched_at) ranges. A merged range takes
+    the fetch time of its last piece: only the trailing edge goes stale.
+    """
+    merged: List[Tuple[str, str, float]] = []
+    for start, end, fetched_at in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            lo, hi, at = merged[-1]
+            merged[-1] = (lo, max(hi, end), fetched_at if end >= hi else at)
+        else:
+            merged.append((start, end, fetched_at))
+    return merged
+
+
+class PriceStore:
+    """
+    Daily OHLCV bars per ticker in SQLite, with their dividends and
+    splits (actions) and the date ranges that have been fetched (coverage)
+    so gaps can be told apart from days without trading.
+
+    Methods are blocking; call them from a worker thread. Each call opens
+    its own connection so the store can be used from any thread.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        if not self._initialized:
+            with self._lock:
+                # Only takes effect on a new file; lets eviction hand pages back
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("PRAGMA journal_mode=WAL")
+                if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    for table in ("bars", "actions", "coverage", "tickers"):
+                        conn.execute(f"DROP TABLE IF EXISTS {table}")
+                    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS bars ("
+                    " ticker TEXT NOT NULL, date TEXT NOT NULL,"
+                    " open REAL, high REAL, low REAL, close REAL, adjusted_close REAL, volume INTEGER,"
+                    " PRIMARY KEY (ticker, date)) WITHOUT ROWID"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS actions ("
+                    " ticker TEXT NOT NULL, date TEXT NOT NULL, kind TEXT NOT NULL, value REAL NOT NULL,"
+                    " PRIMARY KEY (ticker, date, kind)) WITHOUT ROWID"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS coverage ("
+                    " ticker TEXT NOT NULL, start TEXT NOT NULL, end TEXT NOT NULL, fetched_at REAL NOT NULL,"
+                    " PRIMARY KEY (ticker, start))"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS tickers (ticker TEXT PRIMARY KEY, last_used REAL NOT NULL)"
+                )
+                conn.commit()
+                self._initialized = True
+        return conn
+
+    def coverage(self, ticker: str) -> List[Tuple[str, str, float]]:
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT start, end, fetched_at FROM coverage WHERE ticker = ? ORDER BY start", (ticker,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def bars(self, ticker: str, start: str, end: str) -> List[PriceBar]:
+        """Stored bars dated in [start, end), oldest first; marks the ticker as used."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT date, open, high, low, close, adjusted_close, volume FROM bars"
+                " WHERE ticker = ? AND date >= ? AND date < ? ORDER BY date",
+                (ticker, start, end)
+            ).fetchall()
+            conn.execute(
+                "INSERT OR REPLACE INTO tickers (ticker, last_used) VALUES (?, ?)", (ticker, time.time())
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        return [PriceBar._make(row) for row in rows]
+
+    def actions(self, ticker: str, start: str, end: str) -> Tuple[List[DividendItem], List[SplitItem]]:
+        """Stored dividends and splits dated in [start, end), oldest first."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT date, kind, value FROM actions WHERE ticker = ? AND date >= ? AND date < ? ORDER BY date",
+                (ticker, start, end)
+            ).fetchall()
+        finally:
+            conn.close()
+        dividends = [
+            DividendItem(ex_date=day, payment_date=None, amount_per_share=value)
+            for day, kind, value in rows if kind == "dividend"
+        ]
+        splits = [SplitItem(date=day, ratio=value) for day, kind, value in rows if kind == "split"]
+        return dividends, splits
+
+    def closes(self, ticker: str, dates: List[str]) -> Dict[str, float]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT date, close FROM bars WHERE ticker = ? AND date IN ({','.join('?' * len(dates))})",
+                (ticker, *dates)
+            ).fetchall()
+        finally:
+            conn.close()
+        return dict(rows)
+
+    def add(self, ticker: str, bars: Bars, fetched: Interval, fetched_at: float) -> None:
+        """Store `bars` (all dated within `fetched`) and record `fetched` as covered, merged with the existing coverage."""
+        start, end = fetched
+        conn = self._connect()
+        try:
+            for table in ("bars", "actions"):
+                conn.execute(f"DELETE FROM {table} WHERE ticker = ? AND date >= ? AND date < ?", (ticker, start, end))
+            conn.executemany(
+                "INSERT OR REPLACE INTO bars (ticker, date, open, high, low, close, adjusted_close, volume)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(ticker, b.date, b.open, b.high, b.low, b.close, b.adjusted_close, b.volume) for b in bars.prices]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO actions (ticker, date, kind, value) VALUES (?, ?, ?, ?)",
+                [(ticker, d.ex_date, "dividend", d.amount_per_share) for d in bars.dividends]
+                + [(ticker, s.date, "split", s.ratio) for s in bars.splits]
+            )
+            existing = conn.execute(
+                "SELECT start, end, fetched_at FROM coverage WHERE ticker = ?", (ticker,)
+            ).fetchall()
+            # A refetched range replaces what it overlaps, with the new fetch time
+            kept = [(s, e, at) for s, e, at in existing if e <= start or s >= end]
+            clipped = [(s, start, at) for s, e, at in existing if s < start < e]
+            clipped += [(end, e, at) for s, e, at in existing if s < end < e]
+            intervals = merge(kept + clipped + [(start, end, fetched_at)])
+            conn.execute("DELETE FROM coverage WHERE ticker = ?", (ticker,))
+            conn.executemany(
+                "INSERT INTO coverage (ticker, start, end, fetched_at) VALUES (?, ?, ?, ?)",
+                [(ticker, *interval) for interval in intervals]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO tickers (ticker, last_used) VALUES (?, ?)", (ticker, time.time())
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def drop(self, ticker: str) -> None:
+        conn = self._connect()
+        try:
+            self._drop(conn, ticker)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _drop(self, conn: sqlite3.Connection, ticker: str) -> None:
+        for table in ("bars", "actions", "coverage", "tickers"):
+            conn.execute(f"DELETE FROM {table} WHERE ticker = ?", (ticker,))
+
+    def size_bytes(self) -> int:
+        """Bytes in use (allocated pages minus free ones)."""
+        conn = self._connect()
+        try:
+            return self._size(conn)
+        finally:
+            conn.close()
+
+    def _size(self, conn: sqlite3.Connection) -> int:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        pages = conn.execute("PRAGMA page_count").fetchone()[0] - conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return pages * page_size
+
+    def evict(self, keep: str) -> int:
+        """Drop least recently used tickers (never `keep`) until under the disk budget."""
+        conn = self._connect()
+        evicted = 0
+        try:
+            if self._size(conn) <= self.max_bytes:
+                return 0
+            victims = [
+                row[0] for row in conn.execute(
+                    "SELECT ticker FROM tickers WHERE ticker != ? ORDER BY last_used", (keep,)
+                ).fetchall()
+            ]
+            for ticker in victims:
+                self._drop(conn, ticker)
+                conn.commit()
+                evicted += 1
+                if self._size(conn) <= self.max_bytes:
+                    break
+            conn.execute("PRAGMA incremental_vacuum")
+            conn.commit()
+        finally:
+            conn.close()
+        self.evictions += evicted
+        return evicted
+
+    def counts(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            return {
+                "tickers": conn.execute("SELECT COUNT(*) FROM tickers").fetchone()[0],
+                "bars": conn.execute("SELECT COUNT(*) FROM bars").fetchone()[0],
+                "bytes": self._size(conn)
+            }
+        finally:
+            conn.close()
+
+
+class StoredProvider(BaseDataProvider):
+    """
+    Serves daily prices (and, for get_bars, their dividends and splits)
+    from a PriceStore, fetching only the date ranges it does not hold yet
+    from the wrapped provider and merging them in.
+
+    Historical bars never change, so they are kept until evicted. Bars
+    within PRICE_STORE_RECENT_DAYS of today are refetched once they are
+    older than PRICE_STORE_RECENT_TTL. Yahoo prices are dividend/split
+    adjusted, so a new dividend changes the whole history: every gap fetch
+    reaches a few days into the stored bars, and if those no longer match,
+    the ticker's bars are dropped and the full range is fetched again.
+    Weekly and monthly bars, get_dividends and search go straight to the
+    wrapped provider. If the store fails, requests fall back to it too.
+    """
+
+    def __init__(
+        self,
+        provider: BaseDataProvider,
+        store: PriceStore,
+        recent_days: int = 5,
+        recent_ttl_seconds: float = 900
+    ):
+        self.provider = provider
+        self.store = store
+        self.recent_days = recent_days
+        self.recent_ttl_seconds = recent_ttl_seconds
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "partial_hits": 0,
+            "misses": 0,
+            "bypasses": 0,
+            "stale_refreshes": 0,
+            "invalidations": 0,
+            "errors": 0,
+            "upstream_fetches": 0,
+            "bars_fetched": 0,
+            "bars_served": 0
+        }
+
+    def _count(self, **amounts: int) -> None:
+        with self._stats_lock:
+            for name, amount in amounts.items():
+                self._counters[name] += amount
+
+    def _lock_for(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def get_prices(self, ticker_symbol: str, start: str, end: str, frequency: str) -> List[PriceBar]:
+        if frequency not in ("daily", "1d") or start >= end:
+            self._count(bypasses=1)
+            return self.provider.get_prices(ticker_symbol=ticker_symbol, start=start, end=end, frequency=frequency)
+
+        key = ticker_symbol.upper()
+        # One fetcher per ticker at a time; others then find the bars stored
+        with self._lock_for(key):
+            try:
+                return self._get_daily(key, ticker_symbol, start, end).prices
+            except sqlite3.Error:
+                self._count(errors=1)
+                return self.provider.get_prices(ticker_symbol=ticker_symbol, start=start, end=end, frequency=frequency)
+
+    def get_bars(self, ticker_symbol: str, start: str, end: str, frequency: str) -> Bars:
+        if frequency not in ("daily", "1d") or start >= end:
+            self._count(bypasses=1)
+            return self.provider.get_bars(ticker_symbol=ticker_symbol, start=start, end=end, frequency=frequency)
+
+        key = ticker_symbol.upper()
+        with self._lock_for(key):
+            try:
+                # Dividends and splits on the end date are included, as with /dividends
+                bars = self._get_daily(key, ticker_symbol, start, _shift(end, 1), actions=True)
+            except sqlite3.Error:
+                self._count(errors=1)
+                return self.provider.get_bars(ticker_symbol=ticker_symbol, start=start, end=end, frequency=frequency)
+        return bars._replace(prices=[p for p in bars.prices if p.date < end])
+
+    def _get_daily(self, key: str, ticker_symbol: str, start: str, end: str, actions: bool = False) -> Bars:
+        today = date.today()
+        # Nothing trades after today, so that part of a range is never a gap
+        wanted = (start, min(end, (today + timedelta(days=1)).isoformat()))
+        recent = (today - timedelta(days=self.recent_days)).isoformat()
+
+        covered, stale = [], False
+        for lo, hi, fetched_at in self.store.coverage(key):
+            if hi > recent and time.time() - fetched_at > self.recent_ttl_seconds:
+                # Its trailing bars may have changed since; treat them as missing
+                trimmed = max(lo, recent)
+                stale |= trimmed < wanted[1] and hi > wanted[0]
+                hi = trimmed
+            if lo < hi:
+                covered.append((lo, hi))
+
+        gaps = subtract(wanted, covered) if wanted[0] < wanted[1] else []
+        if not gaps:
+            self._count(hits=1)
+        elif gaps == [wanted]:
+            self._count(misses=1)
+        else:
+            self._count(partial_hits=1)
+        if stale:
+            self._count(stale_refreshes=1)
+
+        for gap in gaps:
+            if not self._fill(key, ticker_symbol, gap, covered):
+                # Stored bars were re-adjusted upstream; start over for this range
+                self._count(invalidations=1)
+                self.store.drop(key)
+                self._fill(key, ticker_symbol, wanted, [])
+                break
+
+        if gaps:
+            self.store.evict(keep=key)
+        prices = self.store.bars(key, start, end)
+        self._count(bars_served=len(prices))
+        dividends, splits = self.store.actions(key, start, end) if actions else ([], [])
+        return Bars(prices=prices, dividends=dividends, splits=splits)
+
+    def _fill(self, key: str, ticker_symbol: str, gap: Interval, covered: List[Interval]) -> bool:
+        """Fetch and store one missing range; False if the bars next to it no longer match."""
+        start, end = gap
+        # Reach into the stored bars on either side of the gap to compare them
+        fetch_start = _shift(start, -OVERLAP_DAYS) if any(lo < start <= hi for lo, hi in covered) else start
+        fetch_end = _shift(end, OVERLAP_DAYS) if any(lo <= end < hi for lo, hi in covered) else end
+
+        fetched_at = time.time()
+        fetched = self.provider.get_bars(ticker_symbol=ticker_symbol, start=fetch_start, end=fetch_end, frequency="daily")
+        bars = fetched.prices
+        self._count(upstream_fetches=1, bars_fetched=len(bars))
+
+        overlap = [b for b in bars if b.date < start or b.date >= end]
+        if overlap:
+            stored = self.store.closes(key, [b.date for b in overlap])
+            for bar in overlap:
+                old = stored.get(bar.date)
+                if old is not None and abs(old - bar.close) > ADJUSTMENT_TOLERANCE * max(abs(old), 1.0):
+                    return False
+
+        if not bars and not covered:
+            # Unknown ticker or an upstream hiccup; do not remember an empty history
+            return True
+        self.store.add(key, Bars(
+            prices=[b for b in bars if start <= b.date < end],
+            dividends=[d for d in fetched.dividends if start <= d.ex_date < end],
+            splits=[s for s in fetched.splits if start <= s.date < end]
+        ), (start, end), fetched_at)
+        return True
+
+    def get_dividends(self, ticker_symbol: str, start: str, end: str) -> List[DividendItem]:
+        return self.provider.get_dividends(ticker_symbol=ticker_symbol, start=start, end=end)
+
+    def search_ticker(self, query: str) -> List[SearchResult]:
+        return self.provider.search_ticker(query)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            counters = dict(self._counters)
+        try:
+            contents = self.store.counts()
+        except sqlite3.Error:
+            contents = None
+        return {
+            "path": self.store.path,
+            "max_bytes": self.store.max_bytes,
+            **counters,
+            "evictions": self.store.evictions,
+            "contents": contents
+        }
+
+
+def stored(provider: BaseDataProvider) -> BaseDataProvider:
+    """`provider` behind the price store, when PRICE_STORE_ENABLED."""
+    if not PRICE_STORE_ENABLED:
+        return provider
+    return StoredProvider(
+        provider,
+        PriceStore(PRICE_STORE_PATH, int(PRICE_STORE_MAX_MB * 1024 * 1024)),
+        recent_days=PRICE_STORE_RECENT_DAYS,
+        recent_ttl_seconds=PRICE_STORE_RECENT_TTL
+    )
@@ -0,0 +1,109 @@
+import bisect
+import hashlib
+import math
+import random
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, Tuple
+from app.schemas.models import DividendItem, SearchResult
+from app.providers.base import BaseDataProvider, PriceBar
+
+# Every series spans these business days, so any requested range of a
+# ticker is a slice of one stable path
+EPOCH = date(1990, 1, 1)
+HORIZON = date(2040, 1, 1)
+
+
+def _seed(ticker_symbol: str) -> int:
+    # hash() is randomized per process; series must be identical across runs
+    return int.from_bytes(hashlib.blake2b(ticker_symbol.upper().encode(), digest_size=8).digest(), "big")
+
+
+def _business_days(start: date, end: date) -> List[date]:
+    days = []
+    day = start
+    while day < end:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+@lru_cache(maxsize=64)
+def _path(ticker_symbol: str) -> Tuple[List[str], List[tuple]]:
+    """ISO dates and (open, high, low, close, volume) rows of a ticker's whole series."""
+    rng = random.Random(_seed(ticker_symbol))
+    drift = rng.uniform(-0.0001, 0.0004)
+    volatility = rng.uniform(0.01, 0.03)
+    close = rng.uniform(20, 300)
+
+    dates, rows = [], []
+    for day in _business_days(EPOCH, HORIZON):
+        open_ = close
+        close = max(0.01, close * math.exp(drift + volatility * rng.gauss(0, 1)))
+        spread = abs(rng.gauss(0, volatility / 2))
+        dates.append(day.isoformat())
+        rows.append((
+            round(open_, 4),
+            round(max(open_, close) * (1 + spread), 4),
+            round(min(open_, close) * (1 - spread), 4),
+            round(close, 4),
+            int(rng.uniform(1e6, 5e7))
+        ))
+    return dates, rows
+
+
+class SyntheticProvider(BaseDataProvider):
+    """
+    Deterministic random-walk market data for load tests and benchmarks.
+
+    Each ticker gets its own geometric random walk (seeded from the symbol)
+    over business days from 1990 to 2040, plus a quarterly dividend, so the
+    same request always returns the same bars without any network access.
+    Ranges follow yfinance semantics: the end date is exclusive.
+    """
+
+    def get_prices(self, ticker_symbol: str, start: str, end: str, frequency: str) -> List[PriceBar]:
+        """Bars in [start, end); weekly/monthly keep the first trading day of each period."""
+        dates, rows = _path(ticker_symbol)
+        lo, hi = bisect.bisect_left(dates, start), bisect.bisect_left(dates, end)
+        daily = [
+            PriceBar(dates[i], o, h, l, c, c, v)
+            for i, (o, h, l, c, v) in zip(range(lo, hi), rows[lo:hi])
+        ]
+        if frequency not in ("weekly", "monthly"):
+            return daily
+
+        period = (
+            (lambda d: date.fromisoformat(d).isocalendar()[:2]) if frequency == "weekly"
+            else (lambda d: d[:7])
+        )
+        sampled, seen = [], set()
+        for price in daily:
+            key = period(price.date)
+            if key not in seen:
+                seen.add(key)
+                sampled.append(price)
+        return sampled
+
+    def get_dividends(self, ticker_symbol: str, start: str, end: str) -> List[DividendItem]:
+        """A fixed quarterly dividend on the third Friday of Feb, May, Aug and Nov."""
+        rng = random.Random(_seed(ticker_symbol) ^ 0xD1D)
+        amount = round(rng.uniform(0.05, 0.5), 4)
+
+        dividends = []
+        for year in range(int(start[:4]), int(end[:4]) + 1):
+            for month in (2, 5, 8, 11):
+                first_day = date(year, month, 1)
+                ex_date = first_day + timedelta(days=(4 - first_day.weekday()) % 7 + 14)
+                if start <= ex_date.isoformat() <= end:
+                    dividends.append(DividendItem(
+                        ex_date=ex_date.isoformat(), payment_date=None, amount_per_share=amount
+                    ))
+        return dividends
+
+    def search_ticker(self, query: str) -> List[SearchResult]:
+        """Every symbol exists in the synthetic market."""
+        return [SearchResult(
+            ticker=query.upper(), name=f"{query.upper()} (synthetic)", market_type="Stock", exchange="SYN"
+        )]
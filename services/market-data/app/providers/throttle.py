@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+from app.schemas.models import DividendItem, SearchResult
+from app.providers.base import BaseDataProvider, Bars, PriceBar
+
+T = TypeVar("T")
+
+# Upstream calls allowed in flight at once
+UPSTREAM_MAX_CONCURRENT = int(os.environ.get("UPSTREAM_MAX_CONCURRENT", "4"))
+# Sustained upstream request rate (per second; 0 disables the limit) ...
+UPSTREAM_RATE = float(os.environ.get("UPSTREAM_RATE", "2"))
+# ... and how many requests may go out back to back after a quiet period
+UPSTREAM_BURST = int(os.environ.get("UPSTREAM_BURST", "5"))
+# Seconds all upstream calls pause after the upstream reports throttling
+UPSTREAM_THROTTLE_BACKOFF = float(os.environ.get("UPSTREAM_THROTTLE_BACKOFF", "30"))
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Whether `error` is the upstream asking us to slow down (yfinance's YFRateLimitError, HTTP 429)."""
+    return "RateLimit" in type(error).__name__ or "Too Many Requests" in str(error)
+
+
+class TokenBucket:
+    """
+    Blocking token-bucket rate limiter: `rate` tokens per second, holding
+    at most `burst`. `pause` empties the bucket and holds it shut for a
+    while, which is how upstream throttling is honoured.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.rate > 0:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self.rate <= 0:
+                    return
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def paused_for(self) -> float:
+        with self._lock:
+            return max(0.0, self._paused_until - time.monotonic())
+
+
+class ThrottledProvider(BaseDataProvider):
+    """
+    Keeps calls to an upstream provider within its limits: at most
+    `max_concurrent` in flight, started no faster than the token bucket
+    allows. When the upstream reports throttling, every call pauses for
+    `backoff_seconds` and the throttled call is retried once.
+
+    Methods block while waiting for a slot; call them from a worker thread
+    (see ProviderExecutor).
+    """
+
+    def __init__(
+        self,
+        provider: BaseDataProvider,
+        max_concurrent: int = 4,
+        bucket: Optional[TokenBucket] = None,
+        backoff_seconds: float = 30
+    ):
+        self.provider = provider
+        self.max_concurrent = max(1, max_concurrent)
+        self.bucket = bucket or TokenBucket(0, 1)
+        self.backoff_seconds = backoff_seconds
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.in_flight = 0
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.errors = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _call(self, fn: Callable[..., T], **kwargs: Any) -> T:
+        with self._lock:
+            self.waiting += 1
+        queued = time.perf_counter()
+        with self._slots:
+            for attempt in range(2):
+                self.bucket.acquire()
+                with self._lock:
+                    if attempt == 0:
+                        waited = time.perf_counter() - queued
+                        self.waiting -= 1
+                        self.calls += 1
+                        self.wait_total += waited
+                        self.wait_max = max(self.wait_max, waited)
+                    else:
+                        self.retries += 1
+                    self.in_flight += 1
+                try:
+                    return fn(**kwargs)
+                except Exception as e:
+                    if not is_rate_limited(e):
+                        with self._lock:
+                            self.errors += 1
+                        raise
+                    with self._lock:
+                        self.throttled += 1
+                    self.bucket.pause(self.backoff_seconds)
+                    if attempt == 1:
+                        raise
+                finally:
+                    with self._lock:
+                        self.in_flight -= 1
+
+    def get_prices(self, ticker_symbol: str, start: str, end: str, frequency: str) -> List[PriceBar]:
+        return self._call(self.provider.get_prices, ticker_symbol=ticker_symbol, start=start, end=end, frequency=frequency)
+
+    def get_dividends(self, ticker_symbol: str, start: str, end: str) -> List[DividendItem]:
+        return self._call(self.provider.get_dividends, ticker_symbol=ticker_symbol, start=start, end=end)
+
+    def get_dividend_history(self, ticker_symbol: str) -> List[DividendItem]:
+        return self._call(self.provider.get_dividend_history, ticker_symbol=ticker_symbol)
+
+    def search_ticker(self, query: str) -> List[SearchResult]:
+        return self._call(self.provider.search_ticker, query=query)
+
+    def get_bars(self, ticker_symbol: str, start: str, end: str, frequency: str) -> Bars:
+        return self._call(self.provider.get_bars, ticker_symbol=ticker_symbol, start=start, end=end, frequency=frequency)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "rate_per_second": self.bucket.rate,
+                "burst": self.bucket.burst,
+                "waiting": self.waiting,
+                "in_flight": self.in_flight,
+                "calls": self.calls,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "errors": self.errors,
+                "paused_seconds": round(self.bucket.paused_for(), 1),
+                "wait_ms": {
+                    "avg": round(self.wait_total / self.calls * 1000, 2) if self.calls else 0.0,
+                    "max": round(self.wait_max * 1000, 2)
+                }
+            }
+
+
+def throttled(provider: BaseDataProvider) -> ThrottledProvider:
+    """`provider` within the UPSTREAM_* limits."""
+    return ThrottledProvider(
+        provider,
+        max_concurrent=UPSTREAM_MAX_CONCURRENT,
+        bucket=TokenBucket(UPSTREAM_RATE, UPSTREAM_BURST),
+        backoff_seconds=UPSTREAM_THROTTLE_BACKOFF
+    )
@@ -1,15 +1,51 @@
 import yfinance as yf
+import numpy as np
 import pandas as pd
 from typing import List
-from app.schemas.models import PriceItem, DividendItem, SearchResult
-from app.providers.base import BaseDataProvider
+from app.schemas.models import DividendItem, SplitItem, SearchResult
+from app.providers.base import BaseDataProvider, Bars, PriceBar
+
+
+def iso_dates(index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    YYYY-MM-DD of every timestamp, on its own (exchange-local) calendar.
+    One vectorized conversion; per-timestamp strftime dominated the cost
+    of turning long histories into responses.
+    """
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return np.datetime_as_string(index.to_numpy().astype("datetime64[D]"), unit="D")
+
+
+def price_bars(df: pd.DataFrame, dates: np.ndarray) -> List[PriceBar]:
+    """Convert a yfinance history frame (dated by `dates`) into PriceBars, column by column."""
+    # numpy casts each column once; tolist() hands back native floats and ints for JSON
+    opens, highs, lows, closes = (
+        df[column].to_numpy(dtype=float).tolist() for column in ("Open", "High", "Low", "Close")
+    )
+    volumes = df['Volume'].to_numpy(dtype=np.int64).tolist()
+    # Adjusted close is critical for backtesting; history() closes are already adjusted
+    return list(map(PriceBar._make, zip(dates.tolist(), opens, highs, lows, closes, closes, volumes)))
+
+
+def dividend_items(divs: pd.Series) -> List[DividendItem]:
+    """Convert a ticker.dividends series into DividendItems."""
+    return [
+        DividendItem(
+            ex_date=day,
+            payment_date=None,  # Use null if payment_date is unavailable
+            amount_per_share=amount
+        )
+        for day, amount in zip(iso_dates(divs.index).tolist(), divs.to_numpy(dtype=float).tolist())
+    ]
+
 
 class YahooFinanceProvider(BaseDataProvider):
     """
     Handles data extraction from Yahoo Finance via the yfinance library.
     """
 
-    def get_prices(self, ticker_symbol: str, start: str, end: str, frequency: str) -> List[PriceItem]:
+    def get_prices(self, ticker_symbol: str, start: str, end: str, frequency: str) -> List[PriceBar]:
         """
         Fetch historical OHLCV data. 
         Note: yfinance 'history' returns adjusted prices by default.
@@ -28,28 +64,56 @@ class YahooFinanceProvider(BaseDataProvider):
 
         if df.empty:
             return []
+        return price_bars(df, iso_dates(df.index))
 
-        price_list = []
-        for index, row in df.iterrows():
-            # Convert timestamp index to ISO string (YYYY-MM-DD)
-            date_str = index.strftime('%Y-%m-%d')
-            
-            # Convert numpy types to native Python types for JSON serialization
-            price_list.append(PriceItem(
-                date=date_str,
-                open=float(row['Open']),
-                high=float(row['High']),
-                low=float(row['Low']),
-                close=float(row['Close']),
-                adjusted_close=float(row['Close']), # Adjusted close is critical for backtesting
-                volume=int(row['Volume'])
-            ))
-        return price_list
+    def get_bars(self, ticker_symbol: str, start: str, end: str, frequency: str) -> Bars:
+        """
+        Fetch prices, dividends and splits with a single history() call.
+        history() reports dividends and splits as columns next to the
+        bars, so the separate ticker.dividends download is skipped.
+        """
+        if frequency not in ("daily", "1d"):
+            # Weekly/monthly rows fold a period's dividends into its first day
+            return super().get_bars(ticker_symbol, start, end, frequency)
+
+        # One day past `end` so events on the end date are included, as
+        # /dividends does; bars stay end-exclusive
+        through = (pd.Timestamp(end) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+        df = yf.Ticker(ticker_symbol).history(start=start, end=through, interval="1d", actions=True)
+
+        if df.empty:
+            return Bars(prices=[], dividends=[], splits=[])
+
+        dates = iso_dates(df.index)
+        in_range = dates < end
+        prices = price_bars(df[in_range], dates[in_range])
+        dividends, splits = [], []
+        if 'Dividends' in df:
+            # Only the few rows with an event are converted
+            paid = df['Dividends'].to_numpy(dtype=float)
+            dividends = [
+                DividendItem(ex_date=day, payment_date=None, amount_per_share=amount)
+                for day, amount in zip(dates[paid != 0].tolist(), paid[paid != 0].tolist())
+            ]
+        if 'Stock Splits' in df:
+            ratios = df['Stock Splits'].to_numpy(dtype=float)
+            splits = [
+                SplitItem(date=day, ratio=ratio)
+                for day, ratio in zip(dates[ratios != 0].tolist(), ratios[ratios != 0].tolist())
+            ]
+        return Bars(prices=prices, dividends=dividends, splits=splits)
 
     def get_dividends(self, ticker_symbol: str, start: str, end: str) -> List[DividendItem]:
         """
         Fetch historical dividend data.
         """
+        # Filter by date range as yfinance returns the entire history
+        return [d for d in self.get_dividend_history(ticker_symbol) if start <= d.ex_date <= end]
+
+    def get_dividend_history(self, ticker_symbol: str) -> List[DividendItem]:
+        """
+        Fetch the ticker's whole dividend history.
+        """
         ticker = yf.Ticker(ticker_symbol)
         # Fetch dividends series
         divs = ticker.dividends
@@ -57,18 +121,7 @@ class YahooFinanceProvider(BaseDataProvider):
         if divs.empty:
             return []
 
-        # Filter by date range as yfinance returns the entire history
-        mask = (divs.index >= start) & (divs.index <= end)
-        filtered_divs = divs.loc[mask]
-
-        dividend_list = []
-        for date, amount in filtered_divs.items():
-            dividend_list.append(DividendItem(
-                ex_date=date.strftime('%Y-%m-%d'),
-                payment_date=None,  # Use null if payment_date is unavailable
-                amount_per_share=float(amount)
-            ))
-        return dividend_list
+        return dividend_items(divs)
     
     def search_ticker(self, query: str) -> List[SearchResult]:
         """
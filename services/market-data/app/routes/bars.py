@@ -0,0 +1,56 @@
+from fastapi import APIRouter, HTTPException, Request
+from app.schemas.models import BarsRequest, BarsResponse, ErrorResponse, ErrorDetail
+from app.providers.base import price_rows
+from app.providers.registry import get_provider
+from app.providers.singleflight import SingleFlight
+from app.providers.executor import provider_executor
+from app.encoding import FastJSONResponse
+from app.serialization import NegotiatedRoute, negotiated_response
+
+router = APIRouter(route_class=NegotiatedRoute)
+provider = get_provider()
+# Identical concurrent fetches share one upstream call
+bars_flight = SingleFlight("bars")
+
+@router.post("/bars", response_model=BarsResponse)
+async def get_bars(request: BarsRequest, http_request: Request):
+    """
+    Endpoint to retrieve OHLCV data together with dividends and splits,
+    from a single upstream fetch.
+    """
+    try:
+        bars = await bars_flight.do(
+            (request.ticker, request.start_date, request.end_date, request.frequency),
+            lambda: provider_executor.run(
+                provider.get_bars,
+                ticker_symbol=request.ticker,
+                start=request.start_date,
+                end=request.end_date,
+                frequency=request.frequency
+            )
+        )
+
+        # Same as /prices: no bars means the ticker is unknown
+        if not bars.prices:
+            return ErrorResponse(
+                success=False,
+                error=ErrorDetail(
+                    code="INVALID_TICKER",
+                    message=f"No price data found for ticker '{request.ticker}'",
+                    details={}
+                )
+            )
+
+        # The BarsResponse shape, built directly: no model per bar
+        return negotiated_response(http_request, {
+            "success": True,
+            "data": {
+                "ticker": request.ticker,
+                "frequency": request.frequency,
+                "prices": price_rows(bars.prices),
+                "dividends": [d.model_dump() for d in bars.dividends],
+                "splits": [s.model_dump() for s in bars.splits]
+            }
+        }, FastJSONResponse)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
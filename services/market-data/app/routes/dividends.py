@@ -1,9 +1,14 @@
 from fastapi import APIRouter, HTTPException
 from app.schemas.models import DividendRequest, DividendResponse, DividendData, ErrorResponse, ErrorDetail
-from app.providers.yahoo import YahooFinanceProvider
+from app.providers.registry import get_provider
+from app.providers.singleflight import SingleFlight
+from app.providers.executor import provider_executor
+from app.serialization import NegotiatedRoute
 
-router = APIRouter()
-provider = YahooFinanceProvider()
+router = APIRouter(route_class=NegotiatedRoute)
+provider = get_provider()
+# Identical concurrent fetches share one upstream call
+dividend_flight = SingleFlight("dividends")
 
 @router.post("/dividends", response_model=DividendResponse)
 async def get_dividends(request: DividendRequest):
@@ -11,10 +16,14 @@ async def get_dividends(request: DividendRequest):
     Endpoint to retrieve historical dividend distributions.
     """
     try:
-        data = provider.get_dividends(
-            ticker_symbol=request.ticker,
-            start=request.start_date,
-            end=request.end_date
+        data = await dividend_flight.do(
+            (request.ticker, request.start_date, request.end_date),
+            lambda: provider_executor.run(
+                provider.get_dividends,
+                ticker_symbol=request.ticker,
+                start=request.start_date,
+                end=request.end_date
+            )
         )
         
         # Even if data is empty, some tickers simply don't pay dividends
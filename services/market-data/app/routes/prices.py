@@ -1,24 +1,35 @@
-from fastapi import APIRouter, HTTPException
-from app.schemas.models import PriceRequest, PriceResponse, PriceData, ErrorResponse, ErrorDetail
-from app.providers.yahoo import YahooFinanceProvider
+from fastapi import APIRouter, HTTPException, Request
+from app.schemas.models import PriceRequest, PriceResponse, ErrorResponse, ErrorDetail
+from app.providers.base import price_rows
+from app.providers.registry import get_provider
+from app.providers.singleflight import SingleFlight
+from app.providers.executor import provider_executor
+from app.encoding import FastJSONResponse
+from app.serialization import NegotiatedRoute, negotiated_response
 
 # Create a router for price-related endpoints
-router = APIRouter()
-# Initialize the Yahoo provider
-provider = YahooFinanceProvider()
+router = APIRouter(route_class=NegotiatedRoute)
+# Initialize the configured provider (Yahoo unless MARKET_DATA_PROVIDER says otherwise)
+provider = get_provider()
+# Identical concurrent fetches share one upstream call
+price_flight = SingleFlight("prices")
 
 @router.post("/prices", response_model=PriceResponse)
-async def get_prices(request: PriceRequest):
+async def get_prices(request: PriceRequest, http_request: Request):
     """
     Endpoint to retrieve historical OHLCV data.
     """
     try:
-        # Fetch data using the provider logic
-        data = provider.get_prices(
-            ticker_symbol=request.ticker,
-            start=request.start_date,
-            end=request.end_date,
-            frequency=request.frequency
+        # Fetch data using the provider logic (on the provider pool, coalesced)
+        data = await price_flight.do(
+            (request.ticker, request.start_date, request.end_date, request.frequency),
+            lambda: provider_executor.run(
+                provider.get_prices,
+                ticker_symbol=request.ticker,
+                start=request.start_date,
+                end=request.end_date,
+                frequency=request.frequency
+            )
         )
         
         # If no data is returned, return the standardized error format
@@ -32,15 +43,15 @@ async def get_prices(request: PriceRequest):
                 )
             )
 
-        # Wrap data into the success response model
-        return PriceResponse(
-            success=True,
-            data=PriceData(
-                ticker=request.ticker,
-                frequency=request.frequency,
-                prices=data
-            )
-        )
+        # Build the PriceResponse shape directly: no model per bar
+        return negotiated_response(http_request, {
+            "success": True,
+            "data": {
+                "ticker": request.ticker,
+                "frequency": request.frequency,
+                "prices": price_rows(data)
+            }
+        }, FastJSONResponse)
     except Exception as e:
         # Standard HTTP 500 for unexpected backend errors
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,17 +1,19 @@
 from fastapi import APIRouter, Query
 from app.schemas.models import SearchResponse, SearchData, SearchResult
-from app.providers.yahoo import YahooFinanceProvider
+from app.providers.registry import get_provider
+from app.providers.executor import provider_executor
 from typing import List
 
 router = APIRouter()
-provider = YahooFinanceProvider()
+provider = get_provider()
 
 @router.get("/tickers/search", response_model=SearchResponse)
 async def search_tickers(q: str = Query(..., min_length=1)):
     """
     Endpoint to search for a ticker by its symbol.
     """
-    results = provider.search_ticker(q)
+    # yfinance blocks; keep it off the event loop
+    results = await provider_executor.run(provider.search_ticker, q)
     
     return SearchResponse(
         success=True,
@@ -56,6 +56,34 @@ class DividendResponse(BaseModel):
     success: bool
     data: DividendData
 
+# --- Combined Bars Models ---
+
+class BarsRequest(BaseModel):
+    """Payload for POST /bars request"""
+    ticker: str
+    market_type: str
+    start_date: str
+    end_date: str
+    frequency: str = "daily"
+
+class SplitItem(BaseModel):
+    """Structure for a single stock split event"""
+    date: str
+    ratio: float  # New shares per old share, e.g. 4.0 for a 4-for-1 split
+
+class BarsData(BaseModel):
+    """Prices, dividends and splits of a ticker over one range"""
+    ticker: str
+    frequency: str
+    prices: List[PriceItem]
+    dividends: List[DividendItem]
+    splits: List[SplitItem]
+
+class BarsResponse(BaseModel):
+    """Successful response for combined bars"""
+    success: bool
+    data: BarsData
+
 # --- Search Models ---
 
 class SearchResult(BaseModel):
@@ -0,0 +1,98 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from .returns import calculate_returns
+from .risk import calculate_risk_metrics
+from .comparison import calculate_comparison_metrics
+from ..cancellation import checkpoint
+
+
+def calculate_portfolio_metrics(dates: List[str], values: List[float],
+                                risk_free_rate_annual: float = 0.0,
+                                start_date: Optional[str] = None,
+                                end_date: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Returns the full metrics object (matches MetricsOutput fields) for one
+    portfolio value series.
+    """
+    # returns (total + annualized)
+    ret = calculate_returns(dates, values,
+                            start_date=start_date,
+                            end_date=end_date)
+    checkpoint()
+
+    # risk metrics (volatility, drawdown, sharpe, sortino, calmar)
+    risk = calculate_risk_metrics(dates, values,
+                                  risk_free_rate_annual=risk_free_rate_annual,
+                                  start_date=start_date,
+                                  end_date=end_date)
+
+    # merge into one metrics object (matches MetricsOutput fields)
+    return {
+        "total_return_pct": float(ret.get("total_return_pct", 0.0)),
+        "annualized_return_pct": float(ret.get("annualized_return_pct", 0.0)),
+        "max_drawdown_pct": float(risk.get("max_drawdown_pct", 0.0)),
+        "max_drawdown_duration_days": int(risk.get("max_drawdown_duration_days", 0)),
+        "volatility_annualized_pct": float(risk.get("volatility_annualized_pct", 0.0)),
+        "sharpe_ratio": float(risk.get("sharpe_ratio", 0.0)),
+        "sortino_ratio": float(risk.get("sortino_ratio", 0.0)),
+        "calmar_ratio": float(risk.get("calmar_ratio", 0.0)),
+    }
+
+
+def calculate_metrics_summary(series: Dict[str, Tuple[List[str], List[float]]],
+                              risk_free_rate_annual: float = 0.0,
+                              start_date: Optional[str] = None,
+                              end_date: Optional[str] = None,
+                              precomputed: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Calculate metrics for each named (dates, values) series and produce an
+    optional comparison when two portfolios are provided (prefers a
+    portfolio named 'active' vs 'baseline' if present).
+
+    `precomputed` maps further portfolio names to metrics the caller already
+    has; they are returned unchanged and take part in the comparison.
+    """
+    results: Dict[str, Any] = {}
+
+    # compute metrics per portfolio
+    for name, (dates, values) in series.items():
+        checkpoint()  # give up between portfolios if the caller has gone away
+        results[name] = calculate_portfolio_metrics(dates, values,
+                                                    risk_free_rate_annual=risk_free_rate_annual,
+                                                    start_date=start_date,
+                                                    end_date=end_date)
+    for name, metrics in (precomputed or {}).items():
+        results.setdefault(name, metrics)
+
+    # produce comparison metrics if possible
+    comparison = None
+    # prefer explicit 'active' and 'baseline' keys when available
+    if "active" in results and "baseline" in results:
+        comparison = calculate_comparison_metrics(results["active"], results["baseline"])
+    else:
+        # if exactly two portfolios provided, compare the first two (deterministic order)
+        keys = list(results.keys())
+        if len(keys) >= 2:
+            comparison = calculate_comparison_metrics(results[keys[0]], results[keys[1]])
+
+    if comparison is not None:
+        results["comparison"] = comparison
+
+    return results
+
+
+def calculate_window_metrics(series: Dict[str, Tuple[List[str], List[float]]],
+                             windows: List[Tuple[int, int]],
+                             risk_free_rate_annual: float = 0.0) -> List[Dict[str, Any]]:
+    """
+    Metrics of each [start, end) index window of the named (dates, values)
+    series: what calculate_metrics_summary reports for each slice, so one
+    call measures every window of a walk-forward run.
+    """
+    return [
+        calculate_metrics_summary(
+            {name: (dates[start:end], values[start:end]) for name, (dates, values) in series.items()},
+            risk_free_rate_annual=risk_free_rate_annual
+        )
+        for start, end in windows
+    ]
@@ -0,0 +1,69 @@
+"""
+X-Request-Timeout-Ms deadline enforcement.
+
+Vendored: this file is identical in market-data, strategy, portfolio and
+metrics (each service is built on its own). Keep the copies byte-identical;
+scripts/check_vendored.py fails otherwise.
+"""
+import asyncio
+
+from fastapi.responses import JSONResponse
+
+
+DEADLINE_HEADER = b"x-request-timeout-ms"
+
+
+def _budget_seconds(scope) -> float:
+    """Caller's remaining budget from X-Request-Timeout-Ms, or None."""
+    for name, value in scope["headers"]:
+        if name == DEADLINE_HEADER:
+            try:
+                return float(value) / 1000
+            except ValueError:
+                return None
+    return None
+
+
+class DeadlineMiddleware:
+    """
+    Enforce the caller's X-Request-Timeout-Ms budget: a request still
+    being handled when it runs out is cancelled and answered with 504
+    DEADLINE_EXCEEDED, since nobody is waiting for the result any more.
+    Requests without the header are not limited. Work already handed to a
+    worker thread is not interrupted by this; see each service's
+    cancellation checkpoints.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        budget = _budget_seconds(scope) if scope["type"] == "http" else None
+        if budget is None:
+            await self.app(scope, receive, send)
+            return
+
+        started = False
+
+        async def send_tracking(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            if budget <= 0:
+                raise asyncio.TimeoutError
+            await asyncio.wait_for(self.app(scope, receive, send_tracking), budget)
+        except asyncio.TimeoutError:
+            if started:
+                raise
+            response = JSONResponse(status_code=504, content={
+                "success": False,
+                "error": {
+                    "code": "DEADLINE_EXCEEDED",
+                    "message": "Request deadline exceeded",
+                    "details": {"timeout_ms": int(budget * 1000)}
+                }
+            })
+            await response(scope, receive, send)
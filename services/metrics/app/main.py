@@ -1,6 +1,10 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from .routes.calculate import router as calculate_router
+from .deadline import DeadlineMiddleware
+from .cancellation import CancellationMiddleware, cancellation_stats
 
 app = FastAPI(
     title="Metrics Service",
@@ -16,6 +20,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Time spent in this service, reported to callers as a Server-Timing header."""
+    start = time.perf_counter()
+    response = await call_next(request)
+    response.headers["Server-Timing"] = f"app;dur={(time.perf_counter() - start) * 1000:.1f}"
+    return response
+
+
+app.add_middleware(CancellationMiddleware)
+app.add_middleware(DeadlineMiddleware)
+
 # mount the calculate router
 app.include_router(calculate_router, prefix="", tags=["calculate"])
 
@@ -23,3 +40,9 @@ app.include_router(calculate_router, prefix="", tags=["calculate"])
 async def health_check():
     """Health check endpoint for Docker."""
     return {"status": "healthy", "service": "metrics"}
+
+
+@app.get("/stats")
+async def stats():
+    """Calculations abandoned because the caller disconnected or timed out."""
+    return {"cancellation": cancellation_stats()}
@@ -1,11 +1,12 @@
-from typing import Dict, Any
 from fastapi import APIRouter, HTTPException
-from ..schemas.models import CalculateRequest, CalculateResponse
-from ..calculators.returns import calculate_returns
-from ..calculators.risk import calculate_risk_metrics
-from ..calculators.comparison import calculate_comparison_metrics
+from ..schemas.models import (
+    CalculateRequest, CalculateResponse, CalculateWindowsRequest, CalculateWindowsResponse
+)
+from ..calculators.summary import calculate_metrics_summary, calculate_window_metrics
+from ..serialization import NegotiatedRoute
+from ..cancellation import run_cancellable
 
-router = APIRouter()
+router = APIRouter(route_class=NegotiatedRoute)
 
 
 @router.post("/calculate", response_model=CalculateResponse)
@@ -21,54 +22,52 @@ async def calculate_endpoint(payload: CalculateRequest):
             "error": {"code": "INVALID_REQUEST", "message": "portfolios must be provided", "details": {}}
         })
 
-    results: Dict[str, Any] = {}
+    results = await run_cancellable(
+        calculate_metrics_summary,
+        {
+            name: (p.time_series.dates, p.time_series.portfolio_value)
+            for name, p in payload.portfolios.items()
+        },
+        risk_free_rate_annual=payload.risk_free_rate_annual,
+        start_date=payload.start_date,
+        end_date=payload.end_date,
+        precomputed={name: m.model_dump() for name, m in payload.precomputed.items()}
+    )
 
-    # compute metrics per portfolio
-    for name, p in payload.portfolios.items():
-        dates = p.time_series.dates
-        values = p.time_series.portfolio_value
+    return {"success": True, "data": results}
 
-        # returns (total + annualized)
-        ret = calculate_returns(dates, values,
-                                start_date=payload.start_date,
-                                end_date=payload.end_date)
 
-        # risk metrics (volatility, drawdown, sharpe, sortino, calmar)
-        risk = calculate_risk_metrics(dates, values,
-                                      risk_free_rate_annual=payload.risk_free_rate_annual,
-                                      start_date=payload.start_date,
-                                      end_date=payload.end_date)
-
-        # merge into one metrics object (matches MetricsOutput fields)
-        metrics = {
-            "total_return_pct": float(ret.get("total_return_pct", 0.0)),
-            "annualized_return_pct": float(ret.get("annualized_return_pct", 0.0)),
-            "max_drawdown_pct": float(risk.get("max_drawdown_pct", 0.0)),
-            "max_drawdown_duration_days": int(risk.get("max_drawdown_duration_days", 0)),
-            "volatility_annualized_pct": float(risk.get("volatility_annualized_pct", 0.0)),
-            "sharpe_ratio": float(risk.get("sharpe_ratio", 0.0)),
-            "sortino_ratio": float(risk.get("sortino_ratio", 0.0)),
-            "calmar_ratio": float(risk.get("calmar_ratio", 0.0)),
-        }
-
-        results[name] = metrics
-
-    # produce comparison metrics if possible
-    comparison = None
-    # prefer explicit 'active' and 'baseline' keys when available
-    if "active" in payload.portfolios and "baseline" in payload.portfolios:
-        active_metrics = results["active"]
-        baseline_metrics = results["baseline"]
-        comparison = calculate_comparison_metrics(active_metrics, baseline_metrics)
-    else:
-        # if exactly two portfolios provided, compare the first two (deterministic order)
-        keys = list(payload.portfolios.keys())
-        if len(keys) >= 2:
-            active_metrics = results[keys[0]]
-            baseline_metrics = results[keys[1]]
-            comparison = calculate_comparison_metrics(active_metrics, baseline_metrics)
+@router.post("/calculate/windows", response_model=CalculateWindowsResponse)
+async def calculate_windows_endpoint(payload: CalculateWindowsRequest):
+    """
+    Calculate metrics (and the comparison) for each [start, end) index
+    window of the portfolios' full-range series.
+    """
+    if not payload.portfolios:
+        raise HTTPException(status_code=400, detail={
+            "success": False,
+            "error": {"code": "INVALID_REQUEST", "message": "portfolios must be provided", "details": {}}
+        })
+    length = min(len(p.time_series.portfolio_value) for p in payload.portfolios.values())
+    invalid = [[start, end] for start, end in payload.windows if not 0 <= start < end <= length]
+    if invalid:
+        raise HTTPException(status_code=400, detail={
+            "success": False,
+            "error": {
+                "code": "INVALID_REQUEST",
+                "message": f"windows must be [start, end) indexes within the {length} points of every series",
+                "details": {"invalid_windows": invalid[:10]}
+            }
+        })
 
-    if comparison is not None:
-        results["comparison"] = comparison
+    results = await run_cancellable(
+        calculate_window_metrics,
+        {
+            name: (p.time_series.dates, p.time_series.portfolio_value)
+            for name, p in payload.portfolios.items()
+        },
+        payload.windows,
+        risk_free_rate_annual=payload.risk_free_rate_annual
+    )
 
-    return {"success": True, "data": results}
\ No newline at end of file
+    return {"success": True, "data": results}
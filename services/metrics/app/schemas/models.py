@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 from pydantic import BaseModel
 
 
@@ -18,28 +18,43 @@ class PortfolioInput(BaseModel):
     final_state: FinalState
 
 
+# --- Metrics output models -------------------------------------------------
+class MetricsOutput(BaseModel):
+    total_return_pct: float
+    annualized_return_pct: float
+    max_drawdown_pct: float
+    max_drawdown_duration_days: int
+    volatility_annualized_pct: float
+    sharpe_ratio: float
+    sortino_ratio: float
+    calmar_ratio: float
+
+
 class CalculateRequest(BaseModel):
     """
     Request body for POST /calculate
     - portfolios: dict keyed by portfolio name (e.g., "active", "baseline")
+    - precomputed: metrics the caller already has (e.g., a memoized baseline),
+      returned as-is and used for the comparison instead of being recalculated
     - start_date / end_date are optional ISO date strings used for annualization
     """
     risk_free_rate_annual: float = 0.0
     portfolios: Dict[str, PortfolioInput]
+    precomputed: Dict[str, MetricsOutput] = {}
     start_date: Optional[str] = None
     end_date: Optional[str] = None
 
 
-# --- Metrics output models -------------------------------------------------
-class MetricsOutput(BaseModel):
-    total_return_pct: float
-    annualized_return_pct: float
-    max_drawdown_pct: float
-    max_drawdown_duration_days: int
-    volatility_annualized_pct: float
-    sharpe_ratio: float
-    sortino_ratio: float
-    calmar_ratio: float
+class CalculateWindowsRequest(BaseModel):
+    """
+    Request body for POST /calculate/windows
+    - portfolios: full-range series, as for /calculate
+    - windows: [start, end) indexes into the series; each window is measured
+      like a /calculate call over that slice of every portfolio
+    """
+    risk_free_rate_annual: float = 0.0
+    portfolios: Dict[str, PortfolioInput]
+    windows: List[Tuple[int, int]]
 
 
 class ComparisonMetrics(BaseModel):
@@ -57,4 +72,10 @@ class CalculateResponse(BaseModel):
     special 'comparison' key whose value is ComparisonMetrics.
     """
     success: bool
-    data: Dict[str, Union[MetricsOutput, ComparisonMetrics]]
\ No newline at end of file
+    data: Dict[str, Union[MetricsOutput, ComparisonMetrics]]
+
+
+class CalculateWindowsResponse(BaseModel):
+    """One `data` entry per requested window, shaped like CalculateResponse.data."""
+    success: bool
+    data: List[Dict[str, Union[MetricsOutput, ComparisonMetrics]]]
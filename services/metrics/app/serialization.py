@@ -0,0 +1,90 @@
+"""
+MessagePack content negotiation for this service's routes (codec in
+codec.py). Identical in every service that serves MessagePack; see
+scripts/check_vendored.py.
+"""
+import copy
+from typing import Any, Callable, Type
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+from .codec import MSGPACK_MEDIA_TYPE, SUPPORTED_FORMATS_HEADER, decode, encode, is_msgpack, msgpack
+
+
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return encode(content)
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    Route that also speaks MessagePack, chosen per request.
+
+    A `Content-Type: application/msgpack` body is decoded and validated
+    like JSON; `Accept: application/msgpack` selects a MessagePack
+    response. JSON stays the default and keeps FastAPI's fast path.
+    Every response advertises the supported formats so clients can
+    upgrade after their first call.
+    """
+
+    def get_route_handler(self) -> Callable:
+        json_handler = super().get_route_handler()
+        if msgpack is None:
+            return json_handler
+
+        # Built from a copy: for an included router, newer FastAPI reads the
+        # response class from the inclusion, not from this route
+        msgpack_route = copy.copy(self)
+        msgpack_route.response_class = MsgPackResponse
+        msgpack_handler = APIRoute.get_route_handler(msgpack_route)
+
+        async def handler(request: Request) -> Response:
+            if is_msgpack(request.headers.get("content-type")):
+                await _decode_body(request)
+            if is_msgpack(request.headers.get("accept")):
+                response = await msgpack_handler(request)
+            else:
+                response = await json_handler(request)
+            response.headers[SUPPORTED_FORMATS_HEADER] = f"application/json, {MSGPACK_MEDIA_TYPE}"
+            return response
+
+        return handler
+
+
+def negotiated_response(
+    request: Request, content: Any, json_response_class: Type[Response] = JSONResponse
+) -> Response:
+    """
+    Render JSON-compatible `content` in the format the request accepts.
+    Returning it skips response_model validation, for large payloads a
+    route has already built in the documented shape.
+    """
+    if msgpack is not None and is_msgpack(request.headers.get("accept")):
+        return MsgPackResponse(content)
+    return json_response_class(content)
+
+
+async def _decode_body(request: Request) -> None:
+    """Decode a MessagePack body in place so FastAPI sees it as parsed JSON."""
+    body = await request.body()
+    try:
+        payload = decode(body)
+    except Exception:
+        raise RequestValidationError([{
+            "type": "msgpack_invalid",
+            "loc": ("body",),
+            "msg": "MessagePack decode error",
+            "input": {}
+        }])
+
+    request.scope["headers"] = [
+        (name, value) for name, value in request.scope["headers"] if name != b"content-type"
+    ] + [(b"content-type", b"application/json")]
+    if hasattr(request, "_headers"):
+        del request._headers
+    request._json = payload
@@ -0,0 +1,51 @@
+import hashlib
+import json
+from datetime import date
+from typing import Any, Tuple
+
+
+def normalize_value(value: Any) -> Any:
+    """
+    Normalize a JSON-like value so equivalent requests serialize the same:
+    floats are rounded to 12 significant digits (and -0.0 becomes 0.0),
+    nested dicts/lists are normalized recursively.
+    """
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        normalized = float(f"{float(value):.12g}")
+        return 0.0 if normalized == 0 else normalized
+    if isinstance(value, dict):
+        return {str(k): normalize_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_value(v) for v in value]
+    return str(value)
+
+
+def resolve_date_range(start_date: str, end_date: str) -> Tuple[str, str, bool]:
+    """
+    Resolve a request date range to canonical ISO dates.
+
+    End dates in the future are clamped to today, since they return the same
+    data. The flag is True when the range reaches today, i.e. its trailing
+    bars can still change as new market data arrives.
+    """
+    today = date.today()
+    try:
+        start = date.fromisoformat(start_date).isoformat()
+    except ValueError:
+        start = start_date
+    try:
+        end = date.fromisoformat(end_date)
+    except ValueError:
+        return start, end_date, False
+
+    if end >= today:
+        return start, today.isoformat(), True
+    return start, end.isoformat(), False
+
+
+def canonical_hash(payload: Any) -> str:
+    """SHA-256 of the normalized payload serialized with sorted keys."""
+    text = json.dumps(normalize_value(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
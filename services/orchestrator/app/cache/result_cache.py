@@ -0,0 +1,160 @@
+import asyncio
+import os
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from ..schemas.requests import BacktestRequest
+from .keys import canonical_hash, resolve_date_range
+from .memory import TTLCache
+from .sqlite_store import SQLiteStore
+
+
+BACKTEST_CACHE_ENABLED = os.environ.get("BACKTEST_CACHE_ENABLED", "true").lower() == "true"
+BACKTEST_CACHE_MAX_ENTRIES = int(os.environ.get("BACKTEST_CACHE_MAX_ENTRIES", "256"))
+BACKTEST_CACHE_TTL = float(os.environ.get("BACKTEST_CACHE_TTL", "3600"))
+BACKTEST_CACHE_FRESH_TTL = float(os.environ.get("BACKTEST_CACHE_FRESH_TTL", "300"))
+BACKTEST_CACHE_SQLITE_PATH = os.environ.get("BACKTEST_CACHE_SQLITE_PATH")
+BACKTEST_CACHE_SQLITE_MAX_ENTRIES = int(os.environ.get("BACKTEST_CACHE_SQLITE_MAX_ENTRIES", "5000"))
+
+# Request-level cache policies: skip the lookup (no-cache) or skip lookup and store (no-store)
+CACHE_POLICIES = ("no-cache", "no-store")
+
+
+def market_data_series(use_test_data: bool, ticker: str, market_type: str, frequency: str) -> Hashable:
+    """Identity of a market data series, whatever range of it is requested."""
+    return (use_test_data, ticker, market_type, frequency)
+
+
+def backtest_cache_key(request: BacktestRequest) -> Tuple[str, Optional[Hashable]]:
+    """
+    Canonical cache key for a backtest request, plus the market data series
+    it depends on when its date range reaches today (None otherwise, since
+    a closed range cannot change).
+    """
+    payload = request.model_dump(exclude={"cache_control", "output"})
+    market_params = request.market_params
+    start, end, open_ended = resolve_date_range(market_params.start_date, market_params.end_date)
+    payload["market_params"]["start_date"] = start
+    payload["market_params"]["end_date"] = end
+    series = market_data_series(
+        request.use_test_data, market_params.ticker, market_params.market_type, market_params.frequency
+    ) if open_ended else None
+    return canonical_hash(payload), series
+
+
+def last_bar_date(data: Dict[str, Any]) -> str:
+    """Date of the last price bar a backtest payload was computed from."""
+    prices = data["market_data"]["prices"]
+    return prices[-1]["date"] if prices else ""
+
+
+class DataVersions:
+    """
+    Latest bar date loaded per market data series. A cached result whose
+    range reaches today is current only while no later bar has been loaded.
+    """
+
+    def __init__(self):
+        self._latest: Dict[Hashable, str] = {}
+
+    def observe(self, series: Hashable, last_date: str) -> None:
+        if last_date > self._latest.get(series, ""):
+            self._latest[series] = last_date
+
+    def latest(self, series: Hashable) -> str:
+        return self._latest.get(series, "")
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+
+# Updated by every market data load (see engine.pipeline.load_market_data)
+market_data_versions = DataVersions()
+
+
+class ResultCache:
+    """
+    Two-tier cache of JSON-compatible results: an in-process LRU in front of
+    an optional SQLite file shared across worker processes.
+
+    Entries whose range reaches today are versioned by their last bar date:
+    once a later bar of the same series has been loaded (by any backtest)
+    they are treated as misses. The shorter fresh TTL remains as a fallback
+    for bars this process has not seen yet.
+    """
+
+    def __init__(
+        self,
+        memory: TTLCache,
+        disk: Optional[SQLiteStore] = None,
+        ttl_seconds: float = 3600,
+        fresh_ttl_seconds: float = 300,
+        enabled: bool = True,
+        versions: Optional[DataVersions] = None
+    ):
+        self.memory = memory
+        self.disk = disk
+        self.ttl_seconds = ttl_seconds
+        self.fresh_ttl_seconds = fresh_ttl_seconds
+        self.enabled = enabled
+        self.versions = versions if versions is not None else DataVersions()
+        self.bypasses = 0
+        self.stale = 0
+
+    def _ttl(self, series: Optional[Hashable]) -> float:
+        return self.fresh_ttl_seconds if series is not None else self.ttl_seconds
+
+    async def get(self, key: str, series: Optional[Hashable] = None) -> Optional[Dict[str, Any]]:
+        """Cached result, or None; `series` is the market data an open-ended result depends on."""
+        if not self.enabled:
+            return None
+
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get, key)
+            if entry is not None:
+                value, remaining = entry
+                # Promote to the memory tier, expiring no later than the disk entry
+                self.memory.set(key, value, min(remaining, self._ttl(series)))
+
+        if value is not None and series is not None:
+            if last_bar_date(value) < self.versions.latest(series):
+                self.memory.pop(key)
+                self.stale += 1
+                return None
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any], series: Optional[Hashable] = None) -> None:
+        if not self.enabled:
+            return
+
+        if series is not None:
+            self.versions.observe(series, last_bar_date(value))
+        ttl = self._ttl(series)
+        self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value, ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "fresh_ttl_seconds": self.fresh_ttl_seconds,
+            "bypasses": self.bypasses,
+            "stale": self.stale,
+            "versioned_series": len(self.versions),
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None
+        }
+
+
+backtest_cache = ResultCache(
+    memory=TTLCache(BACKTEST_CACHE_MAX_ENTRIES, BACKTEST_CACHE_TTL),
+    disk=(
+        SQLiteStore(BACKTEST_CACHE_SQLITE_PATH, BACKTEST_CACHE_SQLITE_MAX_ENTRIES)
+        if BACKTEST_CACHE_SQLITE_PATH else None
+    ),
+    ttl_seconds=BACKTEST_CACHE_TTL,
+    fresh_ttl_seconds=BACKTEST_CACHE_FRESH_TTL,
+    enabled=BACKTEST_CACHE_ENABLED,
+    versions=market_data_versions
+)
@@ -0,0 +1,106 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class SQLiteStore:
+    """
+    On-disk key/value store with expiry, shared by every worker process
+    that points at the same file.
+
+    Methods are blocking; call them from a worker thread. Each call opens
+    its own connection so the store can be used from any thread.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        if not self._initialized:
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    " key TEXT PRIMARY KEY,"
+                    " value TEXT NOT NULL,"
+                    " created_at REAL NOT NULL,"
+                    " expires_at REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS entries_created ON entries (created_at)")
+                conn.commit()
+                self._initialized = True
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return the decoded value and its remaining seconds to expiry, or None if missing or expired."""
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] <= now:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    conn.commit()
+                    self.expirations += 1
+                    row = None
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            self.errors += 1
+            return None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0]), row[1] - now
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        """Store a JSON-serializable value, trimming the oldest entries past max_entries."""
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, separators=(",", ":")), now, now + ttl_seconds)
+                )
+                expired = conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,)).rowcount
+                overflow = conn.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    " SELECT key FROM entries ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                ).rowcount
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            self.errors += 1
+            return
+
+        self.expirations += max(expired, 0)
+        self.evictions += max(overflow, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "errors": self.errors
+        }
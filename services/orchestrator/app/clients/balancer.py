@@ -0,0 +1,182 @@
+import asyncio
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from ..telemetry.prometheus import replica_ejections
+from .resilience import LatencyWindow
+
+
+# p2c: the less loaded of two random replicas; least_outstanding: the least loaded of all
+LB_POLICY = os.environ.get("LB_POLICY", "p2c").lower()
+# Consecutive failures (connect errors, timeouts, 5xx) that eject a replica
+REPLICA_EJECT_FAILURES = int(os.environ.get("REPLICA_EJECT_FAILURES", "3"))
+# First ejection lasts this long; repeated ejections double it up to the max
+REPLICA_EJECT_SECONDS = float(os.environ.get("REPLICA_EJECT_SECONDS", "10"))
+REPLICA_EJECT_MAX_SECONDS = float(os.environ.get("REPLICA_EJECT_MAX_SECONDS", "120"))
+# How often ejected replicas are health-checked so they can return early
+REPLICA_PROBE_INTERVAL = float(os.environ.get("REPLICA_PROBE_INTERVAL", "5"))
+
+# Weight of the newest sample in a replica's latency moving average
+_EWMA_ALPHA = 0.2
+
+
+def parse_replica_urls(value: str) -> List[str]:
+    """Base URLs from a comma-separated *_URL setting."""
+    urls = [url.strip().rstrip("/") for url in value.split(",") if url.strip()]
+    if not urls:
+        raise ValueError("At least one service URL is required")
+    return urls
+
+
+class Replica:
+    """One endpoint of a replicated downstream service."""
+
+    def __init__(self, service: str, url: str):
+        self.service = service
+        self.url = url
+        self.in_flight = 0
+        self.requests_total = 0
+        self.errors_total = 0
+        self.ejections_total = 0
+        self.latency = LatencyWindow()
+        self.latency_ewma = 0.0
+        # Set once this replica advertises MessagePack (see BaseClient._decode_response)
+        self.binary = False
+        self._failures = 0
+        self._ejected_until = 0.0
+        # Ejections in a row without a success in between; drives the backoff
+        self._streak = 0
+
+    def available(self, now: float) -> bool:
+        return now >= self._ejected_until
+
+    def begin(self) -> None:
+        self.in_flight += 1
+        self.requests_total += 1
+
+    def end(self, healthy: Optional[bool], seconds: float) -> None:
+        """Finish a call; `healthy` is None when the outcome says nothing about the replica."""
+        self.in_flight -= 1
+        if healthy is True:
+            self._failures = 0
+            self._streak = 0
+            self.latency.add(seconds)
+            self.latency_ewma = seconds if not self.latency_ewma else (
+                _EWMA_ALPHA * seconds + (1 - _EWMA_ALPHA) * self.latency_ewma
+            )
+        elif healthy is False:
+            self.errors_total += 1
+            self._failures += 1
+            # A replica back from ejection gets a single chance; calls already
+            # in flight when it was ejected do not extend the ejection
+            if (self._failures >= REPLICA_EJECT_FAILURES or self._streak) and self.available(time.monotonic()):
+                self.eject()
+
+    def eject(self) -> None:
+        duration = min(REPLICA_EJECT_SECONDS * 2 ** self._streak, REPLICA_EJECT_MAX_SECONDS)
+        self._ejected_until = time.monotonic() + duration
+        self._failures = 0
+        self._streak += 1
+        self.ejections_total += 1
+        replica_ejections.inc(service=self.service, replica=self.url)
+
+    def reinstate(self) -> None:
+        """Return an ejected replica to rotation (it stays on probation until a success)."""
+        self._ejected_until = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        remaining = self._ejected_until - time.monotonic()
+        p50, p95 = self.latency.percentile(50), self.latency.percentile(95)
+        return {
+            "url": self.url,
+            "state": "ejected" if remaining > 0 else "active",
+            "ejected_for_seconds": round(remaining, 1) if remaining > 0 else 0.0,
+            "format": "msgpack" if self.binary else "json",
+            "in_flight": self.in_flight,
+            "requests_total": self.requests_total,
+            "errors_total": self.errors_total,
+            "ejections_total": self.ejections_total,
+            "latency_ms": {
+                "ewma": round(self.latency_ewma * 1000, 1),
+                "p50": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95": round(p95 * 1000, 1) if p95 is not None else None
+            }
+        }
+
+
+class ReplicaSet:
+    """
+    Client-side load balancer over a service's replicas.
+
+    Requests go to the replica with the fewest outstanding requests, either
+    among two picked at random (p2c, the default) or among all of them
+    (least_outstanding); ties go to the lower latency average. A replica
+    that fails REPLICA_EJECT_FAILURES calls in a row is ejected for a
+    backoff period and health-checked every REPLICA_PROBE_INTERVAL seconds
+    meanwhile. If every replica is ejected, the one due back first is used
+    rather than failing outright (the circuit breaker covers total outages).
+    """
+
+    def __init__(self, service: str, urls: List[str], policy: str = LB_POLICY):
+        self.service = service
+        self.replicas = [Replica(service, url) for url in urls]
+        self.policy = policy
+        self._probe_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    def pick(self, exclude: Optional[Replica] = None) -> Replica:
+        """Choose a replica, avoiding `exclude` (e.g. the primary of a hedge) when possible."""
+        if len(self.replicas) == 1:
+            return self.replicas[0]
+
+        now = time.monotonic()
+        others = [r for r in self.replicas if r is not exclude] or self.replicas
+        candidates = [r for r in others if r.available(now)]
+        if not candidates:
+            return min(others, key=lambda r: r._ejected_until)
+        if len(candidates) > 2 and self.policy == "p2c":
+            candidates = random.sample(candidates, 2)
+        else:
+            random.shuffle(candidates)
+        return min(candidates, key=lambda r: (r.in_flight, r.latency_ewma))
+
+    def start_probing(self, client: httpx.AsyncClient) -> None:
+        if len(self.replicas) > 1 and self._probe_task is None:
+            self._probe_task = asyncio.ensure_future(self._probe_loop(client))
+
+    async def stop_probing(self) -> None:
+        if self._probe_task is not None:
+            task, self._probe_task = self._probe_task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _probe_loop(self, client: httpx.AsyncClient) -> None:
+        while True:
+            await asyncio.sleep(REPLICA_PROBE_INTERVAL)
+            now = time.monotonic()
+            ejected = [r for r in self.replicas if not r.available(now)]
+            if ejected:
+                await asyncio.gather(*(self._probe(client, r) for r in ejected))
+
+    async def _probe(self, client: httpx.AsyncClient, replica: Replica) -> None:
+        try:
+            response = await client.get(f"{replica.url}/health", timeout=2.0)
+        except httpx.HTTPError:
+            return
+        if response.status_code == 200:
+            replica.reinstate()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy if len(self.replicas) > 1 else None,
+            "endpoints": [replica.stats() for replica in self.replicas]
+        }
@@ -1,6 +1,44 @@
+import asyncio
+import os
+import time
 import httpx
+from json import dumps as json_dumps
 from typing import Any, Dict, Optional
 
+from ..telemetry.prometheus import (
+    downstream_cancelled, downstream_cancelled_seconds, downstream_hedges, downstream_rejected
+)
+from ..telemetry.timings import parse_server_timing, record_call
+from .balancer import Replica, ReplicaSet, parse_replica_urls
+from .resilience import DEADLINE_HEADER, CircuitBreaker, LatencyWindow, remaining_budget
+from .codec import (
+    MSGPACK_MEDIA_TYPE, SUPPORTED_FORMATS_HEADER, decode, encode, is_msgpack, msgpack_available
+)
+
+
+# Connection pool settings shared by every downstream client
+HTTP_POOL_MAX_CONNECTIONS = int(os.environ.get("HTTP_POOL_MAX_CONNECTIONS", "100"))
+HTTP_POOL_MAX_KEEPALIVE = int(os.environ.get("HTTP_POOL_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.environ.get("HTTP2_ENABLED", "false").lower() == "true"
+# Switch to MessagePack with services that advertise it (needs the msgpack package)
+BINARY_TRANSPORT_ENABLED = os.environ.get("BINARY_TRANSPORT_ENABLED", "true").lower() == "true"
+# Duplicate slow idempotent calls once they pass this percentile of recent latency
+HEDGE_ENABLED = os.environ.get("HEDGE_ENABLED", "false").lower() == "true"
+HEDGE_PERCENTILE = float(os.environ.get("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.environ.get("HEDGE_MIN_SAMPLES", "50"))
+# Cap on hedges as a percentage of a client's requests, to bound extra load
+HEDGE_MAX_PERCENT = float(os.environ.get("HEDGE_MAX_PERCENT", "10"))
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (pip install httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
 
 class ServiceError(Exception):
     """Base exception for service errors."""
@@ -22,61 +60,333 @@ class ServiceRequestError(ServiceError):
 
 
 class BaseClient:
-    """Base async HTTP client for downstream service communication."""
+    """
+    Base async HTTP client for downstream service communication.
+
+    Each client owns one long-lived httpx.AsyncClient so connections to the
+    service are pooled and kept alive across backtests. The pool is opened
+    and closed through the app lifespan (see app.clients.registry); it is
+    also opened lazily on first use so clients work outside the app.
 
-    def __init__(self, base_url: str, timeout: float = 30.0):
-        self.base_url = base_url.rstrip("/")
+    Requests start as JSON. Once a replica advertises MessagePack in its
+    X-Supported-Formats response header, bodies sent to and received from
+    that replica are MessagePack (float arrays as raw float64 buffers)
+    instead; each attempt is encoded for the replica it goes to.
+
+    Each call is bounded by the current deadline (see app.clients.resilience),
+    which is also forwarded in the X-Request-Timeout-Ms header, and guarded
+    by a per-service circuit breaker. Idempotent calls can be hedged.
+
+    `base_url` may list several replicas separated by commas; each call
+    then goes to the least loaded one (see app.clients.balancer), and a
+    call that cannot connect is retried once on another replica.
+    """
+
+    mode = "http"
+
+    def __init__(self, base_url: str, timeout: float = 30.0, name: Optional[str] = None):
         self.timeout = timeout
+        self.name = name or self.__class__.__name__
+        urls = parse_replica_urls(base_url)
+        self.base_url = ",".join(urls)
+        self.replicas = ReplicaSet(self.name, urls)
+        self.http2 = HTTP2_ENABLED and _http2_available()
+        self.binary_enabled = BINARY_TRANSPORT_ENABLED and msgpack_available()
+        self.limits = httpx.Limits(
+            max_connections=HTTP_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._requests_total = 0
+        self._errors_total = 0
+        self._in_flight = 0
+        self._cancelled_total = 0
+        self.breaker = CircuitBreaker(self.name)
+        # In-process transports (mode "local") have nothing to hedge against
+        self.hedging = HEDGE_ENABLED and self.mode == "http"
+        self._latency: Dict[str, LatencyWindow] = {}
+        self._hedges_total = 0
+        self._hedges_won = 0
+
+    async def start(self) -> None:
+        """Open the connection pool and start health-checking ejected replicas."""
+        self.replicas.start_probing(self._get_client())
+
+    async def close(self) -> None:
+        """Close the connection pool and release all sockets."""
+        await self.replicas.stop_probing()
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2
+            )
+        return self._client
 
     async def _request(
         self,
         method: str,
         path: str,
-        json: Optional[Dict[str, Any]] = None
+        json: Optional[Dict[str, Any]] = None,
+        replica: Optional[Replica] = None
+    ) -> Dict[str, Any]:
+        """
+        Make an HTTP request to the service, on `replica` or the one the
+        balancer picks. A connection failure means nothing was sent, so the
+        call moves to another replica once, even if it is not idempotent.
+        """
+        if replica is None:
+            replica = self.replicas.pick()
+        try:
+            return await self._send(method, path, json, replica)
+        except ServiceUnavailableError as e:
+            fallback = self.replicas.pick(exclude=replica)
+            if e.code != "SERVICE_UNAVAILABLE" or fallback is replica:
+                raise
+            return await self._send(method, path, json, fallback)
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Dict[str, Any]],
+        replica: Replica
     ) -> Dict[str, Any]:
-        """Make an HTTP request to the service."""
-        url = f"{self.base_url}{path}"
+        """
+        Make one HTTP request to one replica.
+
+        The call is recorded for telemetry: wall time, the handler time the
+        service reports via Server-Timing, encode/decode time and body sizes.
+        """
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            downstream_rejected.inc(service=self.name, reason="deadline")
+            raise ServiceUnavailableError(
+                code="DEADLINE_EXCEEDED",
+                message=f"Deadline exceeded before calling {replica.url}{path}",
+                details={"service": self.name}
+            )
+        if not self.breaker.allow():
+            downstream_rejected.inc(service=self.name, reason="circuit_open")
+            raise ServiceUnavailableError(
+                code="CIRCUIT_OPEN",
+                message=f"Circuit for {self.name} service is open after repeated failures",
+                details={"service": self.name, "retry_after_seconds": round(self.breaker.retry_after(), 1)}
+            )
+        # The deadline caps the per-call timeout when it is the tighter limit
+        deadline_bound = remaining is not None and remaining < self.timeout
+
+        url = f"{replica.url}{path}"
+        client = self._get_client()
 
+        self._requests_total += 1
+        self._in_flight += 1
+        replica.begin()
+        start = time.perf_counter()
+        encode_ms = decode_ms = 0.0
+        headers = {}
+        content = None
+        response = None
+        # True/False once the service's health is known, for the circuit breaker
+        healthy = None
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(method, url, json=json)
-                data = response.json()
+            if remaining is not None:
+                headers[DEADLINE_HEADER] = str(max(1, int(remaining * 1000)))
+            if self.binary_enabled and replica.binary:
+                headers["Accept"] = MSGPACK_MEDIA_TYPE
+                if json is not None:
+                    headers["Content-Type"] = MSGPACK_MEDIA_TYPE
+                    content = encode(json)
+            elif json is not None:
+                # Same encoding httpx applies for json=, done here so it can be timed
+                headers["Content-Type"] = "application/json"
+                content = json_dumps(
+                    json, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+                ).encode("utf-8")
+            encode_ms = (time.perf_counter() - start) * 1000
+
+            response = await client.request(
+                method,
+                url,
+                content=content,
+                headers=headers or None,
+                timeout=remaining if deadline_bound else self.timeout
+            )
+            healthy = response.status_code < 500
+
+            decode_start = time.perf_counter()
+            data = self._decode_response(response, replica)
+            decode_ms = (time.perf_counter() - decode_start) * 1000
 
-                if response.status_code >= 400:
-                    error = data.get("error", {})
-                    raise ServiceRequestError(
-                        code=error.get("code", "UNKNOWN_ERROR"),
-                        message=error.get("message", f"Service returned {response.status_code}"),
-                        details=error.get("details", {})
-                    )
+            # Some services report errors with a 200 and success=false
+            if response.status_code >= 400 or data.get("success") is False:
+                error = data.get("error") or {}
+                if error.get("code") == "DEADLINE_EXCEEDED":
+                    # The service gave up on our behalf; it is not unhealthy
+                    healthy = None
+                raise ServiceRequestError(
+                    code=error.get("code", "UNKNOWN_ERROR"),
+                    message=error.get("message", f"Service returned {response.status_code}"),
+                    details=error.get("details", {})
+                )
 
-                return data
+            self._latency_for(path).add(time.perf_counter() - start)
+            return data
 
+        except asyncio.CancelledError:
+            # httpx drops the connection, so the service sees the disconnect
+            self._record_cancelled(time.perf_counter() - start)
+            raise
+        except ServiceError:
+            self._errors_total += 1
+            raise
         except httpx.ConnectError as e:
+            self._errors_total += 1
+            healthy = False
             raise ServiceUnavailableError(
                 code="SERVICE_UNAVAILABLE",
-                message=f"Cannot connect to service at {self.base_url}",
+                message=f"Cannot connect to service at {replica.url}",
                 details={"error": str(e)}
             )
         except httpx.TimeoutException as e:
+            self._errors_total += 1
+            if deadline_bound:
+                # The caller ran out of time; not the service's fault
+                raise ServiceUnavailableError(
+                    code="DEADLINE_EXCEEDED",
+                    message=f"Deadline exceeded waiting for service at {replica.url}",
+                    details={"service": self.name, "error": str(e)}
+                )
+            healthy = False
             raise ServiceUnavailableError(
                 code="SERVICE_TIMEOUT",
-                message=f"Service at {self.base_url} timed out",
+                message=f"Service at {replica.url} timed out",
                 details={"error": str(e)}
             )
         except httpx.HTTPError as e:
+            self._errors_total += 1
+            healthy = False
             raise ServiceUnavailableError(
                 code="SERVICE_ERROR",
-                message=f"HTTP error communicating with {self.base_url}",
+                message=f"HTTP error communicating with {replica.url}",
                 details={"error": str(e)}
             )
+        finally:
+            self._in_flight -= 1
+            replica.end(healthy, time.perf_counter() - start)
+            if healthy is True:
+                self.breaker.record_success()
+            elif healthy is False:
+                self.breaker.record_failure()
+            else:
+                self.breaker.release()
+            record_call(
+                service=self.name,
+                method=method,
+                path=path,
+                status=response.status_code if response is not None else None,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                server_ms=parse_server_timing(response.headers.get("server-timing")) if response is not None else None,
+                encode_ms=encode_ms,
+                decode_ms=decode_ms,
+                request_bytes=len(content) if content is not None else 0,
+                response_bytes=len(response.content) if response is not None else 0
+            )
+
+    def _record_cancelled(self, seconds: float) -> None:
+        self._cancelled_total += 1
+        downstream_cancelled.inc(service=self.name)
+        downstream_cancelled_seconds.inc(seconds, service=self.name)
+
+    def _latency_for(self, path: str) -> LatencyWindow:
+        window = self._latency.get(path)
+        if window is None:
+            window = self._latency[path] = LatencyWindow()
+        return window
+
+    async def _hedged_request(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send an idempotent request, and a duplicate if the first is still
+        pending after HEDGE_PERCENTILE of this path's recent latency.
+
+        The first successful answer wins and the other attempt is cancelled.
+        Error responses from the service are returned as-is; only transport
+        failures wait for the other attempt. With replicas, the duplicate
+        goes to a different replica than the first attempt, encoded for
+        that replica (see _send).
+        """
+        delay = self._latency_for(path).percentile(HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES)
+        if delay is None:
+            return await self._request(method, path, json=json)
+
+        first = self.replicas.pick()
+        primary = asyncio.ensure_future(self._request(method, path, json=json, replica=first))
+        attempts = [primary]
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done and self._hedges_total < self._requests_total * HEDGE_MAX_PERCENT / 100:
+                self._hedges_total += 1
+                downstream_hedges.inc(service=self.name, outcome="sent")
+                hedge = asyncio.ensure_future(self._request(
+                    method, path, json=json, replica=self.replicas.pick(exclude=first)
+                ))
+                attempts.append(hedge)
+                pending.add(hedge)
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    exc = task.exception()
+                    if exc is None:
+                        if task is not primary:
+                            self._hedges_won += 1
+                            downstream_hedges.inc(service=self.name, outcome="won")
+                        return task.result()
+                    if not isinstance(exc, ServiceUnavailableError):
+                        raise exc
+                    error = exc
+            raise error
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # mark retrieved
+
+    def _decode_response(self, response: httpx.Response, replica: Replica) -> Dict[str, Any]:
+        """Parse a JSON or MessagePack body and note whether `replica` speaks MessagePack."""
+        if (
+            self.binary_enabled
+            and not replica.binary
+            and MSGPACK_MEDIA_TYPE in response.headers.get(SUPPORTED_FORMATS_HEADER, "")
+        ):
+            replica.binary = True
+
+        if is_msgpack(response.headers.get("content-type")):
+            return decode(response.content)
+        return response.json()
 
     async def get(self, path: str) -> Dict[str, Any]:
         """Make a GET request."""
         return await self._request("GET", path)
 
-    async def post(self, path: str, json: Dict[str, Any]) -> Dict[str, Any]:
-        """Make a POST request."""
+    async def post(self, path: str, json: Dict[str, Any], idempotent: bool = False) -> Dict[str, Any]:
+        """Make a POST request; `idempotent` calls may be hedged."""
+        if idempotent and self.hedging:
+            return await self._hedged_request("POST", path, json=json)
         return await self._request("POST", path, json=json)
 
     async def health_check(self) -> bool:
@@ -86,3 +396,41 @@ class BaseClient:
             return result.get("status") == "healthy"
         except ServiceError:
             return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Report connection pool usage for this service."""
+        connections = []
+        if self._client is not None:
+            # httpx does not expose its pool publicly; read it defensively
+            pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+
+        return {
+            "base_url": self.base_url,
+            "mode": self.mode,
+            "open": self._client is not None,
+            "http2": self.http2,
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry
+            },
+            "connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "requests_total": self._requests_total,
+            "errors_total": self._errors_total,
+            "in_flight": self._in_flight,
+            "cancelled_total": self._cancelled_total,
+            "circuit": self.breaker.stats(),
+            "replicas": self.replicas.stats(),
+            "hedging": {
+                "enabled": self.hedging,
+                "hedged_total": self._hedges_total,
+                "won_total": self._hedges_won,
+                "threshold_ms": {
+                    path: round(threshold * 1000, 1)
+                    for path, window in self._latency.items()
+                    if (threshold := window.percentile(HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES)) is not None
+                }
+            }
+        }
@@ -0,0 +1,255 @@
+import asyncio
+import importlib
+import importlib.util
+import os
+import sys
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from ..telemetry.timings import record_call
+from .base import ServiceError, ServiceRequestError
+from .strategy import StrategyClient
+from .portfolio import PortfolioClient
+from .metrics import MetricsClient
+
+
+# Root of the service source tree (services/<name>/app) for in-process mode
+SERVICES_ROOT = os.environ.get(
+    "SERVICES_ROOT",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+)
+
+
+def import_service_module(service: str, module: str) -> ModuleType:
+    """
+    Import a module from another service's `app` package.
+
+    Every service names its package `app`, so the package is loaded under
+    the alias `<service>_service` to keep it apart from the orchestrator.
+    """
+    alias = f"{service.replace('-', '_')}_service"
+    if alias not in sys.modules:
+        package_dir = os.path.join(SERVICES_ROOT, service, "app")
+        spec = importlib.util.spec_from_file_location(
+            alias,
+            os.path.join(package_dir, "__init__.py"),
+            submodule_search_locations=[package_dir]
+        )
+        if spec is None or not os.path.isdir(package_dir):
+            raise ImportError(f"Service package not found at {package_dir} (set SERVICES_ROOT)")
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[alias] = package
+        spec.loader.exec_module(package)
+    return importlib.import_module(f"{alias}.{module}")
+
+
+def _invalid_request(e: ValidationError) -> ServiceRequestError:
+    return ServiceRequestError(
+        code="INVALID_REQUEST",
+        message="Invalid request payload",
+        details={"errors": e.errors(include_url=False)}
+    )
+
+
+class LocalTransport:
+    """
+    Serves a client's requests by calling the service code in-process.
+
+    Mixed in ahead of an HTTP client class so the client keeps building
+    the exact same payloads and unwrapping the same `{"success", "data"}`
+    envelope; only the hop over the network is replaced. Handlers run in
+    a worker thread so CPU-bound work does not block the event loop; if
+    the call is cancelled, the service's CancelToken is set so the handler
+    stops at its next checkpoint instead of running to the end.
+    """
+
+    mode = "local"
+
+    def _handlers(self) -> Dict[Tuple[str, str], Callable[[Dict[str, Any]], Any]]:
+        raise NotImplementedError
+
+    async def start(self) -> None:
+        self._routes = self._handlers()
+        self._cancellation = import_service_module(self.name, "cancellation")
+
+    async def close(self) -> None:
+        pass
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        if path == "/health":
+            return {"status": "healthy", "service": self.name}
+
+        if not hasattr(self, "_routes"):
+            await self.start()
+        handler = self._routes.get((method, path))
+        if handler is None:
+            raise ServiceRequestError(
+                code="UNKNOWN_ERROR",
+                message=f"No in-process handler for {method} {path}"
+            )
+
+        self._requests_total += 1
+        self._in_flight += 1
+        start = time.perf_counter()
+        status = 200
+        token = self._cancellation.CancelToken()
+        try:
+            with self._cancellation.cancel_scope(token):
+                data = await asyncio.to_thread(handler, json or {})
+        except asyncio.CancelledError:
+            # The thread cannot be interrupted; it sees the token at its next checkpoint
+            token.cancel("disconnect")
+            self._record_cancelled(time.perf_counter() - start)
+            status = None
+            raise
+        except ServiceError:
+            self._errors_total += 1
+            status = None
+            raise
+        finally:
+            self._in_flight -= 1
+            # Nothing is serialized or sent; the whole call is handler time
+            duration_ms = (time.perf_counter() - start) * 1000
+            record_call(self.name, method, path, status, duration_ms, server_ms=duration_ms)
+
+        return {"success": True, "data": data}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "base_url": None,
+            "mode": self.mode,
+            "requests_total": self._requests_total,
+            "errors_total": self._errors_total,
+            "in_flight": self._in_flight,
+            "cancelled_total": self._cancelled_total
+        }
+
+
+class LocalStrategyClient(LocalTransport, StrategyClient):
+    """Strategy client that runs BuyTheDip/BuyAndHold in-process."""
+
+    def _handlers(self):
+        models = import_service_module("strategy", "schemas.models")
+        registry = import_service_module("strategy", "strategies.registry")
+
+        def signals(payload: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                request = models.SignalRequest.model_validate(payload)
+            except ValidationError as e:
+                raise _invalid_request(e)
+
+            strategy = registry.STRATEGY_MAP.get(request.strategy_type)
+            if not strategy:
+                raise ServiceRequestError(
+                    code="STRATEGY_NOT_FOUND",
+                    message=f"Unknown strategy type: '{request.strategy_type}'",
+                    details={"supported_strategies": list(registry.STRATEGY_MAP.keys())}
+                )
+
+            signal_items = strategy.generate_signals(request.price_data, request.config.model_dump())
+            return {
+                "strategy_type": request.strategy_type,
+                "signals": [s.model_dump(mode="json") for s in signal_items],
+                "total_signals": len(signal_items)
+            }
+
+        return {("POST", "/signals"): signals}
+
+
+class LocalPortfolioClient(LocalTransport, PortfolioClient):
+    """Portfolio client that calls run_simulation in-process."""
+
+    def _handlers(self):
+        models = import_service_module("portfolio", "schemas.models")
+        simulator = import_service_module("portfolio", "engine.simulator")
+
+        def simulate(payload: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                request = models.SimulateRequest.model_validate(payload)
+            except ValidationError as e:
+                raise _invalid_request(e)
+
+            # Same checks as the portfolio service route
+            if request.initial_capital <= 0:
+                raise ServiceRequestError(
+                    code="INVALID_REQUEST", message="initial_capital must be positive"
+                )
+            if not request.price_data:
+                raise ServiceRequestError(
+                    code="INSUFFICIENT_DATA", message="price_data must not be empty"
+                )
+
+            try:
+                return simulator.run_simulation(request)
+            except ValueError as e:
+                raise ServiceRequestError(code="INVALID_REQUEST", message=str(e))
+
+        return {("POST", "/simulate"): simulate}
+
+
+class LocalMetricsClient(LocalTransport, MetricsClient):
+    """Metrics client that calls the metrics calculators in-process."""
+
+    def _handlers(self):
+        models = import_service_module("metrics", "schemas.models")
+        summary = import_service_module("metrics", "calculators.summary")
+
+        def calculate(payload: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                request = models.CalculateRequest.model_validate(payload)
+            except ValidationError as e:
+                raise _invalid_request(e)
+
+            if not request.portfolios:
+                raise ServiceRequestError(
+                    code="INVALID_REQUEST", message="portfolios must be provided"
+                )
+
+            series: Dict[str, Tuple[List[str], List[float]]] = {
+                name: (p.time_series.dates, p.time_series.portfolio_value)
+                for name, p in request.portfolios.items()
+            }
+            return summary.calculate_metrics_summary(
+                series,
+                risk_free_rate_annual=request.risk_free_rate_annual,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                precomputed={name: m.model_dump() for name, m in request.precomputed.items()}
+            )
+
+        def calculate_windows(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+            try:
+                request = models.CalculateWindowsRequest.model_validate(payload)
+            except ValidationError as e:
+                raise _invalid_request(e)
+
+            # Same checks as the metrics service route
+            if not request.portfolios:
+                raise ServiceRequestError(
+                    code="INVALID_REQUEST", message="portfolios must be provided"
+                )
+            length = min(len(p.time_series.portfolio_value) for p in request.portfolios.values())
+            if any(not 0 <= start < end <= length for start, end in request.windows):
+                raise ServiceRequestError(
+                    code="INVALID_REQUEST",
+                    message=f"windows must be [start, end) indexes within the {length} points of every series"
+                )
+
+            return summary.calculate_window_metrics(
+                {
+                    name: (p.time_series.dates, p.time_series.portfolio_value)
+                    for name, p in request.portfolios.items()
+                },
+                request.windows,
+                risk_free_rate_annual=request.risk_free_rate_annual
+            )
+
+        return {("POST", "/calculate"): calculate, ("POST", "/calculate/windows"): calculate_windows}
@@ -1,11 +1,14 @@
+import asyncio
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from .base import BaseClient
 
 
 TEST_DATA_URL = "http://test-data-fetcher:8016"
 MARKET_DATA_URL = os.environ.get("MARKET_DATA_URL", "http://market-data:8012")
+# Load prices and dividends with one /bars call (one upstream fetch) instead of two
+MARKET_DATA_BARS_ENABLED = os.environ.get("MARKET_DATA_BARS_ENABLED", "true").lower() == "true"
 
 
 class MarketDataClient(BaseClient):
@@ -13,7 +16,9 @@ class MarketDataClient(BaseClient):
 
     def __init__(self, use_test_data: bool = False):
         base_url = TEST_DATA_URL if use_test_data else MARKET_DATA_URL
-        super().__init__(base_url)
+        super().__init__(base_url, name="test_data" if use_test_data else "market_data")
+        # The test data fetcher only serves /prices and /dividends
+        self.bars_enabled = MARKET_DATA_BARS_ENABLED and not use_test_data
 
     async def fetch_prices(
         self,
@@ -30,7 +35,7 @@ class MarketDataClient(BaseClient):
             "start_date": start_date,
             "end_date": end_date,
             "frequency": frequency
-        })
+        }, idempotent=True)
         return response.get("data", {})
 
     async def fetch_dividends(
@@ -44,9 +49,50 @@ class MarketDataClient(BaseClient):
             "ticker": ticker,
             "start_date": start_date,
             "end_date": end_date
-        })
+        }, idempotent=True)
         return response.get("data", {})
 
+    async def fetch_bars(
+        self,
+        ticker: str,
+        market_type: str,
+        start_date: str,
+        end_date: str,
+        frequency: str = "daily"
+    ) -> Dict[str, Any]:
+        """Fetch prices, dividends and splits for a ticker in one call."""
+        response = await self.post("/bars", {
+            "ticker": ticker,
+            "market_type": market_type,
+            "start_date": start_date,
+            "end_date": end_date,
+            "frequency": frequency
+        }, idempotent=True)
+        return response.get("data", {})
+
+    async def fetch_market_data(
+        self,
+        ticker: str,
+        market_type: str,
+        start_date: str,
+        end_date: str,
+        frequency: str = "daily"
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Fetch the price and dividend payloads for a ticker, shaped like the
+        /prices and /dividends responses. Uses /bars when enabled, otherwise
+        the two endpoints in parallel.
+        """
+        if not self.bars_enabled:
+            return await asyncio.gather(
+                self.fetch_prices(ticker, market_type, start_date, end_date, frequency),
+                self.fetch_dividends(ticker, start_date, end_date)
+            )
+        data = await self.fetch_bars(ticker, market_type, start_date, end_date, frequency)
+        prices = {key: data[key] for key in ("ticker", "frequency", "prices") if key in data}
+        dividends = {key: data[key] for key in ("ticker", "dividends") if key in data}
+        return prices, dividends
+
 
 def extract_price_data(prices_response: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Extract date and adjusted_close from price response for strategy service."""
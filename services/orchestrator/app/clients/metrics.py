@@ -1,15 +1,29 @@
 import os
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 from .base import BaseClient
 
 
+def _metrics_input(portfolio: Dict[str, Any]) -> Dict[str, Any]:
+    """Trim a portfolio response down to what the metrics service reads."""
+    return {
+        "time_series": {
+            "dates": portfolio.get("time_series", {}).get("dates", []),
+            "portfolio_value": portfolio.get("time_series", {}).get("portfolio_value", [])
+        },
+        "final_state": {
+            "portfolio_value": portfolio.get("final_state", {}).get("portfolio_value", 0),
+            "total_invested": portfolio.get("final_state", {}).get("total_invested", 0)
+        }
+    }
+
+
 class MetricsClient(BaseClient):
     """Client for the Metrics service."""
 
     def __init__(self):
         base_url = os.environ.get("METRICS_URL", "http://metrics:8015")
-        super().__init__(base_url)
+        super().__init__(base_url, name="metrics")
 
     async def calculate(
         self,
@@ -17,34 +31,70 @@ class MetricsClient(BaseClient):
         baseline_portfolio: Dict[str, Any],
         start_date: str,
         end_date: str,
-        risk_free_rate_annual: float = 0.0
+        risk_free_rate_annual: float = 0.0,
+        baseline_metrics: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Calculate performance metrics for portfolios.
+
+        With `baseline_metrics` (already known for this baseline and range),
+        only the active portfolio is sent and measured.
+        """
+        if baseline_metrics is not None:
+            return await self.calculate_portfolios(
+                {"active": active_portfolio},
+                start_date=start_date,
+                end_date=end_date,
+                risk_free_rate_annual=risk_free_rate_annual,
+                precomputed={"baseline": baseline_metrics}
+            )
+        return await self.calculate_portfolios(
+            {"active": active_portfolio, "baseline": baseline_portfolio},
+            start_date=start_date,
+            end_date=end_date,
+            risk_free_rate_annual=risk_free_rate_annual
+        )
+
+    async def calculate_portfolios(
+        self,
+        portfolios: Dict[str, Dict[str, Any]],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        risk_free_rate_annual: float = 0.0,
+        precomputed: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
-        """Calculate performance metrics for portfolios."""
-        response = await self.post("/calculate", {
+        """Calculate metrics for an arbitrary set of named portfolios."""
+        payload = {
             "risk_free_rate_annual": risk_free_rate_annual,
             "portfolios": {
-                "active": {
-                    "time_series": {
-                        "dates": active_portfolio.get("time_series", {}).get("dates", []),
-                        "portfolio_value": active_portfolio.get("time_series", {}).get("portfolio_value", [])
-                    },
-                    "final_state": {
-                        "portfolio_value": active_portfolio.get("final_state", {}).get("portfolio_value", 0),
-                        "total_invested": active_portfolio.get("final_state", {}).get("total_invested", 0)
-                    }
-                },
-                "baseline": {
-                    "time_series": {
-                        "dates": baseline_portfolio.get("time_series", {}).get("dates", []),
-                        "portfolio_value": baseline_portfolio.get("time_series", {}).get("portfolio_value", [])
-                    },
-                    "final_state": {
-                        "portfolio_value": baseline_portfolio.get("final_state", {}).get("portfolio_value", 0),
-                        "total_invested": baseline_portfolio.get("final_state", {}).get("total_invested", 0)
-                    }
-                }
+                name: _metrics_input(portfolio)
+                for name, portfolio in portfolios.items()
             },
             "start_date": start_date,
             "end_date": end_date
-        })
+        }
+        if precomputed:
+            payload["precomputed"] = precomputed
+        response = await self.post("/calculate", payload, idempotent=True)
         return response.get("data", {})
+
+    async def calculate_windows(
+        self,
+        portfolios: Dict[str, Dict[str, Any]],
+        windows: List[Tuple[int, int]],
+        risk_free_rate_annual: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate metrics for each [start, end) index window of the named
+        full-range portfolios in one call; one /calculate-shaped result per window.
+        """
+        payload = {
+            "risk_free_rate_annual": risk_free_rate_annual,
+            "portfolios": {
+                name: _metrics_input(portfolio)
+                for name, portfolio in portfolios.items()
+            },
+            "windows": [[start, end] for start, end in windows]
+        }
+        response = await self.post("/calculate/windows", payload, idempotent=True)
+        return response.get("data", [])
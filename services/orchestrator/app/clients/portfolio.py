@@ -9,7 +9,7 @@ class PortfolioClient(BaseClient):
 
     def __init__(self):
         base_url = os.environ.get("PORTFOLIO_URL", "http://portfolio:8014")
-        super().__init__(base_url)
+        super().__init__(base_url, name="portfolio")
 
     async def simulate(
         self,
@@ -32,5 +32,5 @@ class PortfolioClient(BaseClient):
             "signals": signals,
             "price_data": price_data,
             "dividend_data": dividend_data or []
-        })
+        }, idempotent=True)
         return response.get("data", {})
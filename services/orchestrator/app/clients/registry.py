@@ -0,0 +1,58 @@
+import os
+from typing import Any, Dict
+
+from .base import BaseClient
+from .market_data import MarketDataClient
+from .strategy import StrategyClient
+from .portfolio import PortfolioClient
+from .metrics import MetricsClient
+from .local import LocalStrategyClient, LocalPortfolioClient, LocalMetricsClient
+
+
+def service_mode(service: str) -> str:
+    """
+    Execution mode for a compute service: "http" (call the remote service)
+    or "local" (call its code in-process). Set per service with
+    STRATEGY_MODE / PORTFOLIO_MODE / METRICS_MODE, or for all of them
+    with SERVICE_MODE.
+    """
+    default = os.environ.get("SERVICE_MODE", "http")
+    return os.environ.get(f"{service.upper()}_MODE", default).lower()
+
+
+# Shared, app-lifetime clients. HTTP clients each own their own connection pool.
+market_data_client = MarketDataClient()
+test_data_client = MarketDataClient(use_test_data=True)
+strategy_client = LocalStrategyClient() if service_mode("strategy") == "local" else StrategyClient()
+portfolio_client = LocalPortfolioClient() if service_mode("portfolio") == "local" else PortfolioClient()
+metrics_client = LocalMetricsClient() if service_mode("metrics") == "local" else MetricsClient()
+
+SERVICE_CLIENTS: Dict[str, BaseClient] = {
+    "market_data": market_data_client,
+    "test_data": test_data_client,
+    "strategy": strategy_client,
+    "portfolio": portfolio_client,
+    "metrics": metrics_client,
+}
+
+
+def get_market_data_client(use_test_data: bool = False) -> MarketDataClient:
+    """Return the live or test-data market data client."""
+    return test_data_client if use_test_data else market_data_client
+
+
+async def start_clients() -> None:
+    """Open connection pools for all downstream services."""
+    for client in SERVICE_CLIENTS.values():
+        await client.start()
+
+
+async def close_clients() -> None:
+    """Close connection pools for all downstream services."""
+    for client in SERVICE_CLIENTS.values():
+        await client.close()
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Per-service connection pool (or in-process call) statistics."""
+    return {name: client.stats() for name, client in SERVICE_CLIENTS.items()}
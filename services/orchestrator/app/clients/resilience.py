@@ -0,0 +1,244 @@
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..telemetry.prometheus import circuit_transitions
+
+
+# Header carrying the caller's remaining budget in milliseconds
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+
+# Budget for one backtest (all of its downstream calls), in seconds
+BACKTEST_TIMEOUT = float(os.environ.get("BACKTEST_TIMEOUT", "60"))
+# Consecutive failures that open a service's circuit (0 disables the breaker)
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "5"))
+# Seconds an open circuit waits before letting a probe call through
+CIRCUIT_RESET_TIMEOUT = float(os.environ.get("CIRCUIT_RESET_TIMEOUT", "30"))
+# Recent call latencies kept per endpoint for hedging decisions
+LATENCY_WINDOW = int(os.environ.get("LATENCY_WINDOW", "200"))
+
+
+class Deadline:
+    """
+    A point in time.monotonic() by which downstream calls must finish,
+    bounded by the enclosing deadline (`parent`) when there is one.
+    """
+
+    def __init__(self, at: Optional[float], parent: Optional["Deadline"] = None):
+        self.at = at
+        self.parent = parent
+
+    def expires_at(self) -> Optional[float]:
+        outer = self.parent.expires_at() if self.parent is not None else None
+        if self.at is None:
+            return outer
+        return self.at if outer is None else min(self.at, outer)
+
+
+class SharedDeadline(Deadline):
+    """
+    Deadline of work shared by several callers (see SingleFlight): the
+    latest of their deadlines, or none once a caller without one joins.
+    It is read on every check, so a caller joining later extends it.
+    """
+
+    def __init__(self):
+        super().__init__(None)
+        self.members: List[Deadline] = []
+        self.unbounded = False
+
+    def join(self, deadline: Optional[Deadline]) -> None:
+        if deadline is None:
+            self.unbounded = True
+        else:
+            self.members.append(deadline)
+
+    def expires_at(self) -> Optional[float]:
+        if self.unbounded:
+            return None
+        latest = None
+        for member in self.members:
+            at = member.expires_at()
+            if at is None:
+                return None
+            latest = at if latest is None else max(latest, at)
+        return latest
+
+
+_deadline: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _deadline.get()
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one."""
+    deadline = _deadline.get()
+    expires_at = deadline.expires_at() if deadline is not None else None
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound the downstream calls made in the enclosed block (and the tasks it
+    spawns) to `seconds` from now. An outer, earlier deadline still wins.
+    """
+    deadline = _deadline.get()
+    if seconds is not None and seconds > 0:
+        deadline = Deadline(time.monotonic() + seconds, deadline)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def shared_deadline(deadline: SharedDeadline) -> Iterator[None]:
+    """
+    Bound the enclosed block by `deadline` instead of the current one, for
+    work that outlives the caller that started it (see SingleFlight).
+    """
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware that starts each request's deadline from the caller's
+    X-Request-Timeout-Ms header, so a client can cap how long the
+    orchestrator keeps downstream services busy on its behalf.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        budget_ms = None
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"x-request-timeout-ms":
+                    try:
+                        budget_ms = float(value)
+                    except ValueError:
+                        pass
+                    break
+
+        if budget_ms is None:
+            await self.app(scope, receive, send)
+            return
+        # A non-positive budget is already spent: downstream calls fail fast
+        with deadline_scope(budget_ms / 1000 if budget_ms > 0 else 1e-9):
+            await self.app(scope, receive, send)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one downstream service.
+
+    closed: calls flow; `failure_threshold` failures in a row open it.
+    open: calls fail fast until `reset_timeout` seconds have passed, then a
+    single probe call is let through (half_open). The probe's success closes
+    the circuit again, its failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened = 0
+        self.rejected = 0
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        circuit_transitions.inc(service=self.name, state=state)
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now; counts the rejection if not."""
+        if self.failure_threshold <= 0 or self.state == "closed":
+            return True
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self._transition("half_open")
+        if self._probing:
+            self.rejected += 1
+            return False
+        self._probing = True
+        return True
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+        if self.state != "closed":
+            self._transition("closed")
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self._failures += 1
+        if self.failure_threshold <= 0 or self.state == "open":
+            return
+        if self.state == "half_open" or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self.opened += 1
+            self._transition("open")
+
+    def release(self) -> None:
+        """Forget a call that ended without a verdict (cancelled, caller's deadline)."""
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "enabled": self.failure_threshold > 0,
+            "consecutive_failures": self._failures,
+            "opened_total": self.opened,
+            "rejected_total": self.rejected,
+            "retry_after_seconds": round(self.retry_after(), 1)
+        }
+
+
+class LatencyWindow:
+    """Sliding window of recent call durations (seconds) for one endpoint."""
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self._samples = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float, min_samples: int = 1) -> Optional[float]:
+        """The pct-th percentile, or None until `min_samples` calls were seen."""
+        if len(self._samples) < max(min_samples, 1):
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
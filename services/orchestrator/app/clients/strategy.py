@@ -9,7 +9,7 @@ class StrategyClient(BaseClient):
 
     def __init__(self):
         base_url = os.environ.get("STRATEGY_URL", "http://strategy:8013")
-        super().__init__(base_url)
+        super().__init__(base_url, name="strategy")
 
     async def generate_signals(
         self,
@@ -22,7 +22,7 @@ class StrategyClient(BaseClient):
             "strategy_type": strategy_type,
             "config": config,
             "price_data": price_data
-        })
+        }, idempotent=True)
         return response.get("data", {})
 
 
@@ -0,0 +1,347 @@
+import asyncio
+import bisect
+import itertools
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from ..cache.keys import resolve_date_range
+from ..clients.base import ServiceError
+from ..schemas.requests import BacktestRequest, BatchRequest, MarketParams, SweepRequest, WalkForwardRequest
+from ..telemetry.prometheus import admission_queue_depth, admission_rejected, admission_running, admission_wait
+
+
+T = TypeVar("T")
+
+# Queue and limit backtest-type requests before they reach the downstream services
+ADMISSION_ENABLED = os.environ.get("ADMISSION_ENABLED", "true").lower() == "true"
+# Admitted requests running at once, across all clients
+ADMISSION_MAX_CONCURRENT = int(os.environ.get("ADMISSION_MAX_CONCURRENT", "16"))
+# Admitted requests running at once per client; each client may queue as many more
+ADMISSION_MAX_PER_CLIENT = int(os.environ.get("ADMISSION_MAX_PER_CLIENT", "4"))
+# Requests waiting for a slot before new ones are rejected with 503 OVERLOADED
+ADMISSION_MAX_QUEUED = int(os.environ.get("ADMISSION_MAX_QUEUED", "64"))
+# Seconds a request may wait for a slot before it is rejected with 503 OVERLOADED
+ADMISSION_MAX_WAIT = float(os.environ.get("ADMISSION_MAX_WAIT", "15"))
+# Estimated bars x configs above which a request is heavy
+ADMISSION_HEAVY_COST = int(os.environ.get("ADMISSION_HEAVY_COST", "50000"))
+# Share of the slots heavy requests may hold, so interactive ones always find room
+ADMISSION_HEAVY_SHARE = float(os.environ.get("ADMISSION_HEAVY_SHARE", "0.5"))
+
+# Header identifying the caller for per-client limits (defaults to its address)
+CLIENT_ID_HEADER = "X-Client-Id"
+
+# Trading bars per calendar day, used to estimate a request's size before loading it
+BARS_PER_DAY = {"daily": 252 / 365, "weekly": 1 / 7, "monthly": 1 / 30.4}
+
+PRIORITIES = ("interactive", "heavy")
+
+
+# --- Request cost ----------------------------------------------------------
+
+def estimate_bars(start_date: str, end_date: str, frequency: str) -> int:
+    """Bars a date range will load, from its calendar length (at least 1)."""
+    start_date, end_date, _ = resolve_date_range(start_date, end_date)
+    try:
+        days = (date.fromisoformat(end_date) - date.fromisoformat(start_date)).days + 1
+    except ValueError:
+        return 1
+    return max(1, int(days * BARS_PER_DAY.get(frequency, BARS_PER_DAY["daily"])))
+
+
+def _market_bars(market_params: MarketParams) -> int:
+    return estimate_bars(market_params.start_date, market_params.end_date, market_params.frequency)
+
+
+def backtest_cost(request: BacktestRequest) -> int:
+    return _market_bars(request.market_params)
+
+
+def sweep_cost(request: SweepRequest) -> int:
+    configs = len(request.configs) + (math.prod(len(v) for v in request.grid.values()) if request.grid else 0)
+    return _market_bars(request.market_params) * max(1, configs)
+
+
+def walk_forward_cost(request: WalkForwardRequest) -> int:
+    # One backtest over the range; windows are only metric slices of it
+    return _market_bars(request.market_params)
+
+
+def batch_cost(request: BatchRequest, tickers: List[str]) -> int:
+    return estimate_bars(request.start_date, request.end_date, request.frequency) * len(tickers)
+
+
+# --- Controller ------------------------------------------------------------
+
+@dataclass
+class Ticket:
+    """An admission slot, held from enter() until leave()."""
+    client: str
+    heavy: bool
+    admitted_at: float = 0.0
+    released: bool = False
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    sequence: int
+    ticket: Ticket = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    granted: bool = field(default=False, compare=False)
+
+
+class AdmissionController:
+    """
+    Bounds how many backtest-type requests run at once.
+
+    A request runs right away when a slot is free and nobody is waiting;
+    otherwise it waits in a bounded queue. Waiting requests are admitted
+    interactive first (estimated cost up to heavy_cost), then heavy, FIFO
+    within each class, skipping clients already at max_per_client, and
+    heavy requests never hold more than heavy_slots slots. Instead of
+    piling up, requests are rejected early: 429 TOO_MANY_REQUESTS when
+    their client already has max_per_client waiting, 503 OVERLOADED when
+    the queue is full or the wait exceeds max_wait_seconds. Both carry a
+    retry_after_seconds hint (sent as Retry-After).
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_concurrent: int = 16,
+        max_per_client: int = 4,
+        max_queued: int = 64,
+        max_wait_seconds: float = 15,
+        heavy_cost: int = 50000,
+        heavy_share: float = 0.5
+    ):
+        self.enabled = enabled
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_per_client = max(1, max_per_client)
+        self.max_queued = max_queued
+        self.max_wait_seconds = max_wait_seconds
+        self.heavy_cost = heavy_cost
+        self.heavy_slots = max(1, int(self.max_concurrent * heavy_share))
+        self._queue: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._running: Dict[str, int] = {}
+        self._queued: Dict[str, int] = {}
+        self._running_total = 0
+        self._running_heavy = 0
+        self._avg_duration: Optional[float] = None
+        self.admitted = 0
+        self.waited = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seen = 0.0
+        self.rejected = {"queue_full": 0, "client_limit": 0, "timeout": 0}
+
+    # --- Slots ---
+
+    def _fits(self, ticket: Ticket) -> bool:
+        return (
+            self._running_total < self.max_concurrent
+            and self._running.get(ticket.client, 0) < self.max_per_client
+            and (not ticket.heavy or self._running_heavy < self.heavy_slots)
+        )
+
+    def _start(self, ticket: Ticket) -> None:
+        ticket.admitted_at = time.monotonic()
+        self._running[ticket.client] = self._running.get(ticket.client, 0) + 1
+        self._running_total += 1
+        self._running_heavy += ticket.heavy
+        self.admitted += 1
+
+    def _dispatch(self) -> None:
+        """Admit waiting requests, in priority order, while slots allow."""
+        index = 0
+        while index < len(self._queue) and self._running_total < self.max_concurrent:
+            waiter = self._queue[index]
+            if not self._fits(waiter.ticket):
+                index += 1
+                continue
+            del self._queue[index]
+            self._dequeued(waiter)
+            self._start(waiter.ticket)
+            waiter.granted = True
+            waiter.future.set_result(None)
+        self._publish()
+
+    def _dequeued(self, waiter: _Waiter) -> None:
+        client = waiter.ticket.client
+        self._queued[client] -= 1
+        if not self._queued[client]:
+            del self._queued[client]
+
+    def _reject(self, reason: str, code: str, message: str, client: str) -> ServiceError:
+        self.rejected[reason] += 1
+        admission_rejected.inc(reason=reason)
+        return ServiceError(
+            code=code,
+            message=message,
+            details={
+                "reason": reason,
+                "client": client,
+                "queued": len(self._queue),
+                "running": self._running_total,
+                "retry_after_seconds": self.retry_after_seconds()
+            }
+        )
+
+    def retry_after_seconds(self) -> int:
+        """Rough wait until the queue ahead drains, from the average run time."""
+        average = self._avg_duration or 1.0
+        return max(1, math.ceil(average * (len(self._queue) + 1) / self.max_concurrent))
+
+    async def enter(self, client: str, cost: int) -> Ticket:
+        """
+        Wait for a slot for a request of estimated `cost` (bars x configs);
+        raises ServiceError TOO_MANY_REQUESTS or OVERLOADED instead of
+        waiting when the request cannot be admitted in time.
+        """
+        ticket = Ticket(client=client, heavy=cost > self.heavy_cost)
+        if not self.enabled:
+            return ticket
+
+        if not self._queue and self._fits(ticket):
+            self._start(ticket)
+            self._record_wait(ticket, 0.0)
+            self._publish()
+            return ticket
+
+        if self._queued.get(client, 0) >= self.max_per_client:
+            raise self._reject(
+                "client_limit", "TOO_MANY_REQUESTS",
+                f"Client already has {self.max_per_client} requests waiting", client
+            )
+        if len(self._queue) >= self.max_queued:
+            raise self._reject("queue_full", "OVERLOADED", "Server is at capacity, retry later", client)
+
+        waiter = _Waiter(
+            rank=int(ticket.heavy),
+            sequence=next(self._sequence),
+            ticket=ticket,
+            future=asyncio.get_running_loop().create_future(),
+            enqueued_at=time.monotonic()
+        )
+        bisect.insort(self._queue, waiter)
+        self._queued[client] = self._queued.get(client, 0) + 1
+        self.waited += 1
+        self._publish()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            if not waiter.granted:
+                self._remove(waiter)
+                raise self._reject(
+                    "timeout", "OVERLOADED",
+                    f"No capacity within {self.max_wait_seconds:g}s, retry later", client
+                )
+        except asyncio.CancelledError:
+            # Given up while waiting (e.g. the client disconnected)
+            if waiter.granted:
+                self.leave(ticket)
+            else:
+                self._remove(waiter)
+            raise
+
+        self._record_wait(ticket, time.monotonic() - waiter.enqueued_at)
+        return ticket
+
+    def leave(self, ticket: Ticket) -> None:
+        """Give back the slot held by `ticket` (no-op if released already)."""
+        if not self.enabled or ticket.released:
+            return
+        ticket.released = True
+        remaining = self._running[ticket.client] - 1
+        if remaining:
+            self._running[ticket.client] = remaining
+        else:
+            del self._running[ticket.client]
+        self._running_total -= 1
+        self._running_heavy -= ticket.heavy
+
+        duration = time.monotonic() - ticket.admitted_at
+        self._avg_duration = duration if self._avg_duration is None else 0.8 * self._avg_duration + 0.2 * duration
+        self._dispatch()
+
+    def _remove(self, waiter: _Waiter) -> None:
+        self._queue.remove(waiter)
+        self._dequeued(waiter)
+        # A waiter skipped for its client limit may have been holding others up
+        self._dispatch()
+
+    def _record_wait(self, ticket: Ticket, seconds: float) -> None:
+        self.wait_seconds_total += seconds
+        self.max_wait_seen = max(self.max_wait_seen, seconds)
+        admission_wait.observe(seconds, priority=PRIORITIES[ticket.heavy])
+
+    def _publish(self) -> None:
+        heavy_queued = sum(1 for w in self._queue if w.ticket.heavy)
+        admission_queue_depth.set(len(self._queue) - heavy_queued, priority="interactive")
+        admission_queue_depth.set(heavy_queued, priority="heavy")
+        admission_running.set(self._running_total - self._running_heavy, priority="interactive")
+        admission_running.set(self._running_heavy, priority="heavy")
+
+    # --- Helpers ---
+
+    @asynccontextmanager
+    async def admit(self, client: str, cost: int) -> AsyncIterator[Ticket]:
+        """Hold a slot for the duration of the block."""
+        ticket = await self.enter(client, cost)
+        try:
+            yield ticket
+        finally:
+            self.leave(ticket)
+
+    async def run(self, client: str, cost: int, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await `fn()` once admitted."""
+        async with self.admit(client, cost):
+            return await fn()
+
+    def stats(self) -> Dict[str, Any]:
+        admitted = self.admitted or 1
+        return {
+            "enabled": self.enabled,
+            "limits": {
+                "max_concurrent": self.max_concurrent,
+                "max_per_client": self.max_per_client,
+                "max_queued": self.max_queued,
+                "max_wait_seconds": self.max_wait_seconds,
+                "heavy_cost": self.heavy_cost,
+                "heavy_slots": self.heavy_slots
+            },
+            "running": self._running_total,
+            "running_heavy": self._running_heavy,
+            "queued": len(self._queue),
+            "queued_heavy": sum(1 for w in self._queue if w.ticket.heavy),
+            "clients": {
+                client: {"running": self._running.get(client, 0), "queued": self._queued.get(client, 0)}
+                for client in sorted(set(self._running) | set(self._queued))
+            },
+            "admitted": self.admitted,
+            "waited": self.waited,
+            "rejected": dict(self.rejected),
+            "wait_ms": {
+                "avg": round(self.wait_seconds_total / admitted * 1000, 1),
+                "max": round(self.max_wait_seen * 1000, 1)
+            },
+            "avg_duration_ms": int(self._avg_duration * 1000) if self._avg_duration is not None else None
+        }
+
+
+admission = AdmissionController(
+    enabled=ADMISSION_ENABLED,
+    max_concurrent=ADMISSION_MAX_CONCURRENT,
+    max_per_client=ADMISSION_MAX_PER_CLIENT,
+    max_queued=ADMISSION_MAX_QUEUED,
+    max_wait_seconds=ADMISSION_MAX_WAIT,
+    heavy_cost=ADMISSION_HEAVY_COST,
+    heavy_share=ADMISSION_HEAVY_SHARE
+)
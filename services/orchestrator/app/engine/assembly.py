@@ -0,0 +1,194 @@
+from typing import Any, Dict, List
+
+from ..schemas.requests import MarketParams
+from ..schemas.responses import (
+    BacktestData, BacktestMetadata,
+    ActiveStrategy, Baseline, Portfolio, PortfolioTimeSeries, PortfolioFinalState,
+    Metrics, Signal, Trade, MarketData, PriceData, DividendData, Comparison
+)
+
+
+def build_signals_list(signals_data: List[Dict[str, Any]]) -> List[Signal]:
+    """Convert raw signals to Signal objects."""
+    return [
+        Signal(
+            date=s.get("date", ""),
+            action=s.get("action", ""),
+            price=s.get("price", 0),
+            trigger_details=s.get("trigger_details")
+        )
+        for s in signals_data
+    ]
+
+
+def build_trades_list(trades_data: List[Dict[str, Any]], ticker: str, trigger_map: Dict[str, str]) -> List[Trade]:
+    """Convert raw trades to Trade objects with trigger info."""
+    return [
+        Trade(
+            date=t.get("date", ""),
+            action=t.get("action", ""),
+            ticker=ticker,
+            shares=t.get("shares", 0),
+            price=t.get("price", 0),
+            amount=t.get("amount", 0),
+            trigger=trigger_map.get(t.get("date")),
+            transaction_cost=t.get("transaction_cost")
+        )
+        for t in trades_data
+    ]
+
+
+def build_portfolio(portfolio_data: Dict[str, Any], trades: List[Trade] = None) -> Portfolio:
+    """Build Portfolio object from raw data."""
+    ts = portfolio_data.get("time_series", {})
+    fs = portfolio_data.get("final_state", {})
+
+    return Portfolio(
+        time_series=PortfolioTimeSeries(
+            dates=ts.get("dates", []),
+            portfolio_value=ts.get("portfolio_value", []),
+            holdings_value=ts.get("holdings_value"),
+            cash_balance=ts.get("cash_balance"),
+            cumulative_invested=ts.get("cumulative_invested"),
+            cumulative_dividends=ts.get("cumulative_dividends"),
+            shares_held=ts.get("shares_held")
+        ),
+        trades=trades,
+        final_state=PortfolioFinalState(
+            total_shares=fs.get("total_shares"),
+            cash_balance=fs.get("cash_balance"),
+            holdings_value=fs.get("holdings_value"),
+            portfolio_value=fs.get("portfolio_value", 0),
+            total_invested=fs.get("total_invested", 0),
+            total_dividends_received=fs.get("total_dividends_received"),
+            total_transaction_costs=fs.get("total_transaction_costs")
+        )
+    )
+
+
+def build_metrics(metrics_data: Dict[str, Any], total_trades: int = None) -> Metrics:
+    """Build Metrics object from raw data."""
+    return Metrics(
+        total_return_pct=metrics_data.get("total_return_pct", 0),
+        annualized_return_pct=metrics_data.get("annualized_return_pct", 0),
+        max_drawdown_pct=metrics_data.get("max_drawdown_pct", 0),
+        max_drawdown_duration_days=metrics_data.get("max_drawdown_duration_days"),
+        volatility_annualized_pct=metrics_data.get("volatility_annualized_pct", 0),
+        sharpe_ratio=metrics_data.get("sharpe_ratio", 0),
+        sortino_ratio=metrics_data.get("sortino_ratio"),
+        calmar_ratio=metrics_data.get("calmar_ratio"),
+        total_trades=total_trades
+    )
+
+
+def build_comparison(comparison_metrics: Dict[str, Any]) -> Comparison:
+    """Build Comparison object from raw data."""
+    return Comparison(
+        excess_return_pct=comparison_metrics.get("excess_return_pct", 0),
+        excess_annualized_return_pct=comparison_metrics.get("excess_annualized_return_pct"),
+        excess_sharpe=comparison_metrics.get("excess_sharpe", 0),
+        reduced_max_drawdown_pct=comparison_metrics.get("reduced_max_drawdown_pct", 0),
+        reduced_volatility_pct=comparison_metrics.get("reduced_volatility_pct")
+    )
+
+
+def build_market_data(ticker: str, prices_data: Dict[str, Any], dividends_data: Dict[str, Any]) -> MarketData:
+    """Build MarketData object from raw data."""
+    prices = prices_data.get("prices", [])
+    dividends = dividends_data.get("dividends", [])
+
+    return MarketData(
+        ticker=ticker,
+        prices=[
+            PriceData(
+                date=p.get("date", ""),
+                open=p.get("open"),
+                high=p.get("high"),
+                low=p.get("low"),
+                close=p.get("close"),
+                adjusted_close=p.get("adjusted_close", 0),
+                volume=p.get("volume")
+            )
+            for p in prices
+        ],
+        dividends=[
+            DividendData(
+                ex_date=d.get("ex_date", ""),
+                payment_date=d.get("payment_date"),
+                amount_per_share=d.get("amount_per_share", 0)
+            )
+            for d in dividends
+        ]
+    )
+
+
+def build_trigger_map(signals: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Build a map of date -> trigger string for merging with trades."""
+    trigger_map = {}
+    for signal in signals:
+        date = signal.get("date")
+        trigger = signal.get("trigger_details", {})
+        if date and trigger:
+            if isinstance(trigger, dict):
+                trigger_str = trigger.get("reason", str(trigger))
+            else:
+                trigger_str = str(trigger)
+            trigger_map[date] = trigger_str
+    return trigger_map
+
+
+def build_active_strategy(
+    ticker: str,
+    signals: List[Dict[str, Any]],
+    portfolio_data: Dict[str, Any],
+    metrics_data: Dict[str, Any]
+) -> ActiveStrategy:
+    """Build the active strategy section (signals, portfolio with trades, metrics)."""
+    trades_raw = portfolio_data.get("trades", [])
+    trades = build_trades_list(trades_raw, ticker, build_trigger_map(signals))
+
+    return ActiveStrategy(
+        signals=build_signals_list(signals),
+        portfolio=build_portfolio(portfolio_data, trades),
+        metrics=build_metrics(metrics_data, len(trades_raw))
+    )
+
+
+def build_baseline(portfolio_data: Dict[str, Any], metrics_data: Dict[str, Any]) -> Baseline:
+    """Build the buy-and-hold baseline section."""
+    return Baseline(
+        portfolio=build_portfolio(portfolio_data),
+        metrics=build_metrics(metrics_data)
+    )
+
+
+def build_backtest_data(
+    market_params: MarketParams,
+    strategy_type: str,
+    prices_data: Dict[str, Any],
+    dividends_data: Dict[str, Any],
+    active_signals: List[Dict[str, Any]],
+    active_portfolio_data: Dict[str, Any],
+    baseline_portfolio_data: Dict[str, Any],
+    metrics_data: Dict[str, Any],
+    execution_time_ms: int
+) -> BacktestData:
+    """Assemble the full backtest payload from raw downstream responses."""
+    return BacktestData(
+        metadata=BacktestMetadata(
+            ticker=market_params.ticker,
+            start_date=market_params.start_date,
+            end_date=market_params.end_date,
+            strategy_type=strategy_type,
+            execution_time_ms=execution_time_ms
+        ),
+        active_strategy=build_active_strategy(
+            market_params.ticker,
+            active_signals,
+            active_portfolio_data,
+            metrics_data.get("active", {})
+        ),
+        baseline=build_baseline(baseline_portfolio_data, metrics_data.get("baseline", {})),
+        market_data=build_market_data(market_params.ticker, prices_data, dividends_data),
+        comparison=build_comparison(metrics_data.get("comparison", {}))
+    )
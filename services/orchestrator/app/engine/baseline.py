@@ -0,0 +1,107 @@
+import os
+from typing import Any, Dict, List, Optional
+
+from ..schemas.requests import BaselineParams
+from ..clients.registry import portfolio_client, metrics_client
+from .stage_cache import STAGE_CACHE_ENABLED, SeriesFingerprint, StageCache, fingerprint
+
+
+BASELINE_CACHE_MAX_ENTRIES = int(os.environ.get("BASELINE_CACHE_MAX_ENTRIES", "256"))
+BASELINE_CACHE_TTL = float(os.environ.get("BASELINE_CACHE_TTL", "3600"))
+# Follows the other stage caches; BASELINE_CACHE_MAX_ENTRIES=0 turns off just these two
+BASELINE_CACHE_ENABLED = STAGE_CACHE_ENABLED and BASELINE_CACHE_MAX_ENTRIES > 0
+
+# Reason the strategy service attaches to its buy_and_hold signal
+BUY_AND_HOLD_REASON = "Initial buy for buy-and-hold strategy"
+
+# Memoized baseline portfolios (by baseline key) and metrics (by key and range)
+baseline_portfolio_stage = StageCache(
+    "baseline_portfolio", BASELINE_CACHE_MAX_ENTRIES, BASELINE_CACHE_TTL, enabled=BASELINE_CACHE_ENABLED
+)
+baseline_metrics_stage = StageCache(
+    "baseline_metrics", BASELINE_CACHE_MAX_ENTRIES, BASELINE_CACHE_TTL, enabled=BASELINE_CACHE_ENABLED
+)
+
+
+def buy_and_hold_signals(price_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    The strategy service's buy_and_hold signals, built locally: a single BUY
+    on the first bar at its adjusted close.
+    """
+    if not price_data:
+        return []
+    first = price_data[0]
+    return [{
+        "date": first["date"],
+        "action": "BUY",
+        "price": float(first["adjusted_close"]),
+        "trigger_details": {"reason": BUY_AND_HOLD_REASON}
+    }]
+
+
+def baseline_key(baseline_params: BaselineParams, series: SeriesFingerprint) -> str:
+    """Memo key for a baseline: the series it is simulated on plus the baseline params."""
+    return fingerprint(
+        "baseline", series.prices, series.dividends,
+        baseline_params.initial_capital, baseline_params.reinvest_dividends
+    )
+
+
+async def simulate_baseline(
+    baseline_params: BaselineParams,
+    price_data: List[Dict[str, Any]],
+    dividend_data: List[Dict[str, Any]],
+    key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Simulate the buy-and-hold baseline portfolio, memoized per baseline key.
+
+    The returned payload may be shared between backtests; treat it as
+    read-only.
+    """
+    key = key or baseline_key(baseline_params, SeriesFingerprint.of(price_data, dividend_data))
+
+    async def compute() -> Dict[str, Any]:
+        return await portfolio_client.simulate(
+            initial_capital=baseline_params.initial_capital,
+            investment_per_trade=baseline_params.initial_capital,
+            reinvest_dividends=baseline_params.reinvest_dividends,
+            transaction_cost_pct=0.0,
+            cash_interest_rate_pct=0.0,
+            signals=buy_and_hold_signals(price_data),
+            price_data=price_data,
+            dividend_data=dividend_data
+        )
+
+    return await baseline_portfolio_stage.get_or_compute(key, compute)
+
+
+def cached_baseline_metrics(key: str, start_date: str, end_date: str) -> Optional[Dict[str, Any]]:
+    """Memoized metrics of a baseline over a range, if known."""
+    return baseline_metrics_stage.get((key, start_date, end_date)) or None
+
+
+def store_baseline_metrics(key: str, start_date: str, end_date: str, metrics: Dict[str, Any]) -> None:
+    baseline_metrics_stage.set((key, start_date, end_date), metrics)
+
+
+async def baseline_metrics(
+    key: str,
+    portfolio: Dict[str, Any],
+    start_date: str,
+    end_date: str
+) -> Dict[str, Any]:
+    """Metrics of a baseline portfolio on its own, memoized per key and range."""
+    async def compute() -> Dict[str, Any]:
+        data = await metrics_client.calculate_portfolios(
+            {"baseline": portfolio}, start_date=start_date, end_date=end_date
+        )
+        return data.get("baseline", {})
+
+    return await baseline_metrics_stage.get_or_compute((key, start_date, end_date), compute)
+
+
+def baseline_stats() -> Dict[str, Any]:
+    return {
+        stage.name: stage.stats() for stage in (baseline_portfolio_stage, baseline_metrics_stage)
+    }
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import time
+from typing import AsyncIterator, List, Union
+
+from ..schemas.requests import BatchRequest, BacktestRequest, MarketParams
+from ..schemas.responses import (
+    BacktestData, BatchTickerResult, BatchSummary, Comparison, ErrorDetail, Metrics
+)
+from ..clients.base import ServiceError
+from .pipeline import execute_backtest
+
+
+BATCH_MAX_TICKERS = int(os.environ.get("BATCH_MAX_TICKERS", "1000"))
+BATCH_MAX_CONCURRENCY = int(os.environ.get("BATCH_MAX_CONCURRENCY", "16"))
+
+
+def batch_tickers(request: BatchRequest) -> List[str]:
+    """Validate and de-duplicate the requested tickers, keeping their order."""
+    tickers = list(dict.fromkeys(t.strip() for t in request.tickers if t.strip()))
+    if not tickers:
+        raise ServiceError(code="INVALID_REQUEST", message="At least one ticker is required")
+    if len(tickers) > BATCH_MAX_TICKERS:
+        raise ServiceError(
+            code="INVALID_REQUEST",
+            message=f"Batch has {len(tickers)} tickers, limit is {BATCH_MAX_TICKERS}"
+        )
+    return tickers
+
+
+def ticker_request(request: BatchRequest, ticker: str) -> BacktestRequest:
+    """Build the single-ticker backtest request for one batch entry."""
+    return BacktestRequest(
+        market_params=MarketParams(
+            ticker=ticker,
+            market_type=request.market_type,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            frequency=request.frequency
+        ),
+        strategy_params=request.strategy_params,
+        portfolio_params=request.portfolio_params,
+        baseline_params=request.baseline_params,
+        use_test_data=request.use_test_data
+    )
+
+
+async def run_ticker(request: BatchRequest, ticker: str) -> BatchTickerResult:
+    """Run one ticker's backtest, reporting failures inline."""
+    start_time = time.time()
+    result = BatchTickerResult(ticker=ticker)
+
+    try:
+        data = await execute_backtest(ticker_request(request, ticker))
+    except ServiceError as e:
+        result.success = False
+        result.error = ErrorDetail(code=e.code, message=e.message, details=e.details)
+    except Exception as e:
+        result.success = False
+        result.error = ErrorDetail(code="INTERNAL_ERROR", message=str(e))
+    else:
+        result.metrics = Metrics.model_validate(data["active_strategy"]["metrics"])
+        result.baseline_metrics = Metrics.model_validate(data["baseline"]["metrics"])
+        result.comparison = Comparison.model_validate(data["comparison"])
+        if request.include_details:
+            result.data = BacktestData.model_validate(data)
+
+    result.execution_time_ms = int((time.time() - start_time) * 1000)
+    return result
+
+
+async def iter_batch(
+    request: BatchRequest,
+    tickers: List[str]
+) -> AsyncIterator[Union[BatchTickerResult, BatchSummary]]:
+    """
+    Backtest every ticker and yield results in completion order.
+
+    Each ticker runs the full pipeline; with up to max_concurrency tickers
+    in flight at once, their market data, strategy, portfolio and metrics
+    calls overlap across tickers. A summary is yielded last. Pending
+    tickers are cancelled if the consumer stops iterating.
+    """
+    start_time = time.time()
+    semaphore = asyncio.Semaphore(request.max_concurrency or BATCH_MAX_CONCURRENCY)
+
+    async def bounded(ticker: str) -> BatchTickerResult:
+        async with semaphore:
+            return await run_ticker(request, ticker)
+
+    tasks = [asyncio.ensure_future(bounded(ticker)) for ticker in tickers]
+    succeeded = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            if result.success:
+                succeeded += 1
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    yield BatchSummary(
+        total=len(tickers),
+        succeeded=succeeded,
+        failed=len(tickers) - succeeded,
+        execution_time_ms=int((time.time() - start_time) * 1000)
+    )
@@ -0,0 +1,130 @@
+from typing import Any, Callable, Dict, List, Tuple, Type, get_args, get_origin
+
+from pydantic import BaseModel
+
+from ..clients.base import ServiceError
+from ..schemas.requests import OutputOptions
+from ..schemas.responses import BacktestData, PriceData, DividendData, Signal, Trade
+
+
+# Row tables converted to parallel arrays in the columnar layout
+COLUMNAR_TABLES: Dict[Tuple[str, ...], Type[BaseModel]] = {
+    ("market_data", "prices"): PriceData,
+    ("market_data", "dividends"): DividendData,
+    ("active_strategy", "signals"): Signal,
+    ("active_strategy", "portfolio", "trades"): Trade,
+}
+
+
+def _replace_at(node: Any, path: Tuple[str, ...], fn: Callable[[Any], Any]) -> Any:
+    """Return a copy of node with fn applied at path; missing paths are left alone."""
+    if not isinstance(node, dict) or path[0] not in node or node[path[0]] is None:
+        return node
+    head, rest = path[0], path[1:]
+    return {**node, head: fn(node[head]) if not rest else _replace_at(node[head], rest, fn)}
+
+
+def to_columnar(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert the row tables of a backtest payload to {field: [values...]}."""
+    for path, model in COLUMNAR_TABLES.items():
+        fields = list(model.model_fields)
+        data = _replace_at(
+            data, path, lambda rows: {field: [row.get(field) for row in rows] for field in fields}
+        )
+    return data
+
+
+def _field_model(annotation: Any) -> Any:
+    """The model a field holds, looking through Optional and List; the annotation itself otherwise."""
+    while get_origin(annotation) is not None and get_origin(annotation) is not dict:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            break
+        annotation = args[0]
+    return annotation
+
+
+def _is_known_path(model: Type[BaseModel], path: List[str]) -> bool:
+    """Whether a dotted path names a field of the backtest response (free-form dicts accept any key)."""
+    annotation: Any = model
+    for key in path:
+        if get_origin(annotation) is dict or annotation is dict:
+            return True
+        if not (isinstance(annotation, type) and issubclass(annotation, BaseModel)):
+            return False
+        field = annotation.model_fields.get(key)
+        if field is None:
+            return False
+        annotation = _field_model(field.annotation)
+    return True
+
+
+def validate_output(options: OutputOptions) -> None:
+    """Reject include/exclude paths that do not name a field of the backtest response."""
+    unknown = {
+        name: [path for path in paths if not _is_known_path(BacktestData, path.split("."))]
+        for name, paths in (("include", options.include or []), ("exclude", options.exclude or []))
+    }
+    unknown = {name: paths for name, paths in unknown.items() if paths}
+    if unknown:
+        listed = ", ".join(path for paths in unknown.values() for path in paths)
+        raise ServiceError(
+            code="INVALID_REQUEST",
+            message=f"Unknown output path(s): {listed}",
+            details={"unknown_paths": unknown}
+        )
+
+
+def _include(node: Any, paths: List[List[str]]) -> Any:
+    if any(not path for path in paths):
+        return node
+    if isinstance(node, list):
+        return [_include(item, paths) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    grouped: Dict[str, List[List[str]]] = {}
+    for path in paths:
+        grouped.setdefault(path[0], []).append(path[1:])
+    return {key: _include(value, grouped[key]) for key, value in node.items() if key in grouped}
+
+
+def _exclude(node: Any, path: List[str]) -> Any:
+    if isinstance(node, list):
+        return [_exclude(item, path) for item in node]
+    if not isinstance(node, dict) or path[0] not in node:
+        return node
+    head, rest = path[0], path[1:]
+    if not rest:
+        return {key: value for key, value in node.items() if key != head}
+    return {**node, head: _exclude(node[head], rest)}
+
+
+def project(data: Dict[str, Any], include: List[str] = None, exclude: List[str] = None) -> Dict[str, Any]:
+    """
+    Keep only the `include` paths (plus metadata), then drop the `exclude` paths.
+
+    Paths are dotted field names; a path crossing a list applies to every
+    element, so "active_strategy.signals.trigger_details" drops that field
+    from each signal (or the column, in the columnar layout). Paths are
+    checked up front by validate_output; a known field that is absent from
+    this payload (an optional table left out) is skipped.
+    """
+    if include:
+        data = _include(data, [["metadata"]] + [path.split(".") for path in include])
+    for path in exclude or []:
+        data = _exclude(data, path.split("."))
+    return data
+
+
+def shape_output(data: Dict[str, Any], options: OutputOptions) -> Dict[str, Any]:
+    """
+    Apply the requested layout and projection to a JSON-compatible backtest payload.
+
+    The input is never mutated, so cached payloads can be passed directly.
+    """
+    if options.format == "columnar":
+        data = to_columnar(data)
+    if options.include or options.exclude:
+        data = project(data, options.include, options.exclude)
+    return data
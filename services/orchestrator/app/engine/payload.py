@@ -0,0 +1,197 @@
+import os
+from typing import Any, Dict, List, Optional
+
+from ..schemas.requests import MarketParams
+from .assembly import build_trigger_map
+
+
+# Fast twin of engine.assembly: the same payloads as the Pydantic builders
+# followed by model_dump(mode="json"), built as plain dicts and lists. The
+# downstream services are trusted to send the documented shapes, so only
+# the coercions the response models would apply are kept (ints to float in
+# float fields, integral floats to int in int fields) and no per-row model
+# is constructed. Keys are emitted in model field order so the encoded
+# JSON is byte-for-byte the same; see benchmarks/assembly.py.
+
+# Build backtest payloads directly instead of through the response models
+FAST_ASSEMBLY_ENABLED = os.environ.get("FAST_ASSEMBLY_ENABLED", "true").lower() == "true"
+
+
+def _float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _int(value: Any) -> Optional[int]:
+    return value if value is None or type(value) is int else int(value)
+
+
+def _floats(values: Optional[List[Any]]) -> Optional[List[float]]:
+    return None if values is None else list(map(float, values))
+
+
+def _copy(details: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # Signals are shared with the stage memos; the payload gets its own dict
+    return None if details is None else dict(details)
+
+
+def signal_rows(signals_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Signal payloads (see build_signals_list)."""
+    return [
+        {
+            "date": s.get("date", ""),
+            "action": s.get("action", ""),
+            "price": float(s.get("price", 0)),
+            "trigger_details": _copy(s.get("trigger_details"))
+        }
+        for s in signals_data
+    ]
+
+
+def trade_rows(trades_data: List[Dict[str, Any]], ticker: str, trigger_map: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Trade payloads with trigger info (see build_trades_list)."""
+    return [
+        {
+            "date": t.get("date", ""),
+            "action": t.get("action", ""),
+            "ticker": ticker,
+            "shares": float(t.get("shares", 0)),
+            "price": float(t.get("price", 0)),
+            "amount": float(t.get("amount", 0)),
+            "trigger": trigger_map.get(t.get("date")),
+            "transaction_cost": _float(t.get("transaction_cost"))
+        }
+        for t in trades_data
+    ]
+
+
+def portfolio_payload(portfolio_data: Dict[str, Any], trades: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Portfolio payload (see build_portfolio)."""
+    ts = portfolio_data.get("time_series", {})
+    fs = portfolio_data.get("final_state", {})
+
+    return {
+        "time_series": {
+            "dates": list(ts.get("dates", [])),
+            "portfolio_value": _floats(ts.get("portfolio_value", [])),
+            "holdings_value": _floats(ts.get("holdings_value")),
+            "cash_balance": _floats(ts.get("cash_balance")),
+            "cumulative_invested": _floats(ts.get("cumulative_invested")),
+            "cumulative_dividends": _floats(ts.get("cumulative_dividends")),
+            "shares_held": _floats(ts.get("shares_held"))
+        },
+        "trades": trades,
+        "final_state": {
+            "total_shares": _float(fs.get("total_shares")),
+            "cash_balance": _float(fs.get("cash_balance")),
+            "holdings_value": _float(fs.get("holdings_value")),
+            "portfolio_value": float(fs.get("portfolio_value", 0)),
+            "total_invested": float(fs.get("total_invested", 0)),
+            "total_dividends_received": _float(fs.get("total_dividends_received")),
+            "total_transaction_costs": _float(fs.get("total_transaction_costs"))
+        }
+    }
+
+
+def metrics_payload(metrics_data: Dict[str, Any], total_trades: int = None) -> Dict[str, Any]:
+    """Metrics payload (see build_metrics)."""
+    return {
+        "total_return_pct": float(metrics_data.get("total_return_pct", 0)),
+        "annualized_return_pct": float(metrics_data.get("annualized_return_pct", 0)),
+        "max_drawdown_pct": float(metrics_data.get("max_drawdown_pct", 0)),
+        "max_drawdown_duration_days": _int(metrics_data.get("max_drawdown_duration_days")),
+        "volatility_annualized_pct": float(metrics_data.get("volatility_annualized_pct", 0)),
+        "sharpe_ratio": float(metrics_data.get("sharpe_ratio", 0)),
+        "sortino_ratio": _float(metrics_data.get("sortino_ratio")),
+        "calmar_ratio": _float(metrics_data.get("calmar_ratio")),
+        "total_trades": total_trades
+    }
+
+
+def comparison_payload(comparison_metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Comparison payload (see build_comparison)."""
+    return {
+        "excess_return_pct": float(comparison_metrics.get("excess_return_pct", 0)),
+        "excess_annualized_return_pct": _float(comparison_metrics.get("excess_annualized_return_pct")),
+        "excess_sharpe": float(comparison_metrics.get("excess_sharpe", 0)),
+        "reduced_max_drawdown_pct": float(comparison_metrics.get("reduced_max_drawdown_pct", 0)),
+        "reduced_volatility_pct": _float(comparison_metrics.get("reduced_volatility_pct"))
+    }
+
+
+def market_data_payload(ticker: str, prices_data: Dict[str, Any], dividends_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Market data payload (see build_market_data)."""
+    return {
+        "ticker": ticker,
+        "prices": [
+            {
+                "date": p.get("date", ""),
+                "open": _float(p.get("open")),
+                "high": _float(p.get("high")),
+                "low": _float(p.get("low")),
+                "close": _float(p.get("close")),
+                "adjusted_close": float(p.get("adjusted_close", 0)),
+                "volume": _int(p.get("volume"))
+            }
+            for p in prices_data.get("prices", [])
+        ],
+        "dividends": [
+            {
+                "ex_date": d.get("ex_date", ""),
+                "payment_date": d.get("payment_date"),
+                "amount_per_share": float(d.get("amount_per_share", 0))
+            }
+            for d in dividends_data.get("dividends", [])
+        ]
+    }
+
+
+def active_portfolio_payload(
+    ticker: str,
+    signals: List[Dict[str, Any]],
+    portfolio_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """The active portfolio with its trades annotated by the triggering signal."""
+    trades = trade_rows(portfolio_data.get("trades", []), ticker, build_trigger_map(signals))
+    return portfolio_payload(portfolio_data, trades)
+
+
+def backtest_payload(
+    market_params: MarketParams,
+    strategy_type: str,
+    prices_data: Dict[str, Any],
+    dividends_data: Dict[str, Any],
+    active_signals: List[Dict[str, Any]],
+    active_portfolio_data: Dict[str, Any],
+    baseline_portfolio_data: Dict[str, Any],
+    metrics_data: Dict[str, Any],
+    execution_time_ms: int
+) -> Dict[str, Any]:
+    """
+    The JSON-compatible backtest payload, equal to
+    build_backtest_data(...).model_dump(mode="json").
+    """
+    ticker = market_params.ticker
+    return {
+        "metadata": {
+            "ticker": ticker,
+            "start_date": market_params.start_date,
+            "end_date": market_params.end_date,
+            "strategy_type": strategy_type,
+            "execution_time_ms": execution_time_ms,
+            "timings": None,
+            "cache": None
+        },
+        "active_strategy": {
+            "signals": signal_rows(active_signals),
+            "portfolio": active_portfolio_payload(ticker, active_signals, active_portfolio_data),
+            "metrics": metrics_payload(
+                metrics_data.get("active", {}), len(active_portfolio_data.get("trades", []))
+            )
+        },
+        "baseline": {
+            "portfolio": portfolio_payload(baseline_portfolio_data),
+            "metrics": metrics_payload(metrics_data.get("baseline", {}))
+        },
+        "market_data": market_data_payload(ticker, prices_data, dividends_data),
+        "comparison": comparison_payload(metrics_data.get("comparison", {}))
+    }
@@ -0,0 +1,448 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from ..schemas.requests import (
+    BacktestRequest, MarketParams, StrategyParams, PortfolioParams, BaselineParams
+)
+from ..schemas.responses import BacktestTimings
+from ..clients.base import ServiceError
+from ..clients.resilience import BACKTEST_TIMEOUT, deadline_scope
+from ..clients.market_data import extract_price_data, extract_dividend_data
+from ..clients.strategy import extract_signals
+from ..clients.registry import (
+    strategy_client, portfolio_client, metrics_client, get_market_data_client
+)
+from ..cache.keys import resolve_date_range
+from ..cache.result_cache import (
+    backtest_cache, backtest_cache_key, market_data_series, market_data_versions
+)
+from ..telemetry.timings import collect_timings, describe_stage, record_stage, timed_stage
+from .assembly import build_backtest_data
+from .payload import (
+    FAST_ASSEMBLY_ENABLED, backtest_payload, market_data_payload, signal_rows,
+    active_portfolio_payload, portfolio_payload, metrics_payload, comparison_payload
+)
+from .baseline import (
+    baseline_key, simulate_baseline, cached_baseline_metrics, store_baseline_metrics
+)
+from .singleflight import SingleFlight
+from .admission import admission, backtest_cost
+from .stage_cache import (
+    STAGE_CACHE_FRESH_TTL, SeriesFingerprint, market_data_stage, signals_stage, portfolio_stage,
+    metrics_stage, signals_key, portfolio_key, metrics_key
+)
+
+
+# Concurrent identical work shares one in-flight task
+backtest_flight = SingleFlight("backtest")
+market_data_flight = market_data_stage.flight
+
+# on_stage(stage, duration_ms, elapsed_ms, partial_payload)
+StageCallback = Callable[[str, int, int, Dict[str, Any]], None]
+
+
+class StageClock:
+    """
+    Records wall-clock time between consecutive pipeline stages and reports
+    each completed stage to an optional callback.
+    """
+
+    def __init__(self, on_stage: Optional[StageCallback] = None):
+        self.on_stage = on_stage
+        self.timings: Dict[str, int] = {}
+        self._started = time.perf_counter()
+        self._last = self._started
+
+    def elapsed_ms(self) -> int:
+        return int((time.perf_counter() - self._started) * 1000)
+
+    def mark(self, stage: str, payload: Callable[[], Dict[str, Any]]) -> None:
+        """Close a stage; `payload` builds its partial result and is only called when observed."""
+        now = time.perf_counter()
+        record_stage(stage, (now - self._last) * 1000)
+        duration_ms = int((now - self._last) * 1000)
+        self._last = now
+        self.timings[stage] = duration_ms
+        if self.on_stage is not None:
+            self.on_stage(stage, duration_ms, int((now - self._started) * 1000), payload())
+
+
+async def load_market_data(
+    market_params: MarketParams,
+    use_test_data: bool = False,
+    refresh: bool = False
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Fetch prices and dividends for the requested range (one /bars call,
+    or /prices and /dividends in parallel; see MarketDataClient).
+
+    Loads are memoized per ticker, range and frequency (ranges reaching
+    today only for STAGE_CACHE_FRESH_TTL) and identical concurrent fetches
+    are coalesced; callers must treat the returned payloads as read-only
+    since they may be shared. `refresh` skips the memo lookup. Each fetch
+    records the series' last bar date, which retires cached results
+    computed from older bars (see ResultCache).
+    """
+    data_client = get_market_data_client(use_test_data)
+
+    async def fetch() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        prices_data, dividends_data = await data_client.fetch_market_data(
+            ticker=market_params.ticker,
+            market_type=market_params.market_type,
+            start_date=market_params.start_date,
+            end_date=market_params.end_date,
+            frequency=market_params.frequency
+        )
+        prices = prices_data.get("prices", [])
+        if prices:
+            market_data_versions.observe(series, prices[-1]["date"])
+        return prices_data, dividends_data
+
+    key = (
+        use_test_data,
+        market_params.ticker,
+        market_params.market_type,
+        market_params.start_date,
+        market_params.end_date,
+        market_params.frequency
+    )
+    series = market_data_series(
+        use_test_data, market_params.ticker, market_params.market_type, market_params.frequency
+    )
+    _, _, open_ended = resolve_date_range(market_params.start_date, market_params.end_date)
+    return await market_data_stage.get_or_compute(
+        key, fetch, ttl_seconds=STAGE_CACHE_FRESH_TTL if open_ended else None, refresh=refresh
+    )
+
+
+def prepare_series(
+    market_params: MarketParams,
+    prices_data: Dict[str, Any],
+    dividends_data: Dict[str, Any]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Extract the strategy/portfolio inputs, failing if there are no prices."""
+    price_data = extract_price_data(prices_data)
+    dividend_data = extract_dividend_data(dividends_data)
+
+    if not price_data:
+        raise ServiceError(
+            code="INSUFFICIENT_DATA",
+            message="No price data available for the specified date range",
+            details={"ticker": market_params.ticker}
+        )
+
+    return price_data, dividend_data
+
+
+def strategy_config(strategy_params: StrategyParams) -> Dict[str, Any]:
+    """Build the strategy service config payload."""
+    return {
+        "price_change_threshold": strategy_params.config.price_change_threshold,
+        "lookback_period": strategy_params.config.lookback_period
+    }
+
+
+def active_keys(
+    strategy_params: StrategyParams,
+    portfolio_params: PortfolioParams,
+    series: SeriesFingerprint
+) -> Tuple[str, str]:
+    """Memo keys of the active strategy's signals and portfolio."""
+    signals = signals_key(strategy_params.strategy_type, strategy_config(strategy_params), series)
+    return signals, portfolio_key(portfolio_params.model_dump(), signals, series)
+
+
+async def generate_active_signals(
+    strategy_params: StrategyParams,
+    price_data: List[Dict[str, Any]],
+    key: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Generate signals for the active strategy, memoized when a `key` is given."""
+    async def generate() -> List[Dict[str, Any]]:
+        signals_data = await strategy_client.generate_signals(
+            strategy_type=strategy_params.strategy_type,
+            config=strategy_config(strategy_params),
+            price_data=price_data
+        )
+        return extract_signals(signals_data)
+
+    if key is None:
+        return await generate()
+    return await signals_stage.get_or_compute(key, generate)
+
+
+async def simulate_active(
+    portfolio_params: PortfolioParams,
+    signals: List[Dict[str, Any]],
+    price_data: List[Dict[str, Any]],
+    dividend_data: List[Dict[str, Any]],
+    key: Optional[str] = None
+) -> Dict[str, Any]:
+    """Simulate the active strategy portfolio, memoized when a `key` is given."""
+    async def simulate() -> Dict[str, Any]:
+        return await portfolio_client.simulate(
+            initial_capital=portfolio_params.initial_capital,
+            investment_per_trade=portfolio_params.investment_per_trade,
+            reinvest_dividends=portfolio_params.reinvest_dividends,
+            transaction_cost_pct=portfolio_params.transaction_cost_pct,
+            cash_interest_rate_pct=portfolio_params.cash_interest_rate_pct,
+            signals=signals,
+            price_data=price_data,
+            dividend_data=dividend_data
+        )
+
+    if key is None:
+        return await simulate()
+    return await portfolio_stage.get_or_compute(key, simulate)
+
+
+async def run_active(
+    strategy_params: StrategyParams,
+    portfolio_params: PortfolioParams,
+    price_data: List[Dict[str, Any]],
+    dividend_data: List[Dict[str, Any]],
+    on_signals: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    keys: Optional[Tuple[str, str]] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Generate signals and simulate the active strategy (memoized per `keys`, see active_keys)."""
+    signals_memo, portfolio_memo = keys or (None, None)
+    signals = await generate_active_signals(strategy_params, price_data, signals_memo)
+    if on_signals is not None:
+        on_signals(signals)
+    portfolio_data = await simulate_active(
+        portfolio_params, signals, price_data, dividend_data, portfolio_memo
+    )
+    return signals, portfolio_data
+
+
+async def run_baseline(
+    baseline_params: BaselineParams,
+    price_data: List[Dict[str, Any]],
+    dividend_data: List[Dict[str, Any]],
+    key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Simulate the buy-and-hold baseline portfolio.
+
+    Its single signal is built locally (no strategy call) and the portfolio
+    is memoized per baseline key, see engine.baseline.
+    """
+    return await simulate_baseline(baseline_params, price_data, dividend_data, key)
+
+
+async def calculate_metrics(
+    market_params: MarketParams,
+    active_portfolio_data: Dict[str, Any],
+    baseline_portfolio_data: Dict[str, Any],
+    baseline: Optional[str] = None,
+    active: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Calculate active, baseline and comparison metrics.
+
+    With a `baseline` key, memoized baseline metrics are reused so only the
+    active portfolio is measured; on a miss they are memoized from this call.
+    With both the baseline and `active` portfolio keys the whole result is
+    memoized too.
+    """
+    start_date, end_date = market_params.start_date, market_params.end_date
+
+    async def calculate() -> Dict[str, Any]:
+        known = cached_baseline_metrics(baseline, start_date, end_date) if baseline else None
+        metrics_data = await metrics_client.calculate(
+            active_portfolio=active_portfolio_data,
+            baseline_portfolio=baseline_portfolio_data,
+            start_date=start_date,
+            end_date=end_date,
+            baseline_metrics=known
+        )
+        if baseline and known is None and metrics_data.get("baseline"):
+            store_baseline_metrics(baseline, start_date, end_date, metrics_data["baseline"])
+        return metrics_data
+
+    if baseline is None or active is None:
+        return await calculate()
+    return await metrics_stage.get_or_compute(
+        metrics_key(active, baseline, start_date, end_date), calculate
+    )
+
+
+async def execute_backtest(
+    request: BacktestRequest,
+    on_stage: Optional[StageCallback] = None,
+    refresh: bool = False
+) -> Dict[str, Any]:
+    """
+    Run the full backtest workflow and assemble the JSON-compatible
+    response payload (BacktestData's shape).
+
+    `on_stage` is called as each stage completes (market_data, signals,
+    portfolios, metrics) with its timing and partial payload. Stage and
+    downstream call timings of this run are reported in metadata.timings.
+    All downstream calls share a BACKTEST_TIMEOUT budget.
+    Each stage is memoized by its own inputs (see engine.stage_cache), so
+    only the stages a changed parameter invalidates are re-run; `refresh`
+    refetches market data instead of using the memo.
+    Raises ServiceError (or a subclass) when a step fails.
+    """
+    with collect_timings() as timings, deadline_scope(BACKTEST_TIMEOUT):
+        data = await _run_stages(request, on_stage, refresh)
+    data["metadata"]["timings"] = BacktestTimings(**timings.report()).model_dump(mode="json")
+    return data
+
+
+async def _run_stages(
+    request: BacktestRequest,
+    on_stage: Optional[StageCallback],
+    refresh: bool = False
+) -> Dict[str, Any]:
+    start_time = time.time()
+    clock = StageClock(on_stage)
+    ticker = request.market_params.ticker
+
+    # Step 1: Fetch market data
+    prices_data, dividends_data = await load_market_data(
+        request.market_params, request.use_test_data, refresh
+    )
+    price_data, dividend_data = prepare_series(
+        request.market_params, prices_data, dividends_data
+    )
+    series = SeriesFingerprint.of(price_data, dividend_data)
+    baseline = baseline_key(request.baseline_params, series)
+    signals_memo, portfolio_memo = active_keys(
+        request.strategy_params, request.portfolio_params, series
+    )
+    clock.mark("market_data", lambda: {
+        "market_data": market_data_payload(ticker, prices_data, dividends_data)
+    })
+
+    # Steps 2-3: Generate signals and simulate portfolios (active and baseline in parallel)
+    (active_signals, active_portfolio_data), baseline_portfolio_data = await asyncio.gather(
+        run_active(
+            request.strategy_params,
+            request.portfolio_params,
+            price_data,
+            dividend_data,
+            on_signals=lambda signals: clock.mark("signals", lambda: {
+                "signals": signal_rows(signals)
+            }),
+            keys=(signals_memo, portfolio_memo)
+        ),
+        run_baseline(request.baseline_params, price_data, dividend_data, baseline)
+    )
+    clock.mark("portfolios", lambda: {
+        "active_portfolio": active_portfolio_payload(ticker, active_signals, active_portfolio_data),
+        "baseline_portfolio": portfolio_payload(baseline_portfolio_data)
+    })
+
+    # Step 4: Calculate metrics
+    metrics_data = await calculate_metrics(
+        request.market_params, active_portfolio_data, baseline_portfolio_data, baseline, portfolio_memo
+    )
+    clock.mark("metrics", lambda: {
+        "active": metrics_payload(
+            metrics_data.get("active", {}), len(active_portfolio_data.get("trades", []))
+        ),
+        "baseline": metrics_payload(metrics_data.get("baseline", {})),
+        "comparison": comparison_payload(metrics_data.get("comparison", {}))
+    })
+
+    # Step 5: Assemble response
+    execution_time_ms = int((time.time() - start_time) * 1000)
+    parts = dict(
+        market_params=request.market_params,
+        strategy_type=request.strategy_params.strategy_type,
+        prices_data=prices_data,
+        dividends_data=dividends_data,
+        active_signals=active_signals,
+        active_portfolio_data=active_portfolio_data,
+        baseline_portfolio_data=baseline_portfolio_data,
+        metrics_data=metrics_data,
+        execution_time_ms=execution_time_ms
+    )
+
+    with timed_stage("assembly"):
+        if FAST_ASSEMBLY_ENABLED:
+            return backtest_payload(**parts)
+        return build_backtest_data(**parts).model_dump(mode="json")
+
+
+def echo_request_dates(data: Dict[str, Any], request: BacktestRequest, cache: str) -> Dict[str, Any]:
+    """
+    Equivalent requests may spell the dates differently; echo this one's,
+    along with how it was served (metadata.cache: HIT, MISS or BYPASS).
+    """
+    metadata = {
+        **data["metadata"],
+        "start_date": request.market_params.start_date,
+        "end_date": request.market_params.end_date,
+        "cache": cache
+    }
+    return {**data, "metadata": metadata}
+
+
+def cached_result(data: Dict[str, Any], request: BacktestRequest, lookup_ms: float) -> Dict[str, Any]:
+    """
+    A cached payload as this request's result: the execution time and
+    timings of the run that computed it are replaced by this lookup's.
+    """
+    result = echo_request_dates(data, request, "HIT")
+    result["metadata"]["execution_time_ms"] = int(lookup_ms)
+    result["metadata"]["timings"] = BacktestTimings(stages={}, calls=[]).model_dump(mode="json")
+    return result
+
+
+async def lookup_cached_backtest(
+    request: BacktestRequest,
+    key: str,
+    series: Optional[Hashable]
+) -> Optional[Dict[str, Any]]:
+    """The cached result of a backtest (see cached_result), or None on a miss."""
+    start = time.perf_counter()
+    with timed_stage("cache"):
+        cached = await backtest_cache.get(key, series)
+    describe_stage("cache", "MISS" if cached is None else "HIT")
+    if cached is None:
+        return None
+    return cached_result(cached, request, (time.perf_counter() - start) * 1000)
+
+
+async def run_cached_backtest(
+    request: BacktestRequest,
+    cache_control: Optional[str] = None,
+    client: Optional[str] = None
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Serve a backtest from the result cache, running it on a miss.
+
+    Returns the JSON-compatible backtest payload and the cache status
+    (HIT, MISS or BYPASS). `cache_control` overrides request.cache_control.
+    Concurrent misses for the same key share a single pipeline run, which
+    first waits for an admission slot charged to `client` (when given).
+    """
+    policy = cache_control or request.cache_control
+    key, series = backtest_cache_key(request)
+
+    if policy is None:
+        cached = await lookup_cached_backtest(request, key, series)
+        if cached is not None:
+            return cached, "HIT"
+    else:
+        backtest_cache.bypasses += 1
+
+    store = policy != "no-store"
+
+    async def compute() -> Dict[str, Any]:
+        if client is None:
+            data = await execute_backtest(request, refresh=policy is not None)
+        else:
+            async with admission.admit(client, backtest_cost(request)):
+                data = await execute_backtest(request, refresh=policy is not None)
+        if store:
+            await backtest_cache.set(key, data, series)
+        return data
+
+    data = await backtest_flight.do((key, store), compute)
+    status = "MISS" if policy is None else "BYPASS"
+    return echo_request_dates(data, request, status), status
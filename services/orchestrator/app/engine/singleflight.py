@@ -0,0 +1,100 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from ..clients.base import ServiceUnavailableError
+from ..clients.resilience import SharedDeadline, current_deadline, remaining_budget, shared_deadline
+from ..telemetry.timings import Timings, detached_timings, merge_timings
+
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.deadline = SharedDeadline()
+        self.timings = Timings()
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one in-flight task.
+
+    Callers wait on the shared task with asyncio.wait, which never cancels
+    it, so a caller that is cancelled (e.g. its client disconnected) only stops waiting;
+    the work keeps running for the others. The shared task is cancelled
+    only once every caller has gone away.
+
+    The shared task does not run under the caller that started it: its
+    deadline is the latest of its callers' (none if any caller has none),
+    and its stage and call timings are collected on their own and added to
+    every caller's collector once it finishes. Each caller still waits only
+    until its own deadline, then fails with DEADLINE_EXCEEDED.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call()
+
+            async def run() -> T:
+                with shared_deadline(call.deadline), detached_timings(call.timings):
+                    return await fn()
+
+            call.task = asyncio.ensure_future(run())
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        call.deadline.join(current_deadline())
+        call.waiters += 1
+        try:
+            # Re-read the deadline after each timeout; a shared one may have been extended
+            while not call.task.done():
+                budget = remaining_budget()
+                if budget is not None and budget <= 0:
+                    self._leave(key, call)
+                    raise ServiceUnavailableError(
+                        code="DEADLINE_EXCEEDED",
+                        message=f"Deadline exceeded waiting for shared {self.name} work",
+                        details={"coalesced": self.name}
+                    )
+                await asyncio.wait((call.task,), timeout=budget)
+            return call.task.result()
+        except asyncio.CancelledError:
+            self._leave(key, call)
+            raise
+        finally:
+            call.waiters -= 1
+            if call.task.done():
+                merge_timings(call.timings)
+
+    def _leave(self, key: Hashable, call: _Call) -> None:
+        if not call.task.done() and call.waiters == 1:
+            # Last interested caller left; stop the shared work and let
+            # new callers start a fresh task instead of joining this one
+            self._forget(key, call)
+            call.task.cancel()
+            self.abandoned += 1
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned
+        }
@@ -0,0 +1,137 @@
+import json
+import os
+from array import array
+from hashlib import blake2b
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, NamedTuple, Optional, TypeVar
+
+from ..cache.memory import TTLCache
+from .singleflight import SingleFlight
+
+
+STAGE_CACHE_ENABLED = os.environ.get("STAGE_CACHE_ENABLED", "true").lower() == "true"
+STAGE_CACHE_MAX_ENTRIES = int(os.environ.get("STAGE_CACHE_MAX_ENTRIES", "128"))
+STAGE_CACHE_TTL = float(os.environ.get("STAGE_CACHE_TTL", "3600"))
+STAGE_CACHE_FRESH_TTL = float(os.environ.get("STAGE_CACHE_FRESH_TTL", "300"))
+
+
+T = TypeVar("T")
+
+
+def fingerprint(*parts: Any) -> str:
+    """Digest of JSON-compatible parts (params, other fingerprints)."""
+    digest = blake2b(digest_size=16)
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, separators=(",", ":")).encode())
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+class SeriesFingerprint(NamedTuple):
+    """
+    Digests of the price and dividend series a backtest runs on. Keying later
+    stages on the data rather than the requested range means refreshed or
+    revised bars never reuse stale results, while ranges that resolve to the
+    same bars share them.
+    """
+    prices: str
+    dividends: str
+
+    @classmethod
+    def of(
+        cls,
+        price_data: List[Dict[str, Any]],
+        dividend_data: List[Dict[str, Any]]
+    ) -> "SeriesFingerprint":
+        digest = blake2b(digest_size=16)
+        digest.update("\x1f".join(p["date"] for p in price_data).encode())
+        digest.update(array("d", [p["adjusted_close"] for p in price_data]).tobytes())
+        return cls(prices=digest.hexdigest(), dividends=fingerprint(dividend_data))
+
+
+class StageCache:
+    """
+    Memo of one pipeline stage, keyed by a fingerprint of that stage's own
+    inputs, so a changed request only re-runs the stages it invalidates.
+
+    Concurrent misses for a key share one computation. Cached values are
+    shared between backtests and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = STAGE_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = STAGE_CACHE_TTL,
+        enabled: bool = STAGE_CACHE_ENABLED
+    ):
+        self.name = name
+        self.enabled = enabled
+        self.memory = TTLCache(max_entries if enabled else 0, ttl_seconds)
+        self.flight = SingleFlight(name)
+        self.bypasses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        return self.memory.get(key) if self.enabled else None
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        self.memory.set(key, value, ttl_seconds)
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[T]],
+        ttl_seconds: Optional[float] = None,
+        refresh: bool = False
+    ) -> T:
+        """
+        The memoized value for `key`, computing and storing it on a miss.
+        `refresh` skips the lookup but still stores the fresh value.
+        """
+        if refresh:
+            self.bypasses += 1
+        else:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+
+        async def run() -> T:
+            value = await compute()
+            self.set(key, value, ttl_seconds)
+            return value
+
+        return await self.flight.do(key, run)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.memory.ttl_seconds,
+            "bypasses": self.bypasses,
+            "memory": self.memory.stats(),
+            "coalescing": self.flight.stats()
+        }
+
+
+market_data_stage = StageCache("market_data")
+signals_stage = StageCache("signals")
+portfolio_stage = StageCache("portfolio")
+metrics_stage = StageCache("metrics")
+
+
+def signals_key(strategy_type: str, config: Dict[str, Any], series: SeriesFingerprint) -> str:
+    return fingerprint("signals", series.prices, strategy_type, config)
+
+
+def portfolio_key(params: Dict[str, Any], signals: str, series: SeriesFingerprint) -> str:
+    """The signals key stands in for the signals themselves, which it determines."""
+    return fingerprint("portfolio", signals, series.prices, series.dividends, params)
+
+
+def metrics_key(portfolio: str, baseline: str, start_date: str, end_date: str) -> str:
+    return fingerprint("metrics", portfolio, baseline, start_date, end_date)
+
+
+def stage_stats() -> Dict[str, Any]:
+    return {
+        stage.name: stage.stats()
+        for stage in (market_data_stage, signals_stage, portfolio_stage, metrics_stage)
+    }
@@ -0,0 +1,122 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+from ..schemas.requests import BacktestRequest
+from ..schemas.responses import (
+    BacktestResponse, BacktestStageEvent, BacktestCompleteEvent, BacktestErrorEvent, ErrorDetail
+)
+from ..clients.base import ServiceError
+from ..cache.result_cache import backtest_cache, backtest_cache_key
+from .pipeline import StageClock, execute_backtest, echo_request_dates, lookup_cached_backtest
+
+
+BacktestEvent = Union[BacktestStageEvent, BacktestCompleteEvent, BacktestErrorEvent]
+
+
+async def cached_backtest_event(
+    request: BacktestRequest,
+    cache_control: Optional[str] = None
+) -> Optional[BacktestCompleteEvent]:
+    """
+    The complete event for a backtest already in the result cache, or None
+    on a miss or when the cache policy skips the lookup.
+    """
+    clock = StageClock()
+    if (cache_control or request.cache_control) is not None:
+        return None
+    key, series = backtest_cache_key(request)
+    cached = await lookup_cached_backtest(request, key, series)
+    if cached is None:
+        return None
+    return BacktestCompleteEvent(
+        cache="HIT",
+        timings={},
+        elapsed_ms=clock.elapsed_ms(),
+        response=BacktestResponse(data=cached)
+    )
+
+
+async def iter_backtest_events(
+    request: BacktestRequest,
+    cache_control: Optional[str] = None,
+    lookup: bool = True
+) -> AsyncIterator[BacktestEvent]:
+    """
+    Run a backtest and yield an event as each stage completes.
+
+    Yields stage events (market_data, signals, portfolios, metrics) with
+    partial payloads, then a complete event carrying the full
+    BacktestResponse, or an error event. A cache hit yields only the
+    complete event; pass lookup=False when the caller has already checked
+    (see cached_backtest_event). Closing the iterator cancels the pipeline.
+    """
+    clock = StageClock()
+    policy = cache_control or request.cache_control
+    key, series = backtest_cache_key(request)
+
+    if policy is not None:
+        backtest_cache.bypasses += 1
+    elif lookup:
+        hit = await cached_backtest_event(request)
+        if hit is not None:
+            yield hit
+            return
+
+    events: asyncio.Queue = asyncio.Queue()
+
+    def on_stage(stage: str, duration_ms: int, elapsed_ms: int, payload: Dict[str, Any]) -> None:
+        events.put_nowait(BacktestStageEvent(
+            stage=stage, duration_ms=duration_ms, elapsed_ms=elapsed_ms, data=payload
+        ))
+
+    task = asyncio.ensure_future(execute_backtest(request, on_stage, refresh=policy is not None))
+    task.add_done_callback(lambda _: events.put_nowait(None))
+
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            clock.timings[event.stage] = event.duration_ms
+            yield event
+
+        try:
+            data = task.result()
+        except ServiceError as e:
+            yield BacktestErrorEvent(
+                elapsed_ms=clock.elapsed_ms(),
+                error=ErrorDetail(code=e.code, message=e.message, details=e.details or {})
+            )
+            return
+        except Exception as e:
+            yield BacktestErrorEvent(
+                elapsed_ms=clock.elapsed_ms(),
+                error=ErrorDetail(
+                    code="INTERNAL_ERROR",
+                    message=f"An unexpected error occurred: {str(e)}"
+                )
+            )
+            return
+
+        if policy != "no-store":
+            await backtest_cache.set(key, data, series)
+
+        status = "MISS" if policy is None else "BYPASS"
+        yield BacktestCompleteEvent(
+            cache=status,
+            timings=clock.timings,
+            elapsed_ms=clock.elapsed_ms(),
+            response=BacktestResponse(data=echo_request_dates(data, request, status))
+        )
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def format_event(event: BacktestEvent, sse: bool = False) -> str:
+    """Serialize an event as an NDJSON line or a Server-Sent Events frame."""
+    body = event.model_dump_json()
+    if sse:
+        name = event.stage if isinstance(event, BacktestStageEvent) else event.type
+        return f"event: {name}\ndata: {body}\n\n"
+    return body + "\n"
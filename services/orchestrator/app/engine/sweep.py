@@ -0,0 +1,245 @@
+import asyncio
+import copy
+import heapq
+import itertools
+import math
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from ..schemas.requests import SweepRequest, SweepConfig, StrategyParams
+from ..schemas.responses import (
+    Metrics, SweepData, SweepMetadata, SweepResult, SweepDetail, ErrorDetail
+)
+from ..clients.base import ServiceError
+from ..clients.resilience import BACKTEST_TIMEOUT, deadline_scope
+from .assembly import build_active_strategy, build_baseline, build_comparison, build_metrics
+from .baseline import baseline_key, baseline_metrics
+from .pipeline import (
+    load_market_data, prepare_series, active_keys, generate_active_signals, simulate_active,
+    run_baseline, calculate_metrics
+)
+from .stage_cache import SeriesFingerprint
+
+
+SWEEP_MAX_CONFIGS = int(os.environ.get("SWEEP_MAX_CONFIGS", "1000"))
+
+RANKABLE_METRICS = sorted(Metrics.model_fields)
+
+
+def _invalid(message: str, details: Dict[str, Any] = None) -> ServiceError:
+    return ServiceError(code="INVALID_REQUEST", message=message, details=details)
+
+
+def _set_path(target: Dict[str, Any], path: str, value: Any) -> None:
+    """Set a dotted field path on a nested dict; every segment must already exist."""
+    *parents, leaf = path.split(".")
+    node = target
+    for key in parents:
+        node = node.get(key) if isinstance(node, dict) else None
+    if not isinstance(node, dict) or leaf not in node:
+        raise _invalid(f"Unknown sweep grid field '{path}'")
+    node[leaf] = value
+
+
+def expand_sweep_configs(request: SweepRequest) -> List[SweepConfig]:
+    """Expand the explicit config list and the parameter grid into concrete configs."""
+    configs = list(request.configs)
+
+    if request.grid:
+        if request.strategy_params is None or request.portfolio_params is None:
+            raise _invalid("strategy_params and portfolio_params are required when a grid is given")
+
+        grid_size = math.prod(len(values) for values in request.grid.values())
+        if len(configs) + grid_size > SWEEP_MAX_CONFIGS:
+            raise _invalid(
+                f"Sweep expands to {len(configs) + grid_size} configs, limit is {SWEEP_MAX_CONFIGS}"
+            )
+
+        base = {
+            "strategy_params": request.strategy_params.model_dump(),
+            "portfolio_params": request.portfolio_params.model_dump()
+        }
+        paths = list(request.grid)
+        for values in itertools.product(*(request.grid[path] for path in paths)):
+            candidate = copy.deepcopy(base)
+            for path, value in zip(paths, values):
+                _set_path(candidate, path, value)
+            try:
+                configs.append(SweepConfig.model_validate(candidate))
+            except ValidationError as e:
+                raise _invalid("Invalid sweep grid value", {"errors": e.errors(include_url=False)})
+    elif not configs and request.strategy_params and request.portfolio_params:
+        configs.append(SweepConfig(
+            strategy_params=request.strategy_params,
+            portfolio_params=request.portfolio_params
+        ))
+
+    if not configs:
+        raise _invalid("Sweep needs a grid or at least one config")
+    if len(configs) > SWEEP_MAX_CONFIGS:
+        raise _invalid(f"Sweep has {len(configs)} configs, limit is {SWEEP_MAX_CONFIGS}")
+
+    return configs
+
+
+async def execute_sweep(
+    request: SweepRequest,
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> SweepData:
+    """
+    Evaluate many strategy/portfolio configs against one market data load.
+
+    Market data and the baseline (portfolio and metrics) are computed once;
+    configs sharing the same strategy params share one signal generation
+    call, and only each config's active portfolio is measured. Signals,
+    portfolios and metrics go through the stage memos, so re-running a
+    sweep with a few changed configs only evaluates those. Per-config
+    failures are reported inline instead of failing the sweep.
+    `on_progress(completed, total)` is called as each config finishes.
+    """
+    start_time = time.time()
+
+    if request.rank_by not in RANKABLE_METRICS:
+        raise _invalid(
+            f"Cannot rank by '{request.rank_by}'",
+            {"supported_metrics": RANKABLE_METRICS}
+        )
+    configs = expand_sweep_configs(request)
+    market_params = request.market_params
+
+    # The shared loads and each config get their own BACKTEST_TIMEOUT budget
+    with deadline_scope(BACKTEST_TIMEOUT):
+        prices_data, dividends_data = await load_market_data(market_params, request.use_test_data)
+        price_data, dividend_data = prepare_series(market_params, prices_data, dividends_data)
+
+        series = SeriesFingerprint.of(price_data, dividend_data)
+        baseline = baseline_key(request.baseline_params, series)
+        baseline_portfolio_data = await run_baseline(
+            request.baseline_params, price_data, dividend_data, baseline
+        )
+
+    # Every config compares against the same baseline metrics
+    baseline_metrics_task = asyncio.ensure_future(baseline_metrics(
+        baseline, baseline_portfolio_data, market_params.start_date, market_params.end_date
+    ))
+
+    semaphore = asyncio.Semaphore(request.max_concurrency)
+    signal_tasks: Dict[str, asyncio.Future] = {}
+    sign = 1.0 if request.rank_order == "desc" else -1.0
+    best_heap: List[Tuple[float, int]] = []
+    best_raw: Dict[int, Tuple[List[Dict[str, Any]], Dict[str, Any], Dict[str, Any]]] = {}
+
+    def signals_for(strategy_params: StrategyParams, key: str) -> asyncio.Future:
+        if key not in signal_tasks:
+            signal_tasks[key] = asyncio.ensure_future(
+                generate_active_signals(strategy_params, price_data, key)
+            )
+        return signal_tasks[key]
+
+    def keep_if_best(index: int, score: float, raw: Tuple) -> None:
+        # Min-heap of the current top N; ties prefer the earlier config
+        if request.top_n == 0 or score is None or math.isnan(score):
+            return
+        entry = (sign * score, -index)
+        if len(best_heap) < request.top_n:
+            heapq.heappush(best_heap, entry)
+        elif entry > best_heap[0]:
+            _, evicted = heapq.heapreplace(best_heap, entry)
+            best_raw.pop(-evicted, None)
+        else:
+            return
+        best_raw[index] = raw
+
+    completed = 0
+
+    async def run_config(index: int, config: SweepConfig) -> SweepResult:
+        nonlocal completed
+        result = await evaluate_config(index, config)
+        completed += 1
+        if on_progress is not None:
+            on_progress(completed, len(configs))
+        return result
+
+    async def evaluate_config(index: int, config: SweepConfig) -> SweepResult:
+        result = SweepResult(
+            index=index,
+            strategy_params=config.strategy_params.model_dump(),
+            portfolio_params=config.portfolio_params.model_dump()
+        )
+        async with semaphore:
+            try:
+                with deadline_scope(BACKTEST_TIMEOUT):
+                    signals_memo, portfolio_memo = active_keys(
+                        config.strategy_params, config.portfolio_params, series
+                    )
+                    signals = await signals_for(config.strategy_params, signals_memo)
+                    portfolio_data = await simulate_active(
+                        config.portfolio_params, signals, price_data, dividend_data, portfolio_memo
+                    )
+                    # Baseline metrics are memoized by then, so only the active portfolio is measured
+                    await asyncio.shield(baseline_metrics_task)
+                    metrics_data = await calculate_metrics(
+                        market_params, portfolio_data, baseline_portfolio_data, baseline, portfolio_memo
+                    )
+            except ServiceError as e:
+                result.success = False
+                result.error = ErrorDetail(code=e.code, message=e.message, details=e.details)
+                return result
+            except Exception as e:
+                result.success = False
+                result.error = ErrorDetail(code="INTERNAL_ERROR", message=str(e))
+                return result
+
+        result.metrics = build_metrics(
+            metrics_data.get("active", {}), len(portfolio_data.get("trades", []))
+        )
+        result.comparison = build_comparison(metrics_data.get("comparison", {}))
+        keep_if_best(
+            index,
+            getattr(result.metrics, request.rank_by),
+            (signals, portfolio_data, metrics_data)
+        )
+        return result
+
+    try:
+        results = await asyncio.gather(*(
+            run_config(index, config) for index, config in enumerate(configs)
+        ))
+        baseline_metrics_data = await baseline_metrics_task
+    finally:
+        # Also reached when the sweep is cancelled: stop work nobody awaits
+        baseline_metrics_task.cancel()
+        for task in signal_tasks.values():
+            task.cancel()
+
+    best = []
+    for _, neg_index in sorted(best_heap, reverse=True):
+        signals, portfolio_data, metrics_data = best_raw[-neg_index]
+        best.append(SweepDetail(
+            index=-neg_index,
+            active_strategy=build_active_strategy(
+                market_params.ticker, signals, portfolio_data, metrics_data.get("active", {})
+            ),
+            comparison=build_comparison(metrics_data.get("comparison", {}))
+        ))
+
+    succeeded = sum(1 for r in results if r.success)
+
+    return SweepData(
+        metadata=SweepMetadata(
+            ticker=market_params.ticker,
+            start_date=market_params.start_date,
+            end_date=market_params.end_date,
+            total_configs=len(configs),
+            succeeded=succeeded,
+            failed=len(configs) - succeeded,
+            rank_by=request.rank_by,
+            execution_time_ms=int((time.time() - start_time) * 1000)
+        ),
+        baseline=build_baseline(baseline_portfolio_data, baseline_metrics_data),
+        results=list(results),
+        best=best
+    )
@@ -0,0 +1,200 @@
+import asyncio
+import bisect
+import math
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..schemas.requests import WalkForwardRequest
+from ..schemas.responses import (
+    WalkForwardData, WalkForwardMetadata, WalkForwardStat, WalkForwardSummary,
+    WalkForwardWindowResult, ErrorDetail
+)
+from ..clients.base import ServiceError
+from ..clients.resilience import BACKTEST_TIMEOUT, deadline_scope
+from ..clients.registry import metrics_client
+from .assembly import build_comparison, build_metrics
+from .baseline import baseline_key
+from .pipeline import load_market_data, prepare_series, active_keys, run_active, run_baseline
+from .stage_cache import SeriesFingerprint, fingerprint, metrics_stage
+
+
+WALK_FORWARD_MAX_WINDOWS = int(os.environ.get("WALK_FORWARD_MAX_WINDOWS", "1000"))
+
+# Window metrics summarized across all successful windows
+SUMMARY_FIELDS = (
+    "total_return_pct", "annualized_return_pct", "max_drawdown_pct",
+    "volatility_annualized_pct", "sharpe_ratio"
+)
+
+
+def _invalid(message: str, details: Dict[str, Any] = None) -> ServiceError:
+    return ServiceError(code="INVALID_REQUEST", message=message, details=details)
+
+
+def window_bounds(total_bars: int, mode: str, window_bars: int, step_bars: int) -> List[Tuple[int, int]]:
+    """
+    [start, end) bar indexes of each window. Rolling windows keep
+    `window_bars` bars; anchored windows all start at bar 0 and grow by
+    `step_bars`. Windows end every `step_bars` bars, the last one no later
+    than the last bar.
+    """
+    bounds = []
+    for end in range(window_bars, total_bars + 1, step_bars):
+        bounds.append((0 if mode == "anchored" else end - window_bars, end))
+    return bounds
+
+
+def summarize_windows(results: List[WalkForwardWindowResult]) -> WalkForwardSummary:
+    """Distribution of the active metrics across successful windows."""
+    succeeded = [r for r in results if r.success and r.metrics is not None]
+    if not succeeded:
+        return WalkForwardSummary()
+
+    stats = {}
+    columns = {field: [getattr(r.metrics, field) for r in succeeded] for field in SUMMARY_FIELDS}
+    columns["excess_return_pct"] = [r.comparison.excess_return_pct for r in succeeded if r.comparison]
+    for field, values in columns.items():
+        values = [v for v in values if v is not None and not math.isnan(v)]
+        if not values:
+            continue
+        stats[field] = WalkForwardStat(
+            mean=round(statistics.fmean(values), 4),
+            median=round(statistics.median(values), 4),
+            std=round(statistics.pstdev(values), 4),
+            min=min(values),
+            max=max(values)
+        )
+
+    outperforming = [r for r in succeeded if r.comparison is not None]
+    return WalkForwardSummary(
+        positive_windows_pct=round(
+            100 * sum(1 for r in succeeded if r.metrics.total_return_pct > 0) / len(succeeded), 2
+        ),
+        outperforming_windows_pct=round(
+            100 * sum(1 for r in outperforming if r.comparison.excess_return_pct > 0) / len(outperforming), 2
+        ) if outperforming else None,
+        stats=stats
+    )
+
+
+async def measure_windows(
+    bounds: List[Tuple[int, int]],
+    active_portfolio_data: Dict[str, Any],
+    baseline_portfolio_data: Dict[str, Any],
+    active: str,
+    baseline: str
+) -> List[Dict[str, Any]]:
+    """
+    Active, baseline and comparison metrics of each window's [start, end)
+    slice of the full-range portfolios, in one metrics call memoized per
+    portfolio keys and windows.
+    """
+    async def calculate() -> List[Dict[str, Any]]:
+        return await metrics_client.calculate_windows(
+            {"active": active_portfolio_data, "baseline": baseline_portfolio_data}, bounds
+        )
+
+    return await metrics_stage.get_or_compute(fingerprint("windows", active, baseline, bounds), calculate)
+
+
+async def execute_walk_forward(
+    request: WalkForwardRequest,
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> WalkForwardData:
+    """
+    Evaluate one strategy over rolling or anchored windows of a single
+    market data load.
+
+    The full range is fetched once, and the strategy, active portfolio and
+    baseline are run once over all of it (through the stage memos, so a
+    backtest of the same range shares them). Each window is then measured
+    on its slice of the two portfolio series, all windows in one metrics
+    call; a window starts with the positions and cash built up before it,
+    the way it would in live trading. If the simulations or the metrics
+    call fail, every window reports the error inline instead of failing
+    the run. `on_progress(completed, total)` is called once the windows
+    are measured.
+    """
+    start_time = time.time()
+    market_params = request.market_params
+    strategy_params = request.strategy_params
+    window_bars = request.windows.window_bars
+    step_bars = request.windows.step_bars or window_bars
+
+    with deadline_scope(BACKTEST_TIMEOUT):
+        prices_data, dividends_data = await load_market_data(market_params, request.use_test_data)
+        price_data, dividend_data = prepare_series(market_params, prices_data, dividends_data)
+
+        bounds = window_bounds(len(price_data), request.windows.mode, window_bars, step_bars)
+        if not bounds:
+            raise ServiceError(
+                code="INSUFFICIENT_DATA",
+                message=f"Range has {len(price_data)} bars, fewer than one window of {window_bars}",
+                details={"ticker": market_params.ticker, "bars": len(price_data)}
+            )
+        if len(bounds) > WALK_FORWARD_MAX_WINDOWS:
+            raise _invalid(
+                f"Walk-forward has {len(bounds)} windows, limit is {WALK_FORWARD_MAX_WINDOWS}",
+                {"total_bars": len(price_data)}
+            )
+        if on_progress is not None:
+            on_progress(0, len(bounds))
+
+        series = SeriesFingerprint.of(price_data, dividend_data)
+        baseline = baseline_key(request.baseline_params, series)
+        keys = active_keys(strategy_params, request.portfolio_params, series)
+        error: Optional[ErrorDetail] = None
+        try:
+            (_, portfolio_data), baseline_portfolio_data = await asyncio.gather(
+                run_active(
+                    strategy_params, request.portfolio_params, price_data, dividend_data, keys=keys
+                ),
+                run_baseline(request.baseline_params, price_data, dividend_data, baseline)
+            )
+            window_metrics = await measure_windows(
+                bounds, portfolio_data, baseline_portfolio_data, keys[1], baseline
+            )
+        except ServiceError as e:
+            error = ErrorDetail(code=e.code, message=e.message, details=e.details)
+        except Exception as e:
+            error = ErrorDetail(code="INTERNAL_ERROR", message=str(e))
+
+    dates = [p["date"] for p in price_data]
+    trade_dates = [] if error else [t["date"] for t in portfolio_data.get("trades", [])]
+    results = []
+    for index, (start, end) in enumerate(bounds):
+        first, last = dates[start], dates[end - 1]
+        result = WalkForwardWindowResult(index=index, start_date=first, end_date=last, bars=end - start)
+        if error is not None:
+            result.success = False
+            result.error = error
+        else:
+            metrics_data = window_metrics[index]
+            trades = bisect.bisect_right(trade_dates, last) - bisect.bisect_left(trade_dates, first)
+            result.metrics = build_metrics(metrics_data.get("active", {}), trades)
+            result.baseline_metrics = build_metrics(metrics_data.get("baseline", {}))
+            result.comparison = build_comparison(metrics_data.get("comparison", {}))
+        results.append(result)
+    if on_progress is not None:
+        on_progress(len(bounds), len(bounds))
+    succeeded = sum(1 for r in results if r.success)
+
+    return WalkForwardData(
+        metadata=WalkForwardMetadata(
+            ticker=market_params.ticker,
+            start_date=market_params.start_date,
+            end_date=market_params.end_date,
+            mode=request.windows.mode,
+            window_bars=window_bars,
+            step_bars=step_bars,
+            total_bars=len(price_data),
+            total_windows=len(bounds),
+            succeeded=succeeded,
+            failed=len(bounds) - succeeded,
+            execution_time_ms=int((time.time() - start_time) * 1000)
+        ),
+        summary=summarize_windows(results),
+        windows=results
+    )
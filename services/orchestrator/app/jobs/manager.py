@@ -0,0 +1,322 @@
+import asyncio
+import itertools
+import math
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Set
+
+from pydantic import BaseModel
+
+from ..schemas.requests import BacktestRequest, SweepRequest, BatchRequest, WalkForwardRequest
+from ..schemas.responses import BatchTickerResult
+from ..clients.base import ServiceError
+from ..engine.stream import iter_backtest_events
+from ..engine.sweep import execute_sweep
+from ..engine.walk_forward import execute_walk_forward
+from ..engine.batch import batch_tickers, iter_batch
+from ..engine.output import shape_output
+from .store import JobStore
+
+
+JOBS_SQLITE_PATH = os.environ.get("JOBS_SQLITE_PATH", "jobs.db")
+JOBS_MAX_WORKERS = int(os.environ.get("JOBS_MAX_WORKERS", "4"))
+JOBS_MAX_QUEUED = int(os.environ.get("JOBS_MAX_QUEUED", "100"))
+JOBS_RESULT_TTL = float(os.environ.get("JOBS_RESULT_TTL", "86400"))
+JOBS_PURGE_INTERVAL = float(os.environ.get("JOBS_PURGE_INTERVAL", "60"))
+
+JOB_KINDS = {
+    "backtest": BacktestRequest,
+    "sweep": SweepRequest,
+    "batch": BatchRequest,
+    "walk_forward": WalkForwardRequest
+}
+BACKTEST_STAGES = ("market_data", "signals", "portfolios", "metrics")
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobManager:
+    """
+    Runs backtest, sweep, batch and walk-forward jobs on a bounded pool of workers.
+
+    Jobs wait in a priority queue (higher priority first, then FIFO) and
+    are recorded in a JobStore, so queued jobs and finished results
+    survive a restart; jobs that were running when the process stopped
+    are queued again. Once max_queued jobs are waiting, new submissions
+    are rejected with QUEUE_FULL instead of growing the backlog.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        max_workers: int = 4,
+        max_queued: int = 100,
+        result_ttl_seconds: float = 86400,
+        purge_interval_seconds: float = 60
+    ):
+        self.store = store
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.result_ttl_seconds = result_ttl_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._sequence = itertools.count()
+        self._queued: Set[str] = set()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._progress: Dict[str, Dict[str, Any]] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+        self._avg_duration: Optional[float] = None
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.purged = 0
+
+    async def start(self) -> None:
+        """Requeue unfinished jobs from the store and start the workers."""
+        self._stopping = False
+        self._queue = asyncio.PriorityQueue()
+
+        for job in await asyncio.to_thread(self.store.list_by_status, list(ACTIVE_STATUSES)):
+            if job["status"] == "running":
+                await asyncio.to_thread(self.store.update, job["id"], status="queued", started_at=None)
+            self._enqueue(job["id"], job["priority"])
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+        self._tasks.append(asyncio.create_task(self._purge_loop()))
+
+    async def stop(self) -> None:
+        """Stop the workers; running jobs stay recorded as running and are requeued on start."""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _enqueue(self, job_id: str, priority: int) -> None:
+        self._queued.add(job_id)
+        self._queue.put_nowait((-priority, next(self._sequence), job_id))
+
+    def retry_after_seconds(self) -> int:
+        """Rough wait until a queue slot frees up, from the average job duration."""
+        average = self._avg_duration or 1.0
+        return max(1, math.ceil(average * (len(self._queued) / self.max_workers)))
+
+    async def submit(self, kind: str, request: BaseModel, priority: int = 5) -> Dict[str, Any]:
+        """Record and enqueue a job; raises QUEUE_FULL when the queue is saturated."""
+        if len(self._queued) >= self.max_queued:
+            self.rejected += 1
+            raise ServiceError(
+                code="QUEUE_FULL",
+                message="Job queue is full, retry later",
+                details={
+                    "queued": len(self._queued),
+                    "max_queued": self.max_queued,
+                    "retry_after_seconds": self.retry_after_seconds()
+                }
+            )
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": "queued",
+            "priority": priority,
+            "request": request.model_dump(mode="json"),
+            "progress": None,
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "expires_at": None
+        }
+        await asyncio.to_thread(self.store.insert, job)
+        self._enqueue(job["id"], priority)
+        self.submitted += 1
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job record with live progress, or None if unknown or expired."""
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            return None
+        if job["expires_at"] is not None and job["expires_at"] <= time.time():
+            return None
+        if job_id in self._progress:
+            job["progress"] = self._progress[job_id]
+        return job
+
+    async def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued or running job; finished jobs are returned unchanged."""
+        job = await self.get(job_id)
+        if job is None:
+            return None
+
+        if job_id in self._queued:
+            self._queued.discard(job_id)
+            await self._finish(job_id, "cancelled")
+        elif job_id in self._running:
+            task = self._running[job_id]
+            task.cancel()
+            # The run records the cancellation before it finishes
+            await asyncio.wait([task])
+        return await self.get(job_id)
+
+    async def _finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[Dict[str, Any]] = None
+    ) -> None:
+        finished_at = time.time()
+        if status == "completed":
+            self.completed += 1
+        elif status == "failed":
+            self.failed += 1
+        else:
+            self.cancelled += 1
+        await asyncio.to_thread(
+            self.store.update,
+            job_id,
+            status=status,
+            progress=self._progress.pop(job_id, None),
+            result=result,
+            error=error,
+            finished_at=finished_at,
+            expires_at=finished_at + self.result_ttl_seconds
+        )
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job_id = await self._queue.get()
+            if job_id not in self._queued:
+                # Cancelled while waiting
+                continue
+            self._queued.discard(job_id)
+
+            task = asyncio.ensure_future(self._run(job_id))
+            self._running[job_id] = task
+            try:
+                await task
+            finally:
+                self._running.pop(job_id, None)
+
+    async def _run(self, job_id: str) -> None:
+        started_at = time.time()
+        try:
+            job = await asyncio.to_thread(self.store.get, job_id)
+            if job is None or job["status"] != "queued":
+                return
+            await asyncio.to_thread(self.store.update, job_id, status="running", started_at=started_at)
+            result = await self._execute(job)
+        except asyncio.CancelledError:
+            if self._stopping:
+                raise
+            await self._finish(job_id, "cancelled")
+        except ServiceError as e:
+            await self._finish(job_id, "failed", error={
+                "code": e.code, "message": e.message, "details": e.details or {}
+            })
+        except Exception as e:
+            await self._finish(job_id, "failed", error={
+                "code": "INTERNAL_ERROR",
+                "message": f"An unexpected error occurred: {str(e)}",
+                "details": {}
+            })
+        else:
+            await self._finish(job_id, "completed", result=result)
+
+        duration = time.time() - started_at
+        self._avg_duration = duration if self._avg_duration is None else (
+            0.8 * self._avg_duration + 0.2 * duration
+        )
+
+    def _set_progress(self, job_id: str, completed: int, total: int, stage: Optional[str] = None) -> None:
+        self._progress[job_id] = {"stage": stage, "completed": completed, "total": total}
+
+    async def _execute(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the job's workload and return its JSON-compatible result."""
+        request = JOB_KINDS[job["kind"]].model_validate(job["request"])
+        if job["kind"] == "sweep":
+            return await self._execute_sweep(job["id"], request)
+        if job["kind"] == "batch":
+            return await self._execute_batch(job["id"], request)
+        if job["kind"] == "walk_forward":
+            return await self._execute_walk_forward(job["id"], request)
+        return await self._execute_backtest(job["id"], request)
+
+    async def _execute_backtest(self, job_id: str, request: BacktestRequest) -> Dict[str, Any]:
+        total = len(BACKTEST_STAGES)
+        self._set_progress(job_id, 0, total)
+        async for event in iter_backtest_events(request):
+            if event.type == "stage":
+                self._set_progress(job_id, BACKTEST_STAGES.index(event.stage) + 1, total, event.stage)
+            elif event.type == "error":
+                raise ServiceError(event.error.code, event.error.message, event.error.details)
+            else:
+                self._set_progress(job_id, total, total)
+                return shape_output(event.response.model_dump(mode="json")["data"], request.output)
+        raise ServiceError("INTERNAL_ERROR", "Backtest stream ended without a result")
+
+    async def _execute_sweep(self, job_id: str, request: SweepRequest) -> Dict[str, Any]:
+        data = await execute_sweep(
+            request,
+            on_progress=lambda completed, total: self._set_progress(job_id, completed, total)
+        )
+        return data.model_dump(mode="json")
+
+    async def _execute_walk_forward(self, job_id: str, request: WalkForwardRequest) -> Dict[str, Any]:
+        data = await execute_walk_forward(
+            request,
+            on_progress=lambda completed, total: self._set_progress(job_id, completed, total)
+        )
+        return data.model_dump(mode="json")
+
+    async def _execute_batch(self, job_id: str, request: BatchRequest) -> Dict[str, Any]:
+        tickers = batch_tickers(request)
+        results: List[Dict[str, Any]] = []
+        summary: Dict[str, Any] = {}
+        self._set_progress(job_id, 0, len(tickers))
+        async for item in iter_batch(request, tickers):
+            if isinstance(item, BatchTickerResult):
+                results.append(item.model_dump(mode="json", exclude={"type"}))
+                self._set_progress(job_id, len(results), len(tickers))
+            else:
+                summary = item.model_dump(mode="json", exclude={"type"})
+        return {"results": results, "summary": summary}
+
+    async def _purge_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.purge_interval_seconds)
+            try:
+                self.purged += await asyncio.to_thread(self.store.purge_expired)
+            except Exception:
+                # Retention is best-effort; try again on the next tick
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "max_queued": self.max_queued,
+            "queued": len(self._queued),
+            "running": len(self._running),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "purged": self.purged,
+            "avg_duration_ms": int(self._avg_duration * 1000) if self._avg_duration is not None else None
+        }
+
+
+job_manager = JobManager(
+    store=JobStore(JOBS_SQLITE_PATH),
+    max_workers=JOBS_MAX_WORKERS,
+    max_queued=JOBS_MAX_QUEUED,
+    result_ttl_seconds=JOBS_RESULT_TTL,
+    purge_interval_seconds=JOBS_PURGE_INTERVAL
+)
@@ -0,0 +1,124 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+# Columns holding JSON documents
+_JSON_COLUMNS = ("request", "progress", "result", "error")
+
+
+class JobStore:
+    """
+    SQLite-backed job records so queued and finished jobs survive a restart.
+
+    Methods are blocking; call them from a worker thread. Each call opens
+    its own connection so the store can be used from any thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS jobs ("
+                    " id TEXT PRIMARY KEY,"
+                    " kind TEXT NOT NULL,"
+                    " status TEXT NOT NULL,"
+                    " priority INTEGER NOT NULL,"
+                    " request TEXT NOT NULL,"
+                    " progress TEXT,"
+                    " result TEXT,"
+                    " error TEXT,"
+                    " created_at REAL NOT NULL,"
+                    " started_at REAL,"
+                    " finished_at REAL,"
+                    " expires_at REAL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+                conn.commit()
+                self._initialized = True
+        return conn
+
+    @staticmethod
+    def _encode(fields: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            key: json.dumps(value, separators=(",", ":")) if key in _JSON_COLUMNS and value is not None else value
+            for key, value in fields.items()
+        }
+
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        for column in _JSON_COLUMNS:
+            if job[column] is not None:
+                job[column] = json.loads(job[column])
+        return job
+
+    def insert(self, job: Dict[str, Any]) -> None:
+        """Insert a new job record."""
+        values = self._encode(job)
+        columns = ", ".join(values)
+        placeholders = ", ".join("?" for _ in values)
+        conn = self._connect()
+        try:
+            conn.execute(f"INSERT INTO jobs ({columns}) VALUES ({placeholders})", tuple(values.values()))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """Update some fields of a job record."""
+        values = self._encode(fields)
+        assignments = ", ".join(f"{key} = ?" for key in values)
+        conn = self._connect()
+        try:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*values.values(), job_id))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the decoded job record, or None if unknown."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return self._decode(row) if row is not None else None
+
+    def list_by_status(self, statuses: List[str]) -> List[Dict[str, Any]]:
+        """Return jobs in any of the given statuses, oldest first, without results."""
+        placeholders = ", ".join("?" for _ in statuses)
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT id, kind, status, priority, request, progress, NULL AS result, error,"
+                f" created_at, started_at, finished_at, expires_at"
+                f" FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at",
+                tuple(statuses)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._decode(row) for row in rows]
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Delete finished jobs past their retention; returns the number removed."""
+        conn = self._connect()
+        try:
+            removed = conn.execute(
+                "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (now if now is not None else time.time(),)
+            ).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        return max(removed, 0)
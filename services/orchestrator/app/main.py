@@ -1,12 +1,34 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from .clients.registry import start_clients, close_clients
+from .jobs.manager import job_manager
 from .routes.backtest import router as backtest_router
+from .routes.jobs import router as jobs_router
+from .routes.stats import router as stats_router
+from .telemetry.prometheus import registry
+from .clients.resilience import DeadlineMiddleware
+from .telemetry.timings import ServerTimingMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open downstream connection pools and start job workers; stop both on shutdown."""
+    await start_clients()
+    await job_manager.start()
+    yield
+    await job_manager.stop()
+    await close_clients()
+
 
 app = FastAPI(
     title="Orchestrator Service",
     description="Main entry point for the backtesting platform",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -15,12 +37,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Cache"],
 )
+app.add_middleware(DeadlineMiddleware)
+app.add_middleware(ServerTimingMiddleware)
 
 app.include_router(backtest_router, prefix="/api")
+app.include_router(jobs_router, prefix="/api")
+app.include_router(stats_router, prefix="/api")
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint for Docker."""
     return {"status": "healthy", "service": "orchestrator"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Latency histograms and transfer counters in Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
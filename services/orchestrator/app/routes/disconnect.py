@@ -0,0 +1,59 @@
+import asyncio
+from typing import Any, Awaitable, Dict, TypeVar
+
+from fastapi import Request
+
+from ..telemetry.prometheus import client_disconnects
+
+
+T = TypeVar("T")
+
+# Requests abandoned by their client, per route
+disconnects: Dict[str, int] = {}
+
+
+class ClientDisconnected(Exception):
+    """The client went away before the response was ready."""
+    pass
+
+
+async def _disconnected(request: Request) -> None:
+    # The body has been read by the time the endpoint runs, so the next
+    # message is http.disconnect (once the client is gone)
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def cancel_on_disconnect(request: Request, work: Awaitable[T], route: str) -> T:
+    """
+    Await `work`, cancelling it as soon as the client disconnects.
+
+    Cancellation reaches every downstream call in flight: their
+    connections are closed, which the services notice and stop computing
+    (work shared with other requests keeps running, see SingleFlight).
+    Raises ClientDisconnected instead of returning in that case.
+    """
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_disconnected(request))
+    try:
+        await asyncio.wait((task, watcher), return_when=asyncio.FIRST_COMPLETED)
+        if task.done():
+            return task.result()
+        task.cancel()
+        # Nobody will read what it ends with; keep asyncio from reporting it
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        record_disconnect(route)
+        raise ClientDisconnected()
+    finally:
+        for pending in (task, watcher):
+            if not pending.done():
+                pending.cancel()
+
+
+def record_disconnect(route: str) -> None:
+    disconnects[route] = disconnects.get(route, 0) + 1
+    client_disconnects.inc(route=route)
+
+
+def disconnect_stats() -> Dict[str, Any]:
+    return {"by_route": dict(disconnects), "total": sum(disconnects.values())}
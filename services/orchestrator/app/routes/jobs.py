@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+
+from ..schemas.requests import BacktestRequest, JobRequest
+from ..schemas.responses import JobInfo, JobResponse
+from ..clients.base import ServiceError
+from ..engine.output import validate_output
+from ..jobs.manager import JOB_KINDS, job_manager
+from .backtest import build_error_response
+
+
+router = APIRouter()
+
+
+def _timestamp(value: Optional[float]) -> Optional[str]:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, tz=timezone.utc).isoformat()
+
+
+def build_job_info(job: Dict[str, Any]) -> JobInfo:
+    """Convert a stored job record to its API representation."""
+    return JobInfo(
+        id=job["id"],
+        kind=job["kind"],
+        status=job["status"],
+        priority=job["priority"],
+        progress=job["progress"],
+        created_at=_timestamp(job["created_at"]),
+        started_at=_timestamp(job["started_at"]),
+        finished_at=_timestamp(job["finished_at"]),
+        expires_at=_timestamp(job["expires_at"]),
+        result=job["result"],
+        error=job["error"]
+    )
+
+
+def job_not_found(job_id: str) -> JSONResponse:
+    return build_error_response(
+        "JOB_NOT_FOUND", f"Job '{job_id}' not found or expired", {"job_id": job_id}
+    )
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    """Queue a backtest, sweep or batch request and return its job id."""
+    try:
+        payload = JOB_KINDS[request.kind].model_validate(request.request)
+    except ValidationError as e:
+        return build_error_response(
+            "INVALID_REQUEST",
+            f"Invalid {request.kind} request",
+            {"errors": e.errors(include_url=False, include_context=False)}
+        )
+
+    try:
+        if isinstance(payload, BacktestRequest):
+            validate_output(payload.output)
+        job = await job_manager.submit(request.kind, payload, request.priority)
+    except ServiceError as e:
+        return build_error_response(e.code, e.message, e.details)
+
+    return JSONResponse(
+        status_code=202,
+        content=JobResponse(data=build_job_info(job)).model_dump(mode="json"),
+        headers={"Location": f"/api/jobs/{job['id']}"}
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status, progress and (once finished) result or error of a job."""
+    job = await job_manager.get(job_id)
+    if job is None:
+        return job_not_found(job_id)
+    return JobResponse(data=build_job_info(job))
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    job = await job_manager.cancel(job_id)
+    if job is None:
+        return job_not_found(job_id)
+    return JobResponse(data=build_job_info(job))
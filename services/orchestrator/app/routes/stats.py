@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+
+from ..clients.registry import pool_stats
+from ..cache.result_cache import backtest_cache
+from ..engine.pipeline import backtest_flight, market_data_flight
+from ..engine.baseline import baseline_stats
+from ..engine.stage_cache import stage_stats
+from ..engine.admission import admission
+from ..jobs.manager import job_manager
+from .disconnect import disconnect_stats
+
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def get_stats():
+    """Runtime statistics for the orchestrator and its downstream clients."""
+    return {
+        "pools": pool_stats(),
+        "result_cache": backtest_cache.stats(),
+        "coalescing": {
+            "backtest": backtest_flight.stats(),
+            "market_data": market_data_flight.stats()
+        },
+        "stages": {**stage_stats(), **baseline_stats()},
+        "jobs": job_manager.stats(),
+        "admission": admission.stats(),
+        "disconnects": disconnect_stats()
+    }
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 
 class MarketParams(BaseModel):
@@ -37,6 +37,22 @@ class BaselineParams(BaseModel):
     reinvest_dividends: bool = Field(default=True, description="Whether to reinvest dividends")
 
 
+class OutputOptions(BaseModel):
+    format: str = Field(
+        default="rows",
+        pattern="^(rows|columnar)$",
+        description="rows: one object per bar/signal/trade; columnar: parallel arrays per field"
+    )
+    include: Optional[List[str]] = Field(
+        default=None,
+        description="Dotted paths to keep, e.g. active_strategy.metrics (metadata is always kept)"
+    )
+    exclude: Optional[List[str]] = Field(
+        default=None,
+        description="Dotted paths to drop, e.g. market_data or active_strategy.signals.trigger_details"
+    )
+
+
 class BacktestRequest(BaseModel):
     market_params: MarketParams
     strategy_params: StrategyParams
@@ -46,3 +62,100 @@ class BacktestRequest(BaseModel):
         default=False,
         description="Use test data fetcher instead of live market data"
     )
+    cache_control: Optional[str] = Field(
+        default=None,
+        pattern="^(no-cache|no-store)$",
+        description="Bypass the result cache: no-cache skips the lookup, no-store also skips storing"
+    )
+    output: OutputOptions = Field(
+        default_factory=OutputOptions,
+        description="Response layout and field projection; does not affect the computation"
+    )
+
+
+class SweepConfig(BaseModel):
+    strategy_params: StrategyParams
+    portfolio_params: PortfolioParams
+
+
+class SweepRequest(BaseModel):
+    market_params: MarketParams
+    baseline_params: BaselineParams
+    strategy_params: Optional[StrategyParams] = Field(
+        default=None, description="Base strategy params that grid values are applied to"
+    )
+    portfolio_params: Optional[PortfolioParams] = Field(
+        default=None, description="Base portfolio params that grid values are applied to"
+    )
+    grid: Dict[str, List[Any]] = Field(
+        default_factory=dict,
+        description="Dotted field path (e.g. strategy_params.config.price_change_threshold) "
+                    "-> values; expanded as a cartesian product over the base params"
+    )
+    configs: List[SweepConfig] = Field(
+        default_factory=list, description="Explicit list of configs, run in addition to the grid"
+    )
+    rank_by: str = Field(default="total_return_pct", description="Active metric used to pick the best configs")
+    rank_order: str = Field(default="desc", pattern="^(asc|desc)$", description="Sort order for rank_by")
+    top_n: int = Field(default=3, ge=0, le=50, description="Number of best configs returned with full detail")
+    max_concurrency: int = Field(default=8, ge=1, le=64, description="Configs evaluated in parallel")
+    use_test_data: bool = Field(
+        default=False,
+        description="Use test data fetcher instead of live market data"
+    )
+
+
+class WalkForwardWindows(BaseModel):
+    mode: str = Field(
+        default="rolling", pattern="^(rolling|anchored)$",
+        description="rolling: windows of a fixed length; anchored: every window starts at the first bar"
+    )
+    window_bars: int = Field(..., ge=2, description="Bars per window (the first window's length when anchored)")
+    step_bars: Optional[int] = Field(
+        default=None, ge=1, description="Bars between consecutive window ends (defaults to window_bars)"
+    )
+
+
+class WalkForwardRequest(BaseModel):
+    market_params: MarketParams
+    strategy_params: StrategyParams
+    portfolio_params: PortfolioParams
+    baseline_params: BaselineParams
+    windows: WalkForwardWindows
+    use_test_data: bool = Field(
+        default=False,
+        description="Use test data fetcher instead of live market data"
+    )
+
+
+class BatchRequest(BaseModel):
+    tickers: List[str] = Field(..., min_length=1, description="Ticker symbols to backtest")
+    market_type: str = Field(..., description="Type of security (Stock, ETF)")
+    start_date: str = Field(..., description="Backtest start date (YYYY-MM-DD)")
+    end_date: str = Field(..., description="Backtest end date (YYYY-MM-DD)")
+    frequency: str = Field(default="daily", description="Data frequency")
+    strategy_params: StrategyParams
+    portfolio_params: PortfolioParams
+    baseline_params: BaselineParams
+    max_concurrency: Optional[int] = Field(
+        default=None, ge=1, le=128, description="Tickers processed in parallel (defaults to BATCH_MAX_CONCURRENCY)"
+    )
+    include_details: bool = Field(
+        default=False, description="Include the full backtest payload for each ticker"
+    )
+    use_test_data: bool = Field(
+        default=False,
+        description="Use test data fetcher instead of live market data"
+    )
+
+
+class JobRequest(BaseModel):
+    kind: str = Field(
+        ..., pattern="^(backtest|sweep|batch|walk_forward)$",
+        description="Workload type: backtest, sweep, batch or walk_forward"
+    )
+    request: Dict[str, Any] = Field(
+        ..., description="Body of the matching /api/backtest, /api/backtest/sweep, /api/backtest/batch "
+                         "or /api/backtest/walk-forward request"
+    )
+    priority: int = Field(default=5, ge=0, le=9, description="Higher priorities run first")
@@ -2,12 +2,32 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Any, Dict
 
 
+class DownstreamCall(BaseModel):
+    service: str
+    method: str
+    path: str
+    status: Optional[int] = None
+    duration_ms: float
+    server_ms: Optional[float] = None
+    encode_ms: float
+    decode_ms: float
+    request_bytes: int
+    response_bytes: int
+
+
+class BacktestTimings(BaseModel):
+    stages: Dict[str, float]
+    calls: List[DownstreamCall]
+
+
 class BacktestMetadata(BaseModel):
     ticker: str
     start_date: str
     end_date: str
     strategy_type: str
     execution_time_ms: Optional[int] = None
+    timings: Optional[BacktestTimings] = None
+    cache: Optional[str] = None
 
 
 class Signal(BaseModel):
@@ -129,3 +149,160 @@ class ErrorDetail(BaseModel):
 class ErrorResponse(BaseModel):
     success: bool = False
     error: ErrorDetail
+
+
+class SweepResult(BaseModel):
+    index: int
+    strategy_params: Dict[str, Any]
+    portfolio_params: Dict[str, Any]
+    success: bool = True
+    metrics: Optional[Metrics] = None
+    comparison: Optional[Comparison] = None
+    error: Optional[ErrorDetail] = None
+
+
+class SweepDetail(BaseModel):
+    index: int
+    active_strategy: ActiveStrategy
+    comparison: Comparison
+
+
+class SweepMetadata(BaseModel):
+    ticker: str
+    start_date: str
+    end_date: str
+    total_configs: int
+    succeeded: int
+    failed: int
+    rank_by: str
+    execution_time_ms: Optional[int] = None
+
+
+class SweepData(BaseModel):
+    metadata: SweepMetadata
+    baseline: Baseline
+    results: List[SweepResult]
+    best: List[SweepDetail]
+
+
+class SweepResponse(BaseModel):
+    success: bool = True
+    data: SweepData
+
+
+class WalkForwardWindowResult(BaseModel):
+    index: int
+    start_date: str
+    end_date: str
+    bars: int
+    success: bool = True
+    metrics: Optional[Metrics] = None
+    baseline_metrics: Optional[Metrics] = None
+    comparison: Optional[Comparison] = None
+    error: Optional[ErrorDetail] = None
+
+
+class WalkForwardStat(BaseModel):
+    mean: float
+    median: float
+    std: float
+    min: float
+    max: float
+
+
+class WalkForwardSummary(BaseModel):
+    positive_windows_pct: Optional[float] = None
+    outperforming_windows_pct: Optional[float] = None
+    stats: Dict[str, WalkForwardStat] = {}
+
+
+class WalkForwardMetadata(BaseModel):
+    ticker: str
+    start_date: str
+    end_date: str
+    mode: str
+    window_bars: int
+    step_bars: int
+    total_bars: int
+    total_windows: int
+    succeeded: int
+    failed: int
+    execution_time_ms: Optional[int] = None
+
+
+class WalkForwardData(BaseModel):
+    metadata: WalkForwardMetadata
+    summary: WalkForwardSummary
+    windows: List[WalkForwardWindowResult]
+
+
+class WalkForwardResponse(BaseModel):
+    success: bool = True
+    data: WalkForwardData
+
+
+class BatchTickerResult(BaseModel):
+    type: str = "result"
+    ticker: str
+    success: bool = True
+    metrics: Optional[Metrics] = None
+    baseline_metrics: Optional[Metrics] = None
+    comparison: Optional[Comparison] = None
+    data: Optional[BacktestData] = None
+    error: Optional[ErrorDetail] = None
+    execution_time_ms: Optional[int] = None
+
+
+class BatchSummary(BaseModel):
+    type: str = "summary"
+    total: int
+    succeeded: int
+    failed: int
+    execution_time_ms: int
+
+
+class BacktestStageEvent(BaseModel):
+    type: str = "stage"
+    stage: str
+    duration_ms: int
+    elapsed_ms: int
+    data: Dict[str, Any]
+
+
+class BacktestCompleteEvent(BaseModel):
+    type: str = "complete"
+    cache: str
+    timings: Dict[str, int]
+    elapsed_ms: int
+    response: BacktestResponse
+
+
+class BacktestErrorEvent(BaseModel):
+    type: str = "error"
+    elapsed_ms: int
+    error: ErrorDetail
+
+
+class JobProgress(BaseModel):
+    stage: Optional[str] = None
+    completed: int
+    total: int
+
+
+class JobInfo(BaseModel):
+    id: str
+    kind: str
+    status: str
+    priority: int
+    progress: Optional[JobProgress] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    expires_at: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[ErrorDetail] = None
+
+
+class JobResponse(BaseModel):
+    success: bool = True
+    data: JobInfo
@@ -0,0 +1,216 @@
+import bisect
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+
+# Seconds; covers sub-millisecond in-process calls up to long sweeps
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with labels, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """Labelled value that can go up and down, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered in Prometheus text format."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts incl. +Inf, sum, count)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._series.get(key) or ([0] * (len(self.buckets) + 1), 0.0, 0)
+            counts[index] += 1
+            self._series[key] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="{}"'.format(_format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "orchestrator_http_request_duration_seconds",
+    "Time to handle an orchestrator API request, until the response starts.",
+    ("method", "route", "status")
+))
+stage_duration = registry.register(Histogram(
+    "orchestrator_stage_duration_seconds",
+    "Time spent in each backtest stage (market_data, signals, portfolios, metrics, assembly, serialize).",
+    ("stage",)
+))
+downstream_duration = registry.register(Histogram(
+    "orchestrator_downstream_duration_seconds",
+    "Wall time of downstream service calls as seen by the orchestrator.",
+    ("service", "path")
+))
+downstream_server_duration = registry.register(Histogram(
+    "orchestrator_downstream_server_duration_seconds",
+    "Handler time reported by the downstream service in its Server-Timing header.",
+    ("service", "path")
+))
+downstream_serialization = registry.register(Histogram(
+    "orchestrator_downstream_serialization_seconds",
+    "Time spent encoding downstream request bodies and decoding their responses.",
+    ("service", "direction")
+))
+downstream_bytes = registry.register(Counter(
+    "orchestrator_downstream_bytes_total",
+    "Bytes sent to and received from downstream services.",
+    ("service", "direction")
+))
+downstream_hedges = registry.register(Counter(
+    "orchestrator_downstream_hedges_total",
+    "Hedged (duplicate) downstream requests sent, and how many of them answered first.",
+    ("service", "outcome")
+))
+downstream_rejected = registry.register(Counter(
+    "orchestrator_downstream_rejected_total",
+    "Downstream calls not sent because the circuit was open or the deadline had passed.",
+    ("service", "reason")
+))
+replica_ejections = registry.register(Counter(
+    "orchestrator_downstream_replica_ejections_total",
+    "Times a downstream replica was taken out of rotation after consecutive failures.",
+    ("service", "replica")
+))
+downstream_cancelled = registry.register(Counter(
+    "orchestrator_downstream_cancelled_total",
+    "Downstream calls cancelled in flight (client disconnected, sibling call failed, hedge lost).",
+    ("service",)
+))
+downstream_cancelled_seconds = registry.register(Counter(
+    "orchestrator_downstream_cancelled_seconds_total",
+    "Time downstream calls had been running when they were cancelled.",
+    ("service",)
+))
+client_disconnects = registry.register(Counter(
+    "orchestrator_client_disconnects_total",
+    "Requests whose client disconnected before the response; their work was cancelled.",
+    ("route",)
+))
+circuit_transitions = registry.register(Counter(
+    "orchestrator_circuit_transitions_total",
+    "Circuit breaker state changes per downstream service.",
+    ("service", "state")
+))
+admission_queue_depth = registry.register(Gauge(
+    "orchestrator_admission_queue_depth",
+    "Requests waiting for an admission slot, by priority class.",
+    ("priority",)
+))
+admission_running = registry.register(Gauge(
+    "orchestrator_admission_running",
+    "Admitted requests currently running, by priority class.",
+    ("priority",)
+))
+admission_wait = registry.register(Histogram(
+    "orchestrator_admission_wait_seconds",
+    "Time requests waited for an admission slot, by priority class.",
+    ("priority",)
+))
+admission_rejected = registry.register(Counter(
+    "orchestrator_admission_rejected_total",
+    "Requests turned away by admission control (queue_full, client_limit, timeout).",
+    ("reason",)
+))
@@ -0,0 +1,250 @@
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from .prometheus import (
+    http_request_duration, stage_duration, downstream_duration,
+    downstream_server_duration, downstream_serialization, downstream_bytes
+)
+
+
+class Timings:
+    """
+    Stage durations and downstream calls recorded while serving a request.
+
+    Collectors nest: everything recorded in a child (e.g. one backtest of a
+    batch) is also recorded in its parent (the HTTP request).
+    """
+
+    def __init__(self, parent: Optional["Timings"] = None):
+        self.parent = parent
+        self.stages: Dict[str, float] = {}
+        self.calls: List[Dict[str, Any]] = []
+        self.descriptions: Dict[str, str] = {}
+
+    def add_stage(self, stage: str, duration_ms: float) -> None:
+        node = self
+        while node is not None:
+            node.stages[stage] = node.stages.get(stage, 0.0) + duration_ms
+            node = node.parent
+
+    def describe_stage(self, stage: str, description: str) -> None:
+        node = self
+        while node is not None:
+            node.descriptions[stage] = description
+            node = node.parent
+
+    def add_call(self, call: Dict[str, Any]) -> None:
+        node = self
+        while node is not None:
+            node.calls.append(call)
+            node = node.parent
+
+    def report(self) -> Dict[str, Any]:
+        """Stage and call timings for response metadata (milliseconds)."""
+        return {
+            "stages": {stage: round(ms, 1) for stage, ms in self.stages.items()},
+            "calls": list(self.calls)
+        }
+
+    def server_timing(self, total_ms: float) -> str:
+        """
+        Server-Timing header value: one entry per stage, then per downstream
+        service its summed call time (`<service>-call`) and the handler time
+        it reported (`<service>-app`), so network overhead is the difference.
+        A described stage carries its description (e.g. `cache;desc="HIT"`).
+        """
+        entries = [
+            f'{stage};dur={ms:.1f};desc="{self.descriptions[stage]}"' if stage in self.descriptions
+            else f"{stage};dur={ms:.1f}"
+            for stage, ms in self.stages.items()
+        ]
+
+        services: Dict[str, List[float]] = {}
+        for call in self.calls:
+            totals = services.setdefault(call["service"], [0.0, 0.0, 0])
+            totals[0] += call["duration_ms"]
+            totals[1] += call["server_ms"] or 0.0
+            totals[2] += 1
+        for service, (call_ms, server_ms, count) in services.items():
+            entries.append(f'{service}-call;dur={call_ms:.1f};desc="{count} calls"')
+            if server_ms:
+                entries.append(f"{service}-app;dur={server_ms:.1f}")
+
+        entries.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(entries)
+
+
+_current: ContextVar[Optional[Timings]] = ContextVar("timings", default=None)
+
+
+def current_timings() -> Optional[Timings]:
+    return _current.get()
+
+
+@contextmanager
+def collect_timings() -> Iterator[Timings]:
+    """Record timings of the enclosed work (and tasks it spawns) in a nested collector."""
+    timings = Timings(parent=_current.get())
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def detached_timings(timings: Timings) -> Iterator[Timings]:
+    """
+    Record the enclosed work in `timings` alone, not in the caller's
+    collectors; merge_timings later adds it to whichever requests waited
+    on it (see SingleFlight).
+    """
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def merge_timings(timings: Timings) -> None:
+    """Add the stages and calls recorded in `timings` to the current collector."""
+    current = _current.get()
+    if current is None:
+        return
+    for stage, duration_ms in timings.stages.items():
+        current.add_stage(stage, duration_ms)
+    for call in timings.calls:
+        current.add_call(call)
+
+
+def record_stage(stage: str, duration_ms: float) -> None:
+    stage_duration.observe(duration_ms / 1000, stage=stage)
+    timings = _current.get()
+    if timings is not None:
+        timings.add_stage(stage, duration_ms)
+
+
+def describe_stage(stage: str, description: str) -> None:
+    """Annotate a stage of the current request, e.g. the cache status of its lookup."""
+    timings = _current.get()
+    if timings is not None:
+        timings.describe_stage(stage, description)
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, (time.perf_counter() - start) * 1000)
+
+
+def record_call(
+    service: str,
+    method: str,
+    path: str,
+    status: Optional[int],
+    duration_ms: float,
+    server_ms: Optional[float] = None,
+    encode_ms: float = 0.0,
+    decode_ms: float = 0.0,
+    request_bytes: int = 0,
+    response_bytes: int = 0
+) -> None:
+    """Record one downstream call in the histograms and the current collector."""
+    downstream_duration.observe(duration_ms / 1000, service=service, path=path)
+    if server_ms is not None:
+        downstream_server_duration.observe(server_ms / 1000, service=service, path=path)
+    downstream_serialization.observe(encode_ms / 1000, service=service, direction="encode")
+    downstream_serialization.observe(decode_ms / 1000, service=service, direction="decode")
+    downstream_bytes.inc(request_bytes, service=service, direction="sent")
+    downstream_bytes.inc(response_bytes, service=service, direction="received")
+
+    timings = _current.get()
+    if timings is not None:
+        timings.add_call({
+            "service": service,
+            "method": method,
+            "path": path,
+            "status": status,
+            "duration_ms": round(duration_ms, 1),
+            "server_ms": round(server_ms, 1) if server_ms is not None else None,
+            "encode_ms": round(encode_ms, 2),
+            "decode_ms": round(decode_ms, 2),
+            "request_bytes": request_bytes,
+            "response_bytes": response_bytes
+        })
+
+
+def parse_server_timing(header: Optional[str], metric: str = "app") -> Optional[float]:
+    """Duration (ms) of `metric` in a Server-Timing header, if present."""
+    if not header:
+        return None
+    for entry in header.split(","):
+        parts = [part.strip() for part in entry.split(";")]
+        if parts[0] != metric:
+            continue
+        for param in parts[1:]:
+            if param.startswith("dur="):
+                try:
+                    return float(param[4:])
+                except ValueError:
+                    return None
+    return None
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Matched route template (e.g. /api/jobs/{job_id}), or "unmatched"."""
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    # Routes of an included router may only know their router-relative path;
+    # recover the static prefix from where the template matched
+    regex = getattr(route, "path_regex", None)
+    if regex is not None:
+        match = re.search(regex.pattern.lstrip("^"), scope["path"])
+        if match is not None:
+            return scope["path"][:match.start()] + template
+    return template
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that collects timings for each HTTP request, adds them
+    as a Server-Timing response header and feeds the request histogram.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        with collect_timings() as timings:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    elapsed = time.perf_counter() - start
+                    header = timings.server_timing(elapsed * 1000)
+                    message = {
+                        **message,
+                        "headers": list(message.get("headers", [])) + [(b"server-timing", header.encode())]
+                    }
+                    # Label by route template to keep cardinality bounded
+                    http_request_duration.observe(
+                        elapsed,
+                        method=scope["method"],
+                        route=route_template(scope),
+                        status=str(message["status"])
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
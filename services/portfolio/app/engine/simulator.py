@@ -1,5 +1,6 @@
 from typing import Dict, List
 from ..schemas.models import SimulateRequest
+from ..cancellation import CHECK_EVERY, checkpoint
 
 def run_simulation(req: SimulateRequest) -> Dict:
     """
@@ -40,7 +41,9 @@ def run_simulation(req: SimulateRequest) -> Dict:
     trades: List[Dict] = []
 
     # Precompute daily cash interest factor if provided (we compute per day inside loop to allow zero)
-    for day in req.price_data:
+    for index, day in enumerate(req.price_data):
+        if index % CHECK_EVERY == 0:
+            checkpoint()  # stop early if the caller has gone away
         date = day.date
         price = float(day.adjusted_close)
 
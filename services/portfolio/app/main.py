@@ -1,6 +1,10 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from .routes.simulate import router as simulate_router  # <--- add this import
+from .deadline import DeadlineMiddleware
+from .cancellation import CancellationMiddleware, cancellation_stats
 
 
 app = FastAPI(
@@ -17,6 +21,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Add `Server-Timing: app;dur=<ms>` with the time spent handling the request."""
+    start = time.perf_counter()
+    response = await call_next(request)
+    response.headers["Server-Timing"] = f"app;dur={(time.perf_counter() - start) * 1000:.1f}"
+    return response
+
+
+app.add_middleware(CancellationMiddleware)
+app.add_middleware(DeadlineMiddleware)
+
 # mount the simulate router
 app.include_router(simulate_router, prefix="", tags=["simulate"])
 
@@ -25,3 +42,9 @@ app.include_router(simulate_router, prefix="", tags=["simulate"])
 async def health_check():
     """Health check endpoint for Docker."""
     return {"status": "healthy", "service": "portfolio"}
+
+
+@app.get("/stats")
+async def stats():
+    """Simulations cancelled because their caller disconnected or ran out of time."""
+    return {"cancellation": cancellation_stats()}
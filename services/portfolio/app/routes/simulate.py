@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException
 from ..schemas.models import SimulateRequest, SimulateResponse
 from ..engine.simulator import run_simulation
+from ..serialization import NegotiatedRoute
+from ..cancellation import run_cancellable
 
-router = APIRouter()
+router = APIRouter(route_class=NegotiatedRoute)
 
 @router.post("/simulate", response_model=SimulateResponse)
 async def simulate_endpoint(payload: SimulateRequest):
@@ -19,7 +21,7 @@ async def simulate_endpoint(payload: SimulateRequest):
         })
 
     try:
-        result = run_simulation(payload)  # payload is a Pydantic model
+        result = await run_cancellable(run_simulation, payload)  # payload is a Pydantic model
     except ValueError as e:
         raise HTTPException(status_code=400, detail={
             "success": False,
@@ -0,0 +1,143 @@
+"""
+Request cancellation: a per-request CancelToken, checkpoint() for long
+computations and the middleware that sets the token.
+
+Vendored: this file is identical in strategy, portfolio and metrics (each
+service is built on its own, and the orchestrator's local mode loads each
+service's copy). Keep the copies byte-identical; scripts/check_vendored.py
+fails otherwise.
+"""
+import asyncio
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+# Loops call checkpoint() once per this many bars
+CHECK_EVERY = 256
+
+
+class RequestCancelled(Exception):
+    """Raised by checkpoint() once nobody is waiting for the result."""
+    pass
+
+
+class CancelToken:
+    """Set once a request's caller disconnects or its deadline passes."""
+
+    def __init__(self):
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str) -> None:
+        if self.reason is None:
+            self.reason = reason
+
+
+_current: ContextVar[Optional[CancelToken]] = ContextVar("cancel_token", default=None)
+
+_lock = threading.Lock()
+_stats = {"cancelled": {"disconnect": 0, "deadline": 0}, "stopped_early": 0}
+
+
+def checkpoint() -> None:
+    """Stop the current computation if its request was cancelled (no-op outside a request)."""
+    token = _current.get()
+    if token is not None and token.reason is not None:
+        with _lock:
+            _stats["stopped_early"] += 1
+        raise RequestCancelled(token.reason)
+
+
+@contextmanager
+def cancel_scope(token: CancelToken) -> Iterator[CancelToken]:
+    """Make `token` the one checkpoint() consults in this context."""
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+async def run_cancellable(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run CPU-bound `fn` in a worker thread. The event loop stays free to
+    notice a disconnect meanwhile, and `fn` (which sees the request's
+    token, contexts are copied) stops at its next checkpoint() once the
+    request is cancelled.
+    """
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+def cancellation_stats() -> Dict[str, Any]:
+    with _lock:
+        return {"cancelled": dict(_stats["cancelled"]), "stopped_early": _stats["stopped_early"]}
+
+
+class CancellationMiddleware:
+    """
+    Cancels work whose caller has gone away.
+
+    When the orchestrator gives up on a call (its client disconnected, a
+    sibling call failed) it closes the connection. Once the body has been
+    read, this middleware watches for that disconnect, and for the request
+    task being cancelled by DeadlineMiddleware, and flags the request's
+    CancelToken so the computation stops at its next checkpoint() instead
+    of finishing a result nobody reads.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = CancelToken()
+        watcher: Optional[asyncio.Future] = None
+        completed = False
+
+        async def watch() -> Dict[str, Any]:
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    if not completed:
+                        token.cancel("disconnect")
+                    return message
+
+        async def receive_watched() -> Dict[str, Any]:
+            nonlocal watcher
+            if watcher is not None:
+                # Only the disconnect is left to receive; share the watcher's
+                return await asyncio.shield(watcher)
+            message = await receive()
+            if message["type"] == "http.request" and not message.get("more_body", False):
+                watcher = asyncio.ensure_future(watch())
+            elif message["type"] == "http.disconnect":
+                token.cancel("disconnect")
+            return message
+
+        async def send_tracking(message) -> None:
+            nonlocal completed
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                completed = True
+            await send(message)
+
+        with cancel_scope(token):
+            try:
+                await self.app(scope, receive_watched, send_tracking)
+            except RequestCancelled:
+                # The caller is gone; there is nobody to answer
+                pass
+            except asyncio.CancelledError:
+                token.cancel("deadline")
+                raise
+            finally:
+                if watcher is not None:
+                    watcher.cancel()
+                if token.reason is not None:
+                    with _lock:
+                        _stats["cancelled"][token.reason] += 1
@@ -0,0 +1,76 @@
+"""
+MessagePack codec for calls between services: JSON-compatible objects,
+with long float lists packed as raw float64 buffers (FLOAT64_EXT).
+
+Both ends of a call must agree on this encoding, so the same file is
+vendored into every service (each service is built on its own):
+
+    services/orchestrator/app/clients/codec.py
+    services/{market-data,strategy,portfolio,metrics}/app/codec.py
+
+Keep the copies byte-identical; scripts/check_vendored.py fails otherwise.
+"""
+import sys
+from array import array
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # optional: without it only JSON is spoken
+    msgpack = None
+
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+SUPPORTED_FORMATS_HEADER = "X-Supported-Formats"
+
+# MessagePack extension type for a raw little-endian float64 buffer
+FLOAT64_EXT = 1
+# Shorter float lists are cheaper to send as plain MessagePack floats
+FLOAT_ARRAY_MIN_LENGTH = 16
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def _pack_floats(obj: Any) -> Any:
+    """Replace long all-float lists with float64 buffer extensions."""
+    if isinstance(obj, dict):
+        return {key: _pack_floats(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        if not obj:
+            return obj
+        if type(obj[0]) is float:
+            if len(obj) >= FLOAT_ARRAY_MIN_LENGTH and all(type(v) is float for v in obj):
+                buffer = array("d", obj)
+                if sys.byteorder == "big":
+                    buffer.byteswap()
+                return msgpack.ExtType(FLOAT64_EXT, buffer.tobytes())
+            return obj
+        if isinstance(obj[0], (dict, list)):
+            return [_pack_floats(value) for value in obj]
+    return obj
+
+
+def _unpack_ext(code: int, data: bytes) -> Any:
+    if code == FLOAT64_EXT:
+        buffer = array("d", data)
+        if sys.byteorder == "big":
+            buffer.byteswap()
+        return buffer.tolist()
+    return msgpack.ExtType(code, data)
+
+
+def encode(obj: Any) -> bytes:
+    """Encode a JSON-compatible object as MessagePack."""
+    return msgpack.packb(_pack_floats(obj), use_bin_type=True)
+
+
+def decode(data: bytes) -> Any:
+    """Decode MessagePack produced by encode()."""
+    return msgpack.unpackb(data, raw=False, ext_hook=_unpack_ext, strict_map_key=False)
+
+
+def is_msgpack(header_value: str) -> bool:
+    return bool(header_value) and MSGPACK_MEDIA_TYPE in header_value
+
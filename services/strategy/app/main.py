@@ -1,6 +1,10 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import signals
+from app.deadline import DeadlineMiddleware
+from app.cancellation import CancellationMiddleware, cancellation_stats
 
 app = FastAPI(
     title="Strategy Service",
@@ -17,10 +21,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Report handler time so callers can separate network overhead from compute
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    response.headers["Server-Timing"] = f"app;dur={(time.perf_counter() - start) * 1000:.1f}"
+    return response
+
+app.add_middleware(CancellationMiddleware)
+app.add_middleware(DeadlineMiddleware)
+
 # Registering the Strategy routes
 app.include_router(signals.router)
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint for Docker."""
-    return {"status": "healthy", "service": "strategy"}
\ No newline at end of file
+    return {"status": "healthy", "service": "strategy"}
+
+@app.get("/stats")
+async def stats():
+    """Signal requests cancelled by a disconnect or an expired deadline."""
+    return {"cancellation": cancellation_stats()}
@@ -1,15 +1,10 @@
 from fastapi import APIRouter
 from app.schemas.models import SignalRequest, SignalResponse, SignalData
-from app.strategies.buy_and_hold import BuyAndHold
-from app.strategies.buy_the_dip import BuyTheDip
+from app.strategies.registry import STRATEGY_MAP
+from app.serialization import NegotiatedRoute
+from app.cancellation import run_cancellable
 
-router = APIRouter()
-
-# Strategy Factory mapping string types to implementation classes
-STRATEGY_MAP = {
-    "buy_and_hold": BuyAndHold(),
-    "buy_the_dip": BuyTheDip()
-}
+router = APIRouter(route_class=NegotiatedRoute)
 
 @router.post("/signals", response_model=SignalResponse)
 async def get_signals(request: SignalRequest):
@@ -27,7 +22,7 @@ async def get_signals(request: SignalRequest):
         )
     
     # Generate signals using the selected strategy
-    signals = strategy.generate_signals(request.price_data, request.config.dict())
+    signals = await run_cancellable(strategy.generate_signals, request.price_data, request.config.dict())
     
     return SignalResponse(
         success=True,
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from app.schemas.models import PricePoint, SignalItem
+from ..schemas.models import PricePoint, SignalItem
 
 class BaseStrategy(ABC):
     @abstractmethod
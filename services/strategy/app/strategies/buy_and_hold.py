@@ -1,5 +1,5 @@
-from app.strategies.base import BaseStrategy
-from app.schemas.models import PricePoint, SignalItem
+from .base import BaseStrategy
+from ..schemas.models import PricePoint, SignalItem
 
 class BuyAndHold(BaseStrategy):
     def generate_signals(self, price_data: list[PricePoint], config: dict) -> list[SignalItem]:
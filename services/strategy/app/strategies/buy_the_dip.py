@@ -1,5 +1,6 @@
-from app.strategies.base import BaseStrategy
-from app.schemas.models import PricePoint, SignalItem
+from .base import BaseStrategy
+from ..schemas.models import PricePoint, SignalItem
+from ..cancellation import CHECK_EVERY, checkpoint
 
 class BuyTheDip(BaseStrategy):
     def generate_signals(self, price_data: list[PricePoint], config: dict) -> list[SignalItem]:
@@ -18,6 +19,8 @@ class BuyTheDip(BaseStrategy):
         signals = []
         # Iterate through price data starting from the offset
         for i in range(offset, len(price_data)):
+            if i % CHECK_EVERY == 0:
+                checkpoint()  # stop if the request was cancelled
             today = price_data[i]
             past = price_data[i - offset]
             
@@ -0,0 +1,8 @@
+from .buy_and_hold import BuyAndHold
+from .buy_the_dip import BuyTheDip
+
+# Strategy Factory mapping string types to implementation classes
+STRATEGY_MAP = {
+    "buy_and_hold": BuyAndHold(),
+    "buy_the_dip": BuyTheDip()
+}